@@ -0,0 +1,211 @@
+"""
+Counters and histograms exposed at /metrics in the Prometheus text format.
+
+Each process keeps its metrics in memory and writes a snapshot to
+``<METRICS_DIR>/<pid>.json`` (atomically, via rename) at most every
+METRICS_FLUSH_INTERVAL seconds. /metrics merges the snapshots of every process,
+so the numbers add up across gunicorn workers. Snapshots of exited workers are
+kept so counters never go backwards; point METRICS_DIR at a fresh directory per
+deploy. With METRICS_DIR empty, only the serving process is reported.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    'http_requests_total': ('counter', 'Requests by URL name, method and status.', None),
+    'http_request_duration_seconds': ('histogram', 'Request latency by URL name.', LATENCY_BUCKETS),
+    'http_request_db_queries': ('histogram', 'Database queries per request by URL name.', QUERY_BUCKETS),
+    'google_calendar_requests_total': ('counter', 'Google Calendar API calls by operation and outcome.', None),
+    'google_calendar_request_duration_seconds': ('histogram', 'Google Calendar API latency.', LATENCY_BUCKETS),
+    'google_calendar_mock_fallbacks_total': ('counter', 'Answers served by MockGoogleCalendar instead.', None),
+    'google_calendar_unknown_total': ('counter', 'Attendees reported as unknown, by reason (error/timeout/deadline).',
+                                      None),
+    'email_sends_total': ('counter', 'SMTP deliveries by outcome.', None),
+    'email_send_duration_seconds': ('histogram', 'SMTP delivery latency.', LATENCY_BUCKETS),
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    """In-process metric values, flushed to a per-pid file for the other workers."""
+
+    def __init__(self, directory='', flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = time.monotonic()
+
+    def _check_fork(self):
+        # A forked worker starts from a copy of its parent's values; they aren't its own
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def inc(self, name, amount=1, **labels):
+        """Add `amount` to a counter."""
+        assert METRICS[name][0] == 'counter', name
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            self._counters[key] = self._counters.get(key, 0) + amount
+        self._maybe_flush()
+
+    def observe(self, name, value, **labels):
+        """Record one observation in a histogram."""
+        kind, _, buckets = METRICS[name]
+        assert kind == 'histogram', name
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._check_fork()
+            counts = self._histograms.get(key)
+            if counts is None:
+                # One count per bucket, then +Inf, sum
+                counts = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[len(buckets)] += 1
+            counts[-1] += value
+        self._maybe_flush()
+
+    def snapshot(self):
+        """This process's values in the on-disk format."""
+        with self._lock:
+            self._check_fork()
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(counts)]
+                               for (name, labels), counts in self._histograms.items()],
+            }
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f'{pid}.json')
+
+    def _maybe_flush(self):
+        if self.directory and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write this process's snapshot for the other workers to read."""
+        if not self.directory:
+            return
+        self._last_flush = time.monotonic()
+        data = self.snapshot()
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._path(f'{os.getpid()}.tmp')
+        with open(tmp, 'w') as fh:
+            json.dump(data, fh)
+        os.replace(tmp, self._path(os.getpid()))
+
+    def _snapshots(self):
+        yield self.snapshot()
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        own = f'{os.getpid()}.json'
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json') or filename == own:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as fh:
+                    yield json.load(fh)
+            except (OSError, ValueError):
+                continue  # being replaced, or left half-written by a crash
+
+    def collect(self):
+        """Values summed over every process: ({(name, labels): value}, {(name, labels): counts})."""
+        counters, histograms = {}, {}
+        for data in self._snapshots():
+            for name, labels, value in data['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, counts in data['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                total = histograms.setdefault(key, [0] * len(counts))
+                for i, count in enumerate(counts):
+                    total[i] += count
+        return counters, histograms
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        counters, histograms = self.collect()
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+                continue
+            for (metric, labels), counts in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(buckets) + ['+Inf'], counts):
+                    cumulative += count
+                    le = bound if bound == '+Inf' else _format_value(bound)
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(counts[-1])}')
+                lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry(
+    directory=getattr(settings, 'METRICS_DIR', ''),
+    flush_interval=getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0),
+)
+atexit.register(registry.flush)
+
+
+def inc(name, amount=1, **labels):
+    registry.inc(name, amount, **labels)
+
+
+def observe(name, value, **labels):
+    registry.observe(name, value, **labels)
+
+
+@contextmanager
+def timed_call(counter, histogram, **labels):
+    """Time the block into `histogram` and count it in `counter` with outcome=success/error."""
+    started = time.perf_counter()
+    outcome = 'success'
+    try:
+        yield
+    except Exception:
+        outcome = 'error'
+        raise
+    finally:
+        observe(histogram, time.perf_counter() - started, **labels)
+        inc(counter, outcome=outcome, **labels)
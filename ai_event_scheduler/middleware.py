@@ -1,32 +1,213 @@
 """
-Custom middleware for handling timezone activation from session.
+Custom middleware: per-request timezone activation, request metrics and performance budgets.
+
+Every class here runs natively in both the sync (WSGI) and async (ASGI) handler,
+so under uvicorn the whole chain stays async and an async view waiting on
+Google doesn't hold a thread.
 """
-from django.utils import timezone as dj_timezone
-from django.conf import settings
+import logging
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone as dj_timezone
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+from .profiling import budget_for, over_budget, profile
+
+logger = logging.getLogger(__name__)
 
-class TimezoneMiddleware:
+SESSION_KEY = 'django_timezone'
+
+
+@lru_cache(maxsize=128)
+def get_zone(tzname):
+    """Shared ZoneInfo for a timezone name, or None if the name is unknown."""
+    try:
+        return ZoneInfo(tzname)
+    except Exception:
+        return None
+
+
+def default_zone():
+    """Zone for settings.TIME_ZONE, or UTC if that isn't a valid name."""
+    return get_zone(settings.TIME_ZONE) or get_zone('UTC')
+
+
+class SyncAndAsyncMiddleware:
     """
-    Middleware that activates a timezone for the current request based on session.
-    The timezone should be stored in request.session['django_timezone'].
+    Base for middleware with a sync __call__ and an async __acall__. Django hands an
+    async get_response in an async chain; __call__ then returns __acall__(request).
     """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can sit in an async chain (WhiteNoise itself is sync-only, which
+    would make Django run every request below it in a thread).
+
+    Static files are found in WhiteNoise's in-memory index and opened in a worker thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class TimezoneMiddleware(SyncAndAsyncMiddleware):
+    """
+    Middleware that activates a timezone for the current request.
+
+    The zone name comes from request.session['django_timezone'] and, for signed-in
+    users without one, from their UserProfile (cached, then remembered in the
+    session). The resolved zone is also available as request.timezone.
+
+    Paths in settings.TIMEZONE_EXEMPT_PATHS (health check, static files) are
+    passed straight through without reading the session. Must come after
+    AuthenticationMiddleware.
+    """
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.exempt_paths = tuple(getattr(settings, 'TIMEZONE_EXEMPT_PATHS', ()))
 
     def __call__(self, request):
-        # Get timezone from session, default to settings.TIME_ZONE
-        tzname = request.session.get('django_timezone', settings.TIME_ZONE)
-        
-        # Activate the timezone for this request
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.path_info.startswith(self.exempt_paths):
+            return self.get_response(request)
+
+        request.timezone = get_zone(self._tzname(request)) or default_zone()
+        dj_timezone.activate(request.timezone)
+        try:
+            return self.get_response(request)
+        finally:
+            dj_timezone.deactivate()
+
+    async def __acall__(self, request):
+        if request.path_info.startswith(self.exempt_paths):
+            return await self.get_response(request)
+
+        request.timezone = get_zone(await self._atzname(request)) or default_zone()
+        dj_timezone.activate(request.timezone)
         try:
-            dj_timezone.activate(ZoneInfo(tzname))
-        except Exception:
-            # If timezone is invalid, fall back to default from settings
-            try:
-                dj_timezone.activate(ZoneInfo(settings.TIME_ZONE))
-            except Exception:
-                dj_timezone.activate(ZoneInfo('UTC'))
-        
-        return self.get_response(request)
+            return await self.get_response(request)
+        finally:
+            dj_timezone.deactivate()
+
+    def _tzname(self, request):
+        # Without a session cookie nothing is stored: don't load (or create) a session
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return settings.TIME_ZONE
+        tzname = request.session.get(SESSION_KEY)
+        if tzname is None and request.user.is_authenticated:
+            from scheduler.cache import user_timezone
+            tzname = user_timezone(request.user)
+            request.session[SESSION_KEY] = tzname
+        return tzname or settings.TIME_ZONE
+
+    async def _atzname(self, request):
+        # As _tzname, through auser() so async views (which use it too) find the user loaded
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            return settings.TIME_ZONE
+        tzname = await request.session.aget(SESSION_KEY)
+        if tzname is None:
+            user = await request.auser()
+            if user.is_authenticated:
+                from scheduler.cache import user_timezone
+                tzname = await sync_to_async(user_timezone)(user)
+                await request.session.aset(SESSION_KEY, tzname)
+        return tzname or settings.TIME_ZONE
+
+
+class MetricsMiddleware(SyncAndAsyncMiddleware):
+    """
+    Count requests and record latency and database queries per resolved URL name.
+
+    Requests that match no URL are reported as '<unresolved>' so the label set
+    stays bounded.
+    """
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with profile() as prof:
+            response = self.get_response(request)
+        self._record(request, response, prof)
+        return response
+
+    async def __acall__(self, request):
+        with profile() as prof:
+            response = await self.get_response(request)
+        self._record(request, response, prof)
+        return response
+
+    def _record(self, request, response, prof):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<unresolved>'
+        metrics.inc('http_requests_total', view=view, method=request.method, status=response.status_code)
+        metrics.observe('http_request_duration_seconds', prof.total_ms / 1000, view=view)
+        metrics.observe('http_request_db_queries', prof.queries, view=view)
+
+
+class PerformanceBudgetMiddleware(SyncAndAsyncMiddleware):
+    """
+    Profile each request (SQL count and time, outbound HTTP time, total time) and log
+    any request over the budget declared for its URL name in settings.PERF_BUDGETS.
+
+    Enabled by settings.PERF_PROFILING; the profile is also sent as a Server-Timing header.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_PROFILING', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with profile() as prof:
+            response = self.get_response(request)
+        return self._report(request, response, prof)
+
+    async def __acall__(self, request):
+        with profile() as prof:
+            response = await self.get_response(request)
+        return self._report(request, response, prof)
+
+    def _report(self, request, response, prof):
+        response['Server-Timing'] = prof.server_timing()
 
+        match = getattr(request, 'resolver_match', None)
+        if match:
+            problems = over_budget(prof, budget_for(match.view_name))
+            if problems:
+                logger.warning(
+                    'Over budget: %s %s (%s): %s; sql %.1f ms, outbound %.1f ms',
+                    request.method, request.path, match.view_name, ', '.join(problems), prof.sql_ms, prof.outbound_ms,
+                )
+        return response
@@ -0,0 +1,107 @@
+"""
+Per-request performance profiles and budgets.
+
+``profile()`` collects SQL count and time, outbound HTTP time and total time
+for a block; integrations wrap their API calls in ``outbound()`` so the time
+is attributed to whichever profile is active. Budgets per URL name come from
+settings.PERF_BUDGETS and are enforced by PerformanceBudgetMiddleware (logged)
+and by ai_event_scheduler.testing.BudgetTestMixin (test failures).
+
+Active profiles live in a context variable and every database connection gets
+one permanent execute wrapper that reports to them, so queries are counted
+wherever they run: in the request thread, or in the worker threads async views
+hand ORM calls to (sync_to_async copies the context).
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+_active: ContextVar[Tuple['RequestProfile', ...]] = ContextVar('request_profiles', default=())
+
+
+@dataclass
+class RequestProfile:
+    """What one request (or profiled block) spent its time on; times in milliseconds."""
+    queries: int = 0
+    sql_ms: float = 0.0
+    outbound_ms: float = 0.0
+    total_ms: float = 0.0
+
+    def server_timing(self) -> str:
+        """Value for a Server-Timing response header."""
+        return f'db;dur={self.sql_ms:.1f}, http;dur={self.outbound_ms:.1f}, total;dur={self.total_ms:.1f}'
+
+
+def _record_query(execute, sql, params, many, context):
+    profiles = _active.get()
+    if not profiles:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        for prof in profiles:
+            prof.queries += 1
+            prof.sql_ms += elapsed
+
+
+def install(connection, **kwargs) -> None:
+    """Report the connection's queries to the active profiles (idempotent)."""
+    if _record_query not in connection.execute_wrappers:
+        # First, so that execute_wrapper() blocks still pop their own wrapper
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+connection_created.connect(install)
+
+
+@contextmanager
+def profile():
+    """Profile the block's queries (on any connection), outbound calls and wall time."""
+    prof = RequestProfile()
+    # Connections opened before this module was imported (e.g. in tests)
+    install(connection)
+    token = _active.set(_active.get() + (prof,))
+    started = time.perf_counter()
+    try:
+        yield prof
+    finally:
+        prof.total_ms = (time.perf_counter() - started) * 1000
+        _active.reset(token)
+
+
+@contextmanager
+def outbound():
+    """Count the block as outbound HTTP time of the active profiles, if any."""
+    profiles = _active.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        for prof in profiles:
+            prof.outbound_ms += elapsed
+
+
+def budget_for(view_name: str) -> Optional[dict]:
+    """The budget declared for a URL name: {'queries': int, 'ms': float} (either may be missing)."""
+    return getattr(settings, 'PERF_BUDGETS', {}).get(view_name)
+
+
+def over_budget(prof: RequestProfile, budget: Optional[dict]) -> List[str]:
+    """Descriptions of every limit in `budget` that `prof` exceeded (empty if within budget)."""
+    if not budget:
+        return []
+    problems = []
+    if budget.get('queries') is not None and prof.queries > budget['queries']:
+        problems.append(f"{prof.queries} queries > {budget['queries']}")
+    if budget.get('ms') is not None and prof.total_ms > budget['ms']:
+        problems.append(f"{prof.total_ms:.0f} ms > {budget['ms']} ms")
+    return problems
@@ -4,6 +4,7 @@ Django settings for ai_event_scheduler project.
 
 from pathlib import Path
 import os
+import tempfile
 import dj_database_url
 import sys
 
@@ -44,12 +45,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'ai_event_scheduler.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise that keeps an ASGI chain async
+    'ai_event_scheduler.middleware.MetricsMiddleware',  # Per-view request metrics, served at /metrics
+    'ai_event_scheduler.middleware.PerformanceBudgetMiddleware',  # Logs requests over PERF_BUDGETS
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'ai_event_scheduler.middleware.TimezoneMiddleware',  # Custom middleware for per-user timezone
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'ai_event_scheduler.middleware.TimezoneMiddleware',  # Custom middleware for per-user timezone (needs request.user)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -73,6 +76,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'ai_event_scheduler.wsgi.application'
+# Production runs the ASGI app under uvicorn (see render.yaml)
+ASGI_APPLICATION = 'ai_event_scheduler.asgi.application'
 
 
 # Database
@@ -98,6 +103,41 @@ else:
         }
     }
 
+# Cache
+# 'default' is shared by all workers: Redis when REDIS_URL is set (render.yaml provisions it). Without Redis it
+# falls back to a per-process LocMemCache, which is only coherent with a single worker process.
+# CACHE_BACKEND=database opts into the `django_cache` table (`manage.py createcachetable`) instead. Every cache
+# read there is a SQL query, so it costs more than the queries it saves on most pages.
+# 'local' is a per-process tier in front of it for values keyed by version (scheduler/cache.py).
+REDIS_URL = os.environ.get('REDIS_URL')
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'redis' if REDIS_URL else 'locmem')
+CACHE_TIMEOUT = int(os.environ.get('CACHE_TIMEOUT', '300'))
+CACHE_LOCAL_TIMEOUT = int(os.environ.get('CACHE_LOCAL_TIMEOUT', '60'))
+_SHARED_CACHES = {
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    },
+    'database': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scheduler-shared',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+CACHES = {
+    'default': dict(_SHARED_CACHES[CACHE_BACKEND], TIMEOUT=CACHE_TIMEOUT),
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scheduler-local',
+        'TIMEOUT': CACHE_LOCAL_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -132,6 +172,8 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = '/static/'
+# Paths TimezoneMiddleware passes through without reading the session
+TIMEZONE_EXEMPT_PATHS = ['/health/', '/metrics', STATIC_URL]
 # Tell Django to copy static assets into a path called `staticfiles` (this is specific to Render)
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
@@ -151,6 +193,9 @@ LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/'
 
+# Meetings per dashboard page (keyset-paginated)
+DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', '25'))
+
 # Email settings
 # By default (DEBUG=True) send emails to console. In production, set EMAIL_BACKEND to SMTP and configure host settings.
 EMAIL_BACKEND = os.environ.get(
@@ -175,6 +220,61 @@ GOOGLE_OAUTH_SCOPES = os.environ.get(
     'https://www.googleapis.com/auth/calendar.readonly https://www.googleapis.com/auth/calendar.events'
 ).split()
 
+# Free/busy results are cached per user and time window for this many seconds
+FREEBUSY_CACHE_TTL = int(os.environ.get('FREEBUSY_CACHE_TTL', '300'))
+
+# Socket timeout in seconds for every Google Calendar API request
+GOOGLE_API_TIMEOUT = float(os.environ.get('GOOGLE_API_TIMEOUT', '10'))
+
+# Attendees whose calendars the organizer can't see are looked up with their own credentials, concurrently on a
+# pool of FANOUT_MAX_WORKERS threads; each lookup may take FREEBUSY_CALL_TIMEOUT seconds and all of them together
+# FREEBUSY_DEADLINE seconds. Slower or failing attendees are reported as unknown.
+FANOUT_MAX_WORKERS = int(os.environ.get('FANOUT_MAX_WORKERS', '8'))
+FREEBUSY_CALL_TIMEOUT = float(os.environ.get('FREEBUSY_CALL_TIMEOUT', '5'))
+FREEBUSY_DEADLINE = float(os.environ.get('FREEBUSY_DEADLINE', '8'))
+
+# Per-worker credential cache; keep the TTL below the refresh window so tokens renewed by
+# `manage.py refresh_google_tokens` are picked up before the old ones expire
+GOOGLE_CREDENTIAL_CACHE_SIZE = int(os.environ.get('GOOGLE_CREDENTIAL_CACHE_SIZE', '512'))
+GOOGLE_CREDENTIAL_CACHE_TTL = int(os.environ.get('GOOGLE_CREDENTIAL_CACHE_TTL', '300'))
+GOOGLE_TOKEN_REFRESH_WINDOW = int(os.environ.get('GOOGLE_TOKEN_REFRESH_WINDOW', '900'))
+
+# A/B test events are buffered per worker and written with bulk_create once ABTEST_BUFFER_SIZE are
+# queued or ABTEST_BUFFER_INTERVAL seconds have passed; events beyond ABTEST_BUFFER_MAX are dropped
+ABTEST_BUFFER_SIZE = int(os.environ.get('ABTEST_BUFFER_SIZE', '200'))
+ABTEST_BUFFER_INTERVAL = float(os.environ.get('ABTEST_BUFFER_INTERVAL', '2'))
+ABTEST_BUFFER_MAX = int(os.environ.get('ABTEST_BUFFER_MAX', '10000'))
+# Flush from a background thread (False: the request that fills the buffer flushes it inline)
+ABTEST_BUFFER_ASYNC = os.environ.get('ABTEST_BUFFER_ASYNC', 'True').lower() in ['true', '1', 't']
+# Relative share of A/B test visitors per variant, e.g. "kudos:50,thanks:50"
+ABTEST_VARIANT_WEIGHTS = {
+    name.strip(): float(weight)
+    for name, weight in (
+        item.split(':') for item in os.environ.get('ABTEST_VARIANT_WEIGHTS', 'kudos:50,thanks:50').split(',') if item
+    )
+}
+# `manage.py rollup_abtest` only folds in events older than this many seconds (lets buffered writes land)
+ABTEST_ROLLUP_SETTLE = int(os.environ.get('ABTEST_ROLLUP_SETTLE', '120'))
+
+# Each worker writes its metrics to METRICS_DIR every METRICS_FLUSH_INTERVAL seconds; /metrics sums them.
+# Use a fresh directory per deploy (stale files keep counting). Empty: report the serving worker only.
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'ai_event_scheduler_metrics'))
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+# Bearer token for scraping /metrics (staff users may also view it when signed in)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# Profile every request and log those over their URL name's budget (queries, total ms).
+# The same budgets are enforced in tests through ai_event_scheduler.testing.BudgetTestMixin: query limits always,
+# wall-clock limits only with PERF_BUDGET_ENFORCE_MS (e.g. on a quiet benchmark runner; shared CI is too noisy).
+PERF_PROFILING = os.environ.get('PERF_PROFILING', 'False').lower() in ['true', '1', 't']
+PERF_BUDGET_ENFORCE_MS = os.environ.get('PERF_BUDGET_ENFORCE_MS', 'False').lower() in ['true', '1', 't']
+PERF_BUDGETS = {
+    'dashboard': {'queries': 10, 'ms': 500},
+    'meeting_detail': {'queries': 12, 'ms': 500},
+    'create_meeting': {'queries': 15, 'ms': 500},
+    'select_time': {'queries': 22, 'ms': 500},
+}
+
 # Logging configuration for production debugging
 LOGGING = {
     'version': 1,
@@ -0,0 +1,49 @@
+"""
+Test helpers for the performance budgets in settings.PERF_BUDGETS.
+"""
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+
+from .profiling import budget_for, over_budget, profile
+
+
+class BudgetTestMixin:
+    """
+    TestCase mixin: fail when a block goes over a URL name's declared budget.
+
+        with self.assertWithinBudget('dashboard'):
+            self.client.get(reverse('dashboard'))
+
+    Declared wall-clock (ms) limits are only checked with settings.PERF_BUDGET_ENFORCE_MS;
+    query limits and an explicit `ms` always are.
+    """
+
+    @contextmanager
+    def assertWithinBudget(self, view_name, queries=None, ms=None):
+        budget = dict(budget_for(view_name) or {})
+        if not budget and queries is None and ms is None:
+            self.fail(f'No performance budget declared for {view_name!r} in PERF_BUDGETS')
+        if not getattr(settings, 'PERF_BUDGET_ENFORCE_MS', False):
+            budget.pop('ms', None)
+        if queries is not None:
+            budget['queries'] = queries
+        if ms is not None:
+            budget['ms'] = ms
+        with profile() as prof:
+            yield prof
+        problems = over_budget(prof, budget)
+        if problems:
+            self.fail(f'{view_name} over budget: ' + ', '.join(problems))
+
+
+def within_budget(view_name, queries=None, ms=None):
+    """Decorator form of BudgetTestMixin.assertWithinBudget for a whole test method."""
+    def decorator(test_method):
+        @wraps(test_method)
+        def wrapper(self, *args, **kwargs):
+            with self.assertWithinBudget(view_name, queries=queries, ms=ms):
+                return test_method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,43 +1,59 @@
 """
 URL configuration for the ai_event_scheduler project.
 """
+import hmac
+
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import redirect
 from django.views.decorators.http import require_POST
 from scheduler.auth_views import SignUpView, CustomLoginView, CustomLogoutView
+from scheduler.models import UserProfile
+
+from . import metrics
+from .middleware import SESSION_KEY, get_zone
 
 def health_check(request):
     """Simple health check endpoint for monitoring."""
     return JsonResponse({'status': 'healthy', 'service': 'ai-event-scheduler'})
 
+def metrics_view(request):
+    """
+    Request and integration metrics in the Prometheus text format.
+    Requires `Authorization: Bearer <METRICS_TOKEN>` or a signed-in staff user.
+    """
+    token = settings.METRICS_TOKEN
+    auth = request.META.get('HTTP_AUTHORIZATION', '')
+    authorized = bool(token) and hmac.compare_digest(auth.encode(), f'Bearer {token}'.encode())
+    if not authorized and not request.user.is_staff:
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    metrics.registry.flush()
+    return HttpResponse(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @require_POST
 def set_timezone(request):
     """
     Set the timezone for the current session.
-    This view stores the timezone in the session, which is then used by TimezoneMiddleware.
+    This view stores the timezone in the session, which is then used by TimezoneMiddleware,
+    and on the user's profile so it follows them to new sessions.
     """
     next_url = request.POST.get('next', '/')
     timezone_str = request.POST.get('timezone')
-    
-    if timezone_str:
-        # Validate timezone by trying to create a ZoneInfo object
-        try:
-            from zoneinfo import ZoneInfo
-            # This will raise an exception if the timezone is invalid
-            ZoneInfo(timezone_str)
-            # Store in session for TimezoneMiddleware
-            request.session['django_timezone'] = timezone_str
-        except Exception:
-            # If timezone is invalid, just keep the current one
-            pass
-    
+
+    # Unknown names are ignored: just keep the current timezone
+    if timezone_str and get_zone(timezone_str) is not None:
+        request.session[SESSION_KEY] = timezone_str
+        if request.user.is_authenticated:
+            UserProfile.objects.update_or_create(user=request.user, defaults={'timezone': timezone_str})
+
     return redirect(next_url)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('health/', health_check, name='health_check'),  # Health check endpoint
+    path('metrics', metrics_view, name='metrics'),  # Prometheus scrape endpoint
     path('tz/set/', set_timezone, name='set_timezone'),  # ADD: per-user timezone setter
     path('', include('homepage.urls')),
     path('signup/', SignUpView.as_view(), name='signup'),
@@ -14,5 +14,5 @@ python manage.py collectstatic --no-input
 # Apply any outstanding database migrations
 python manage.py migrate --no-input
 
-# Create cache table (if using cache)
+# Create the database cache table (only used with CACHE_BACKEND=database)
 python manage.py createcachetable || true
\ No newline at end of file
@@ -1,7 +1,10 @@
 from django.contrib import admin
-from .models import UserDetails, AbTestEvent, AbTestClickEvent
+from .models import UserDetails, AbTestEvent, AbTestClickEvent, AbTestHourlyRollup, AbTestRollupState, UserAgent
 
 admin.site.register(UserDetails)
 admin.site.register(AbTestEvent)
 admin.site.register(AbTestClickEvent)
 
+admin.site.register(AbTestHourlyRollup)
+admin.site.register(AbTestRollupState)
+admin.site.register(UserAgent)
@@ -0,0 +1,66 @@
+"""
+Stateless A/B variant assignment.
+
+Each visitor gets a random ID in a signed first-party cookie (``ab_vid``). The
+variant is derived from a hash of that ID, split into buckets weighted by
+``settings.ABTEST_VARIANT_WEIGHTS``, so the same visitor always sees the same
+variant without a session row or any other server-side state. The visitor ID
+is what gets logged in the events' ``session_key`` column.
+"""
+import hashlib
+import re
+import uuid
+
+from django.conf import settings
+
+from .models import AbTestEvent
+
+VISITOR_COOKIE = 'ab_vid'
+VISITOR_COOKIE_SALT = 'homepage.abtest.visitor'
+VISITOR_COOKIE_MAX_AGE = 365 * 24 * 60 * 60
+# Part of the hash input, so a future experiment buckets visitors independently
+EXPERIMENT = 'coffee-chatters'
+
+_VISITOR_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def variant_weights() -> dict:
+    """Configured weight per known variant (unknown names and non-positive weights are ignored)."""
+    known = [variant for variant, _label in AbTestEvent.VARIANT_CHOICES]
+    configured = getattr(settings, 'ABTEST_VARIANT_WEIGHTS', None) or {}
+    weights = {variant: configured[variant] for variant in known if configured.get(variant, 0) > 0}
+    return weights or dict.fromkeys(known, 1)
+
+
+def assign_variant(visitor_id: str, weights: dict = None) -> str:
+    """Deterministically map a visitor ID to a variant in proportion to `weights`."""
+    weights = weights or variant_weights()
+    digest = hashlib.sha256(f'{EXPERIMENT}:{visitor_id}'.encode()).digest()
+    # Uniform point in [0, total)
+    point = int.from_bytes(digest[:8], 'big') / 2 ** 64 * sum(weights.values())
+    for variant, weight in weights.items():
+        if point < weight:
+            return variant
+        point -= weight
+    return variant
+
+
+def get_visitor_id(request):
+    """
+    The visitor's ID from the signed cookie, or a fresh one.
+
+    Returns:
+        (visitor_id, is_new); when is_new the caller must call set_visitor_cookie()
+    """
+    visitor_id = request.get_signed_cookie(VISITOR_COOKIE, default=None, salt=VISITOR_COOKIE_SALT)
+    if visitor_id and _VISITOR_ID.match(visitor_id):
+        return visitor_id, False
+    return uuid.uuid4().hex, True
+
+
+def set_visitor_cookie(response, visitor_id: str) -> None:
+    """Persist the visitor ID on the client."""
+    response.set_signed_cookie(
+        VISITOR_COOKIE, visitor_id, salt=VISITOR_COOKIE_SALT,
+        max_age=VISITOR_COOKIE_MAX_AGE, httponly=True, samesite='Lax', secure=not settings.DEBUG,
+    )
@@ -0,0 +1,164 @@
+"""
+Write-behind buffer for A/B test events.
+
+The public A/B test page must not wait on the database, so views hand unsaved
+``AbTestEvent`` / ``AbTestClickEvent`` instances to ``record()``. They are
+kept in a per-worker queue and written with one ``bulk_create`` per model when
+``ABTEST_BUFFER_SIZE`` events are queued or ``ABTEST_BUFFER_INTERVAL``
+seconds have passed; user agents and IPs are dictionary-encoded on the way
+(see ``homepage.encoding``). With ``ABTEST_BUFFER_ASYNC`` (the default) a
+background thread does the writing; the queue is also flushed when the worker
+exits.
+
+The queue is bounded by ``ABTEST_BUFFER_MAX``: events arriving while it is
+full, and rows the database rejects, are dropped and counted
+(see ``EventBuffer.stats()``) rather than slowing the page down.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .encoding import encode_events
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    """Bounded in-memory queue of unsaved model instances, flushed in bulk."""
+
+    def __init__(self, flush_size: int = 200, flush_interval: float = 2, max_size: int = 10000,
+                 async_flush: bool = True):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.async_flush = async_flush
+        self._events = deque()
+        self._lock = threading.Lock()
+        # Serializes flushes so batches are written in order
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._last_flush = time.monotonic()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def add(self, event) -> bool:
+        """Queue an unsaved event; returns False if it was dropped because the buffer is full."""
+        with self._lock:
+            if len(self._events) >= self.max_size:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 1000 == 0:
+                    logger.warning('A/B event buffer full; %d events dropped so far', self.dropped)
+                return False
+            self._events.append(event)
+            due = (len(self._events) >= self.flush_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if self.async_flush:
+            self._ensure_thread()
+            if due:
+                self._wake.set()
+        elif due:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of events written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._events)
+                self._events.clear()
+                self._last_flush = time.monotonic()
+            by_model = {}
+            for event in batch:
+                by_model.setdefault(type(event), []).append(event)
+            written = 0
+            for model, events in by_model.items():
+                written += self._write(model, events)
+            with self._lock:
+                self.written += written
+            return written
+
+    def _write(self, model, events) -> int:
+        try:
+            encode_events(events)
+        except Exception:
+            # Store the raw text instead; the backfill command can encode it later
+            logger.exception('Could not encode %d %s rows', len(events), model.__name__)
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(events, batch_size=500)
+            return len(events)
+        except Exception:
+            logger.exception('Bulk insert of %d %s rows failed; retrying row by row', len(events), model.__name__)
+        # One bad row must not cost the whole batch
+        written = 0
+        for event in events:
+            try:
+                with transaction.atomic():
+                    event.save(force_insert=True)
+                written += 1
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+        return written
+
+    def stats(self) -> dict:
+        """Counters for monitoring: queued, written, dropped (buffer full) and failed (write error)."""
+        with self._lock:
+            return {
+                'queued': len(self._events),
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+            }
+
+    def close(self) -> None:
+        """Stop the background thread and write whatever is still queued."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+        stats = self.stats()
+        if stats['dropped'] or stats['failed']:
+            logger.warning('A/B event buffer closed: %s', stats)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._stopped:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='abtest-event-buffer', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopped:
+                break
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+event_buffer = EventBuffer(
+    flush_size=getattr(settings, 'ABTEST_BUFFER_SIZE', 200),
+    flush_interval=getattr(settings, 'ABTEST_BUFFER_INTERVAL', 2),
+    max_size=getattr(settings, 'ABTEST_BUFFER_MAX', 10000),
+    async_flush=getattr(settings, 'ABTEST_BUFFER_ASYNC', True),
+)
+atexit.register(event_buffer.close)
+
+
+def record(event) -> bool:
+    """Queue an A/B test event for the next bulk write."""
+    return event_buffer.add(event)
@@ -0,0 +1,33 @@
+"""
+Compact storage for A/B event user agents and IP addresses.
+
+Events arrive with the raw ``user_agent`` / ``ip_address`` text. Before they
+are written (``homepage.buffer``), or later for old rows
+(``manage.py backfill_abtest_agents``), ``encode_events()`` swaps the text for
+a ``UserAgent`` foreign key and a native ``ip`` column, then empties the text
+columns.
+"""
+import ipaddress
+from typing import Optional
+
+from .models import UserAgent
+
+
+def normalize_ip(value: str) -> Optional[str]:
+    """Canonical form of an IPv4/IPv6 address, or None if it isn't one."""
+    try:
+        return str(ipaddress.ip_address((value or '').strip()))
+    except ValueError:
+        return None
+
+
+def encode_events(events) -> None:
+    """Move user agents and IPs of unsaved or loaded events into agent / ip (in memory; does not save)."""
+    agent_ids = UserAgent.ids_for(event.user_agent for event in events)
+    for event in events:
+        if event.user_agent:
+            event.agent_id = agent_ids[event.user_agent]
+            event.user_agent = ''
+        if event.ip_address:
+            event.ip = event.ip or normalize_ip(event.ip_address)
+            event.ip_address = ''
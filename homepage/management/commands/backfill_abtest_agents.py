@@ -0,0 +1,47 @@
+"""
+Move user agents and IPs of existing A/B events into the compact columns
+(see homepage/encoding.py), a batch at a time so it can run on a live site.
+
+Usage: python manage.py backfill_abtest_agents [--batch-size 5000] [--sleep 0.1]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from homepage.encoding import encode_events
+from homepage.models import AbTestClickEvent, AbTestEvent
+
+
+class Command(BaseCommand):
+    help = 'Backfill UserAgent references and ip columns for A/B events written before they existed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows updated per transaction')
+        parser.add_argument('--sleep', type=float, default=0.1, help='Seconds to pause between batches')
+
+    def handle(self, *args, **options):
+        for model in (AbTestEvent, AbTestClickEvent):
+            total = self._backfill(model, options['batch_size'], options['sleep'])
+            self.stdout.write(f'{model.__name__}: {total} rows encoded')
+
+    def _backfill(self, model, batch_size, pause):
+        # Keyset over the primary key, so each batch starts where the last one stopped
+        pending = model.objects.filter(Q(user_agent__gt='') | Q(ip_address__gt='')).order_by('pk')
+        last_pk, total = 0, 0
+        while True:
+            with transaction.atomic():
+                events = list(
+                    pending.filter(pk__gt=last_pk)
+                    .select_for_update()
+                    .only('pk', 'user_agent', 'ip_address', 'ip', 'agent')[:batch_size]
+                )
+                if not events:
+                    return total
+                encode_events(events)
+                model.objects.bulk_update(events, ['agent', 'ip', 'user_agent', 'ip_address'])
+            last_pk = events[-1].pk
+            total += len(events)
+            if pause:
+                time.sleep(pause)
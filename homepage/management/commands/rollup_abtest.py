@@ -0,0 +1,32 @@
+"""
+Fold new A/B test events into the hourly rollups (see homepage/rollups.py).
+
+Usage: python manage.py rollup_abtest [--batch-size 50000] [--loop --interval 60]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from homepage.rollups import update_rollups
+
+
+class Command(BaseCommand):
+    help = 'Incrementally update the A/B test hourly rollups from the raw event tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50000, help='Raw events per table per pass')
+        parser.add_argument('--loop', action='store_true', help='Keep running instead of exiting when caught up')
+        parser.add_argument('--interval', type=float, default=60, help='Seconds to sleep when caught up with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            folded = update_rollups(options['batch_size'])
+            caught_up = all(count < options['batch_size'] for count in folded.values())
+            if any(folded.values()):
+                self.stdout.write(', '.join(f'{source}: {count}' for source, count in folded.items()))
+            if caught_up and not options['loop']:
+                if not any(folded.values()):
+                    self.stdout.write('Rollups are up to date.')
+                break
+            if caught_up:
+                time.sleep(options['interval'])
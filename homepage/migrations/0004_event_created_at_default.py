@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0003_abtestclickevent'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='abtestclickevent',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='abtestevent',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
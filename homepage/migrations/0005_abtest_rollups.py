@@ -0,0 +1,42 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0004_event_created_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AbTestRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=20, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'abtest_rollup_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='AbTestHourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('variant', models.CharField(choices=[('kudos', 'Kudos'), ('thanks', 'Thanks')], max_length=10)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('clicks', models.PositiveIntegerField(default=0)),
+                ('unique_sessions', models.PositiveIntegerField(default=0)),
+                ('converted_sessions', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'abtest_hourly_rollups',
+                'ordering': ['hour', 'variant'],
+                'constraints': [models.UniqueConstraint(fields=('hour', 'variant'), name='abtest_rollup_hour_variant')],
+            },
+        ),
+    ]
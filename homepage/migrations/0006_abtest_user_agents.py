@@ -0,0 +1,44 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homepage', '0005_abtest_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('user_agent', models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                'db_table': 'abtest_user_agents',
+            },
+        ),
+        migrations.AddField(
+            model_name='abtestclickevent',
+            name='ip',
+            field=models.GenericIPAddressField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='abtestevent',
+            name='ip',
+            field=models.GenericIPAddressField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='abtestclickevent',
+            name='agent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='homepage.useragent'),
+        ),
+        migrations.AddField(
+            model_name='abtestevent',
+            name='agent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='homepage.useragent'),
+        ),
+    ]
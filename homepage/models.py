@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class UserDetails(models.Model):
@@ -21,6 +22,30 @@ class UserDetails(models.Model):
         return f"{self.firstname} {self.lastname} ({self.google_account})"
 
 
+class UserAgent(models.Model):
+    """Distinct user-agent strings; A/B events reference these instead of repeating the text."""
+    # 4-byte key keeps the referencing FK columns small
+    id = models.AutoField(primary_key=True)
+    user_agent = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        db_table = 'abtest_user_agents'
+
+    def __str__(self):
+        return self.user_agent
+
+    @classmethod
+    def ids_for(cls, values):
+        """Map user-agent strings to row IDs, inserting the ones not seen before."""
+        values = {value for value in values if value}
+        ids = dict(cls.objects.filter(user_agent__in=values).values_list('user_agent', 'pk'))
+        missing = values - ids.keys()
+        if missing:
+            cls.objects.bulk_create([cls(user_agent=value) for value in missing], ignore_conflicts=True)
+            ids.update(cls.objects.filter(user_agent__in=missing).values_list('user_agent', 'pk'))
+        return ids
+
+
 class AbTestEvent(models.Model):
     """Track which variant a visitor saw for the coffee-chatters A/B test."""
     VARIANT_CHOICES = [
@@ -29,9 +54,13 @@ class AbTestEvent(models.Model):
     ]
     session_key = models.CharField(max_length=40, db_index=True)
     variant = models.CharField(max_length=10, choices=VARIANT_CHOICES)
+    agent = models.ForeignKey(UserAgent, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    ip = models.GenericIPAddressField(null=True, blank=True)
+    # Legacy text columns, emptied by `manage.py backfill_abtest_agents` once copied to agent / ip
     user_agent = models.CharField(max_length=255, blank=True)
     ip_address = models.CharField(max_length=50, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when the buffered row is written (see homepage.buffer)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         db_table = 'abtest_events'
@@ -45,9 +74,13 @@ class AbTestClickEvent(models.Model):
     """Track button clicks for the coffee-chatters A/B test."""
     session_key = models.CharField(max_length=40, db_index=True)
     variant = models.CharField(max_length=10, choices=AbTestEvent.VARIANT_CHOICES)
+    agent = models.ForeignKey(UserAgent, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    ip = models.GenericIPAddressField(null=True, blank=True)
+    # Legacy text columns, emptied by `manage.py backfill_abtest_agents` once copied to agent / ip
     user_agent = models.CharField(max_length=255, blank=True)
     ip_address = models.CharField(max_length=50, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when the buffered row is written (see homepage.buffer)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         db_table = 'abtest_click_events'
@@ -56,3 +89,42 @@ class AbTestClickEvent(models.Model):
     def __str__(self):
         return f"CLICK {self.session_key} -> {self.variant} @ {self.created_at}"
 
+
+class AbTestHourlyRollup(models.Model):
+    """
+    Per-variant, per-hour A/B test totals, maintained incrementally by
+    `manage.py rollup_abtest` (see homepage.rollups).
+
+    A session counts towards unique_sessions / converted_sessions only in the
+    hour of its first view / first click, so summing any range of hours gives
+    exact distinct counts.
+    """
+    hour = models.DateTimeField()
+    variant = models.CharField(max_length=10, choices=AbTestEvent.VARIANT_CHOICES)
+    views = models.PositiveIntegerField(default=0)
+    clicks = models.PositiveIntegerField(default=0)
+    unique_sessions = models.PositiveIntegerField(default=0)
+    converted_sessions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'abtest_hourly_rollups'
+        ordering = ['hour', 'variant']
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'variant'], name='abtest_rollup_hour_variant'),
+        ]
+
+    def __str__(self):
+        return f"{self.variant} @ {self.hour}: {self.views} views, {self.clicks} clicks"
+
+
+class AbTestRollupState(models.Model):
+    """High-water mark: the last raw event ID folded into the rollups, per event table."""
+    source = models.CharField(max_length=20, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'abtest_rollup_state'
+
+    def __str__(self):
+        return f"{self.source} through #{self.last_id}"
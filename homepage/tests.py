@@ -0,0 +1,316 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.contrib.sessions.models import Session
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from . import buffer, exports
+from .assignment import VISITOR_COOKIE, assign_variant, variant_weights
+from .buffer import EventBuffer
+from .encoding import normalize_ip
+from .models import AbTestClickEvent, AbTestEvent, AbTestHourlyRollup, UserAgent
+from .rollups import update_rollups, variant_stats, wilson_interval
+
+
+def view_event(variant='kudos'):
+    return AbTestEvent(session_key='s' * 32, variant=variant)
+
+
+class EventBufferTest(TestCase):
+    """Test the write-behind buffer for A/B test events."""
+
+    def test_flushes_when_size_limit_is_reached(self):
+        events = EventBuffer(flush_size=3, flush_interval=3600, async_flush=False)
+        events.add(view_event())
+        events.add(view_event())
+        self.assertEqual(AbTestEvent.objects.count(), 0)
+        events.add(view_event())
+        self.assertEqual(AbTestEvent.objects.count(), 3)
+        self.assertEqual(events.stats()['written'], 3)
+
+    def test_flushes_when_interval_has_passed(self):
+        events = EventBuffer(flush_size=100, flush_interval=0, async_flush=False)
+        events.add(view_event())
+        self.assertEqual(AbTestEvent.objects.count(), 1)
+
+    def test_full_buffer_drops_and_counts(self):
+        events = EventBuffer(flush_size=100, flush_interval=3600, max_size=2, async_flush=False)
+        self.assertTrue(events.add(view_event()))
+        self.assertTrue(events.add(view_event()))
+        with self.assertLogs('homepage.buffer', 'WARNING'):
+            self.assertFalse(events.add(view_event()))
+        self.assertEqual(events.stats(), {'queued': 2, 'written': 0, 'dropped': 1, 'failed': 0})
+
+    def test_bad_row_does_not_lose_the_batch(self):
+        events = EventBuffer(flush_size=100, flush_interval=3600, async_flush=False)
+        events.add(view_event())
+        events.add(AbTestClickEvent(session_key='s' * 32, variant=None))
+        events.add(AbTestClickEvent(session_key='s' * 32, variant='thanks'))
+        with self.assertLogs('homepage.buffer', 'ERROR'):
+            events.flush()
+        self.assertEqual(AbTestEvent.objects.count(), 1)
+        self.assertEqual(AbTestClickEvent.objects.count(), 1)
+        self.assertEqual(events.stats()['failed'], 1)
+
+    def test_user_agents_and_ips_are_encoded_on_flush(self):
+        events = EventBuffer(flush_size=100, flush_interval=3600, async_flush=False)
+        for ip in ('10.0.0.1', 'not-an-ip'):
+            events.add(AbTestEvent(session_key='s', variant='kudos', user_agent='Firefox', ip_address=ip))
+        events.add(AbTestClickEvent(session_key='s', variant='kudos', user_agent='Firefox', ip_address='::1'))
+        events.flush()
+
+        self.assertEqual(UserAgent.objects.count(), 1)
+        rows = list(AbTestEvent.objects.order_by('pk').values_list('agent__user_agent', 'user_agent', 'ip'))
+        self.assertEqual(rows, [('Firefox', '', '10.0.0.1'), ('Firefox', '', None)])
+        self.assertEqual(AbTestClickEvent.objects.get().ip, '::1')
+
+    def test_background_thread_flushes_on_close(self):
+        events = EventBuffer(flush_size=100, flush_interval=3600, async_flush=True)
+        events.add(view_event())
+        self.assertEqual(AbTestEvent.objects.count(), 0)
+        events.close()
+        self.assertEqual(AbTestEvent.objects.count(), 1)
+
+
+class CoffeeAbTestViewTest(TestCase):
+    """The A/B test views queue events instead of inserting them."""
+
+    def setUp(self):
+        patcher = mock.patch.object(buffer, 'event_buffer', EventBuffer(flush_size=100, flush_interval=3600,
+                                                                        async_flush=False))
+        self.events = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_view_and_click_are_buffered(self):
+        response = self.client.get(reverse('coffee_abtest'))
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse('coffee_abtest_click'))
+        self.assertEqual(response.json()['status'], 'ok')
+        self.assertEqual(AbTestEvent.objects.count() + AbTestClickEvent.objects.count(), 0)
+
+        self.assertEqual(self.events.flush(), 2)
+        view, click = AbTestEvent.objects.get(), AbTestClickEvent.objects.get()
+        self.assertEqual(view.variant, response.json()['variant'])
+        self.assertEqual(click.session_key, view.session_key)
+        self.assertLessEqual(view.created_at, click.created_at)
+
+    def test_visitor_cookie_instead_of_session(self):
+        first = self.client.get(reverse('coffee_abtest'))
+        self.assertIn(VISITOR_COOKIE, first.cookies)
+        second = self.client.get(reverse('coffee_abtest'))
+        self.assertNotIn(VISITOR_COOKIE, second.cookies)
+        self.assertEqual(first.context['variant'], second.context['variant'])
+        self.assertEqual(Session.objects.count(), 0)
+
+        self.events.flush()
+        self.assertEqual(AbTestEvent.objects.values('session_key').distinct().count(), 1)
+
+    def test_tampered_cookie_gets_a_new_visitor_id(self):
+        self.client.cookies[VISITOR_COOKIE] = 'f' * 32
+        response = self.client.get(reverse('coffee_abtest'))
+        self.assertIn(VISITOR_COOKIE, response.cookies)
+        self.events.flush()
+        self.assertNotEqual(AbTestEvent.objects.get().session_key, 'f' * 32)
+
+
+class VariantAssignmentTest(SimpleTestCase):
+    """Test hashing visitor IDs into weighted buckets."""
+
+    def test_deterministic(self):
+        self.assertEqual(assign_variant('a' * 32), assign_variant('a' * 32))
+
+    @override_settings(ABTEST_VARIANT_WEIGHTS={'kudos': 1, 'thanks': 3})
+    def test_weights(self):
+        ids = [f'{i:032x}' for i in range(4000)]
+        share = sum(assign_variant(vid) == 'thanks' for vid in ids) / len(ids)
+        self.assertAlmostEqual(share, 0.75, delta=0.03)
+
+    @override_settings(ABTEST_VARIANT_WEIGHTS={'kudos': 0, 'bogus': 5})
+    def test_invalid_weights_fall_back_to_even_split(self):
+        self.assertEqual(variant_weights(), {'kudos': 1, 'thanks': 1})
+
+
+class AbTestRollupTest(TestCase):
+    """Test the incrementally maintained hourly rollups."""
+
+    def setUp(self):
+        self.hour = datetime(2025, 3, 1, 10, tzinfo=timezone.utc)
+
+    def view(self, session, variant='kudos', minutes=0):
+        return AbTestEvent.objects.create(session_key=session, variant=variant,
+                                          created_at=self.hour + timedelta(minutes=minutes))
+
+    def click(self, session, variant='kudos', minutes=0):
+        return AbTestClickEvent.objects.create(session_key=session, variant=variant,
+                                               created_at=self.hour + timedelta(minutes=minutes))
+
+    def test_counts_views_clicks_and_first_time_sessions_per_hour(self):
+        self.view('a')
+        self.view('a', minutes=10)
+        self.view('b', minutes=70)
+        self.view('c', variant='thanks')
+        self.click('a', minutes=5)
+        self.click('a', minutes=6)
+        self.assertEqual(update_rollups(settle_seconds=0), {'views': 4, 'clicks': 2})
+
+        first = AbTestHourlyRollup.objects.get(hour=self.hour, variant='kudos')
+        self.assertEqual((first.views, first.clicks, first.unique_sessions, first.converted_sessions), (2, 2, 1, 1))
+        second = AbTestHourlyRollup.objects.get(hour=self.hour + timedelta(hours=1), variant='kudos')
+        self.assertEqual((second.views, second.unique_sessions), (1, 1))
+
+    def test_incremental_runs_only_read_new_events_and_keep_sessions_distinct(self):
+        self.view('a')
+        update_rollups(settle_seconds=0)
+        self.view('a', minutes=20)
+        self.view('b', minutes=30)
+        self.assertEqual(update_rollups(settle_seconds=0), {'views': 2, 'clicks': 0})
+        self.assertEqual(update_rollups(settle_seconds=0), {'views': 0, 'clicks': 0})
+
+        rollup = AbTestHourlyRollup.objects.get(hour=self.hour, variant='kudos')
+        self.assertEqual((rollup.views, rollup.unique_sessions), (3, 2))
+
+    def test_batches(self):
+        for i in range(5):
+            self.view(f's{i}', minutes=i)
+        self.assertEqual(update_rollups(batch_size=2, settle_seconds=0)['views'], 2)
+        self.assertEqual(update_rollups(batch_size=2, settle_seconds=0)['views'], 2)
+        self.assertEqual(update_rollups(batch_size=2, settle_seconds=0)['views'], 1)
+        self.assertEqual(variant_stats()['kudos']['unique_sessions'], 5)
+
+    def test_recent_events_wait_for_the_settle_period(self):
+        AbTestEvent.objects.create(session_key='new', variant='kudos')
+        self.assertEqual(update_rollups(settle_seconds=3600)['views'], 0)
+
+    def test_stats_endpoint_is_staff_only(self):
+        for i in range(4):
+            self.view(f's{i}')
+        self.click('s0')
+        update_rollups(settle_seconds=0)
+        url = reverse('coffee_abtest_stats')
+
+        self.assertEqual(self.client.get(url).status_code, 302)
+        User.objects.create_user(username='staff', password='pw', is_staff=True)
+        self.client.login(username='staff', password='pw')
+        kudos = self.client.get(url).json()['variants']['kudos']
+        self.assertEqual(kudos['unique_sessions'], 4)
+        self.assertEqual(kudos['conversion_rate'], 0.25)
+        low, high = kudos['conversion_ci_95']
+        self.assertTrue(0 < low < 0.25 < high < 1)
+
+
+class WilsonIntervalTest(SimpleTestCase):
+    """Test the conversion-rate confidence interval."""
+
+    def test_known_value(self):
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=4)
+        self.assertAlmostEqual(high, 0.5962, places=4)
+
+    def test_no_trials(self):
+        self.assertEqual(wilson_interval(0, 0), (0.0, 0.0))
+
+
+class AbTestExportTest(TestCase):
+    """Test the staff-only streaming exports."""
+
+    def setUp(self):
+        day = datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+        for i, variant in enumerate(['kudos', 'thanks', 'kudos']):
+            AbTestEvent.objects.create(session_key=f's{i}', variant=variant, user_agent='UA, "quoted"',
+                                       created_at=day + timedelta(days=i))
+        User.objects.create_user(username='staff', password='pw', is_staff=True)
+        self.client.login(username='staff', password='pw')
+
+    def export(self, kind='views', **params):
+        response = self.client.get(reverse('coffee_abtest_export', kwargs={'kind': kind}), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export().decode())))
+        self.assertEqual([row['session_key'] for row in rows], ['s0', 's1', 's2'])
+        self.assertEqual(rows[0]['user_agent'], 'UA, "quoted"')
+
+    def test_ndjson_with_filters(self):
+        body = self.export(format='ndjson', variant='kudos', since='2025-03-02')
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([row['session_key'] for row in rows], ['s2'])
+
+    def test_gzip(self):
+        rows = list(csv.reader(io.StringIO(gzip.decompress(self.export(gzip='1', until='2025-03-02')).decode())))
+        self.assertEqual(len(rows), 2)
+
+    async def test_streamed_under_asgi(self):
+        await AbTestEvent.objects.abulk_create([AbTestEvent(session_key=f'b{i}', variant='kudos') for i in range(50)])
+        await self.async_client.aforce_login(await User.objects.aget(username='staff'))
+        pulled = []
+        export_rows = exports.export_rows
+
+        def counting_rows(*args, **kwargs):
+            for row in export_rows(*args, **kwargs):
+                pulled.append(row)
+                yield row
+
+        with mock.patch.object(exports, 'export_rows', counting_rows), mock.patch.object(exports, 'BLOCK_SIZE', 1):
+            response = await self.async_client.get(reverse('coffee_abtest_export', kwargs={'kind': 'views'}))
+            self.assertTrue(response.is_async)
+            chunks = aiter(response.streaming_content)
+            first = await anext(chunks)
+            # Only the rows of the first block have been read when it is sent
+            self.assertLess(len(pulled), 10)
+            rest = [chunk async for chunk in chunks]
+        rows = list(csv.reader(io.StringIO((first + b''.join(rest)).decode())))
+        self.assertEqual(len(rows), 1 + 53)
+        self.assertEqual(len(pulled), 53)
+
+    def test_unknown_kind_and_format(self):
+        url = reverse('coffee_abtest_export', kwargs={'kind': 'views'})
+        self.assertEqual(self.client.get(url, {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('coffee_abtest_export', kwargs={'kind': 'x'})).status_code, 404)
+
+    def test_invalid_bounds(self):
+        urls = [reverse('coffee_abtest_export', kwargs={'kind': 'views'}), reverse('coffee_abtest_stats')]
+        for url in urls:
+            for params in [{'since': '2024-02-30'}, {'until': '2024-13-01T00:00'}, {'since': 'garbage'}]:
+                with self.subTest(url=url, **params):
+                    self.assertEqual(self.client.get(url, params).status_code, 400)
+
+    def test_staff_only(self):
+        self.client.logout()
+        response = self.client.get(reverse('coffee_abtest_export', kwargs={'kind': 'clicks'}))
+        self.assertEqual(response.status_code, 302)
+
+
+class UserAgentEncodingTest(TestCase):
+    """Test interning user agents and backfilling old rows."""
+
+    def test_ids_for_reuses_existing_rows(self):
+        first = UserAgent.ids_for(['a', 'b', ''])
+        second = UserAgent.ids_for(['b', 'c'])
+        self.assertEqual(set(first), {'a', 'b'})
+        self.assertEqual(first['b'], second['b'])
+        self.assertEqual(UserAgent.objects.count(), 3)
+
+    def test_normalize_ip(self):
+        self.assertEqual(normalize_ip(' 2001:DB8::1 '), '2001:db8::1')
+        self.assertIsNone(normalize_ip('unknown'))
+
+    def test_backfill_command(self):
+        for i in range(5):
+            AbTestEvent.objects.create(session_key=f's{i}', variant='kudos', user_agent=f'UA {i % 2}',
+                                       ip_address='192.168.0.1')
+        AbTestClickEvent.objects.create(session_key='s0', variant='kudos', user_agent='UA 0')
+        call_command('backfill_abtest_agents', batch_size=2, sleep=0, stdout=io.StringIO())
+
+        self.assertFalse(AbTestEvent.objects.exclude(user_agent='').exists())
+        self.assertEqual(UserAgent.objects.count(), 2)
+        self.assertEqual(set(AbTestEvent.objects.values_list('ip', flat=True)), {'192.168.0.1'})
+        self.assertEqual(AbTestClickEvent.objects.get().agent.user_agent, 'UA 0')
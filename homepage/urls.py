@@ -8,5 +8,7 @@ urlpatterns = [
     path('', views.index, name='index'),
     path(f'{_slug}/', views.coffee_abtest, name='coffee_abtest'),
     path(f'{_slug}/track-click/', views.coffee_abtest_click, name='coffee_abtest_click'),
+    path(f'{_slug}/stats/', views.coffee_abtest_stats, name='coffee_abtest_stats'),
+    path(f'{_slug}/export/<str:kind>/', views.coffee_abtest_export, name='coffee_abtest_export'),
 ]
 
@@ -1,8 +1,16 @@
+from datetime import datetime, time
 from django.shortcuts import render
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET, require_POST
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.handlers.asgi import ASGIRequest
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from .models import UserDetails, AbTestEvent, AbTestClickEvent
-import random
+from .assignment import assign_variant, get_visitor_id, set_visitor_cookie
+from .buffer import record
+from .exports import EXPORT_MODELS, FORMATS, astream_export, stream_export
+from .rollups import variant_stats
 
 def index(request):
     # Fetch the first 5 users from the database
@@ -18,38 +26,117 @@ TEAM_NICKNAMES = [
 
 def coffee_abtest(request):
     """Public A/B test page for coffee-chatters."""
-    if not request.session.session_key:
-        request.session.save()
+    # Variant comes from the signed visitor cookie; no session row is created
+    visitor_id, is_new = get_visitor_id(request)
+    variant = assign_variant(visitor_id)
 
-    variant = request.session.get('ab_variant')
-    if variant not in ['kudos', 'thanks']:
-        variant = random.choice(['kudos', 'thanks'])
-        request.session['ab_variant'] = variant
-
-    # Track every view
-    AbTestEvent.objects.create(
-        session_key=request.session.session_key,
+    # Track every view (buffered and bulk-written off the request path)
+    record(AbTestEvent(
+        session_key=visitor_id,
         variant=variant,
         user_agent=request.META.get('HTTP_USER_AGENT', '')[:255],
         ip_address=request.META.get('REMOTE_ADDR', '')
-    )
+    ))
 
-    return render(request, 'render/coffee_abtest.html', {
+    response = render(request, 'render/coffee_abtest.html', {
         'nicknames': TEAM_NICKNAMES,
         'variant': variant
     })
+    if is_new:
+        set_visitor_cookie(response, visitor_id)
+    return response
 
 @require_POST
 def coffee_abtest_click(request):
     """AJAX endpoint to record a button click for the A/B test."""
-    if not request.session.session_key:
-        request.session.save()
-    variant = request.session.get('ab_variant')
-    AbTestClickEvent.objects.create(
-        session_key=request.session.session_key,
+    visitor_id, is_new = get_visitor_id(request)
+    variant = assign_variant(visitor_id)
+    record(AbTestClickEvent(
+        session_key=visitor_id,
         variant=variant,
         user_agent=request.META.get('HTTP_USER_AGENT', '')[:255],
         ip_address=request.META.get('REMOTE_ADDR', '')
-    )
-    return JsonResponse({'status': 'ok', 'variant': variant})
+    ))
+    response = JsonResponse({'status': 'ok', 'variant': variant})
+    if is_new:
+        set_visitor_cookie(response, visitor_id)
+    return response
+
+
+def _parse_bound(name, value):
+    """
+    Parse a since/until query value (ISO datetime or date, in the current timezone); None if absent.
+
+    Raises:
+        ValueError: the value is present but not a valid date or datetime
+    """
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError(value)
+            parsed = datetime.combine(day, time.min)
+    except ValueError:
+        raise ValueError(f'{name} must be an ISO date or datetime') from None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _parse_bounds(request):
+    """(since, until) from the query string; raises ValueError for an invalid bound."""
+    return _parse_bound('since', request.GET.get('since')), _parse_bound('until', request.GET.get('until'))
 
+
+@staff_member_required
+@require_GET
+def coffee_abtest_stats(request):
+    """Staff-only JSON summary of the A/B test, read from the hourly rollups (never the raw events)."""
+    try:
+        since, until = _parse_bounds(request)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse({
+        'variants': variant_stats(since=since, until=until),
+        'since': since.isoformat() if since else None,
+        'until': until.isoformat() if until else None,
+    })
+
+
+@staff_member_required
+@require_GET
+def coffee_abtest_export(request, kind):
+    """
+    Staff-only streaming export of raw A/B events ('views' or 'clicks').
+
+    Query parameters: format=csv|ndjson, since, until, variant, gzip=1.
+    """
+    model = EXPORT_MODELS.get(kind)
+    if model is None:
+        raise Http404('Unknown event type')
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in FORMATS:
+        return HttpResponseBadRequest('format must be csv or ndjson')
+    try:
+        since, until = _parse_bounds(request)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    compress = request.GET.get('gzip', '').lower() in ['1', 'true', 'yes']
+    filename = f'abtest-{kind}.{fmt}' + ('.gz' if compress else '')
+    # An ASGI server only streams async iterators; a sync one would be read into memory first
+    stream = astream_export if isinstance(request, ASGIRequest) else stream_export
+
+    response = StreamingHttpResponse(
+        stream(
+            model, fmt, compress,
+            since=since,
+            until=until,
+            variant=request.GET.get('variant') or None,
+        ),
+        content_type='application/gzip' if compress else FORMATS[fmt],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
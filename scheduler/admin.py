@@ -1,7 +1,10 @@
 from django.contrib import admin
-from .models import MeetingRequest, TimeOption, GoogleOAuthCredential
+from .models import MeetingRequest, TimeOption, GoogleOAuthCredential, CalendarEventJob, OutboundEmail, UserProfile
 
 # Register your models here.
 admin.site.register(MeetingRequest)
 admin.site.register(TimeOption)
 admin.site.register(GoogleOAuthCredential)
+admin.site.register(CalendarEventJob)
+admin.site.register(OutboundEmail)
+admin.site.register(UserProfile)
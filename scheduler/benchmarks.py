@@ -0,0 +1,207 @@
+"""
+Benchmarks for the scheduler's hot paths, run by ``manage.py benchmark``.
+
+Views are exercised through the Django test client against a dataset from
+scheduler.seed, inside a transaction that is rolled back afterwards. The
+Calendar API is replaced by a local stand-in, email uses the in-memory backend
+and caches are in-memory, so results don't depend on the network or on
+whether Redis is configured. Each case reports p50/p95 latency, ops/s and
+queries per call; runs are appended to a JSON history file and compared with
+a stored baseline.
+"""
+import json
+import statistics
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import cycle
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+from django.conf import settings
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ai_event_scheduler.profiling import profile
+from homepage import buffer
+
+from .emails import send_meeting_created_email, send_time_selected_email
+from .integrations.freebusy import to_rfc3339
+from .integrations.freebusy_cache import invalidate_free_busy
+from .integrations.google_calendar import find_common_free_slots, get_free_busy_for_users
+
+# Slots submitted per create_meeting case
+CREATE_SLOT_COUNTS = (1, 10, 100)
+# Attendees in the free/busy cases
+FREEBUSY_USERS = 10
+IN_MEMORY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-default'},
+    'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-local'},
+}
+
+
+@dataclass
+class Case:
+    """One benchmarked operation; `before` runs ahead of every call, untimed."""
+    name: str
+    run: Callable[[], object]
+    before: Optional[Callable[[], None]] = None
+
+
+class StubCalendarService:
+    """Answers freebusy queries and event inserts like the Calendar API, without the network."""
+
+    def __init__(self, busy_start, busy_end):
+        self.busy = [{'start': to_rfc3339(busy_start), 'end': to_rfc3339(busy_end)}]
+
+    def freebusy(self):
+        return self
+
+    def events(self):
+        return self
+
+    def query(self, body):
+        self._result = {'calendars': {item['id']: {'busy': self.busy} for item in body['items']}}
+        return self
+
+    def insert(self, calendarId, body, sendUpdates=None):
+        self._result = {'id': body.get('id', 'benchmark-event')}
+        return self
+
+    def execute(self):
+        return self._result
+
+
+@contextmanager
+def stubbed_environment(busy_start, busy_end):
+    """Stub Google and SMTP, use in-memory caches and write A/B events inline."""
+    stub = StubCalendarService(busy_start, busy_end)
+    events = buffer.EventBuffer(flush_size=getattr(settings, 'ABTEST_BUFFER_SIZE', 200), async_flush=False)
+    with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                           ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+                           CACHES=IN_MEMORY_CACHES), \
+            mock.patch('scheduler.integrations.google_calendar._build_calendar_service', return_value=stub), \
+            mock.patch.object(buffer, 'event_buffer', events):
+        try:
+            yield
+        finally:
+            events.flush()
+
+
+def _slot_data(count, day):
+    data = {'title': f'Benchmark ({count} slots)', 'description': '', 'time_slot_count': str(count)}
+    for i in range(count):
+        start = day + timedelta(hours=2 * i)
+        data[f'start_time_{i}'] = start.strftime('%Y-%m-%dT%H:%M')
+        data[f'end_time_{i}'] = (start + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M')
+    return data
+
+
+def build_cases(organizer, meeting, attendees) -> List[Case]:
+    """
+    The benchmark cases.
+
+    Args:
+        organizer: Signed-in user for the scheduler views
+        meeting: One of the organizer's meetings, with at least two time options
+        attendees: Users for the free/busy helpers
+    """
+    client = Client()
+    client.force_login(organizer)
+    visitor = Client()
+    options = list(meeting.time_options.all())
+    next_option = cycle(options)
+    day = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=3)
+    windows = [(option.start_time, option.end_time) for option in options]
+    detail_url = reverse('meeting_detail', kwargs={'pk': meeting.pk})
+    select_url = reverse('select_time', kwargs={'pk': meeting.pk})
+
+    def clear_free_busy():
+        for user in attendees:
+            invalidate_free_busy(user.pk)
+
+    cases = [
+        Case('dashboard', lambda: client.get(reverse('dashboard'))),
+        Case('meeting_detail', lambda: client.get(detail_url)),
+    ]
+    for count in CREATE_SLOT_COUNTS:
+        data = _slot_data(count, day)
+        cases.append(Case(f'create_meeting[{count}]', lambda data=data: client.post(reverse('create_meeting'), data)))
+    cases += [
+        Case('select_time', lambda: client.post(select_url, {'time_option_id': next(next_option).pk})),
+        Case('coffee_abtest', lambda: visitor.get(reverse('coffee_abtest'))),
+        Case('email:meeting_created', lambda: send_meeting_created_email(meeting)),
+        Case('email:time_selected', lambda: send_time_selected_email(meeting, options[0])),
+        Case('get_free_busy_for_users', lambda: get_free_busy_for_users(attendees, windows, requester=organizer),
+             before=clear_free_busy),
+        Case('find_common_free_slots', lambda: find_common_free_slots(attendees, windows, requester=organizer),
+             before=clear_free_busy),
+    ]
+    return cases
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def measure(case: Case, iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """Time `iterations` calls (after `warmup` untimed ones): p50/p95/mean ms, ops/s, queries per call."""
+    for _ in range(warmup):
+        if case.before:
+            case.before()
+        case.run()
+    timings, queries = [], []
+    for _ in range(iterations):
+        if case.before:
+            case.before()
+        with profile() as prof:
+            case.run()
+        timings.append(prof.total_ms)
+        queries.append(prof.queries)
+    timings.sort()
+    mean = statistics.mean(timings)
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(_percentile(timings, 0.95), 3),
+        'mean_ms': round(mean, 3),
+        'ops_per_s': round(1000 / mean, 1) if mean else 0.0,
+        'queries': round(statistics.mean(queries), 2),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float,
+            min_delta_ms: float = 0.5) -> List[str]:
+    """
+    Regressions of `results` against `baseline`.
+
+    A case regresses when its p50 grows by more than `threshold` (0.2 = 20%)
+    and by at least `min_delta_ms` (sub-millisecond cases are mostly noise),
+    or when it runs more queries per call than before.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        slower = current['p50_ms'] - previous['p50_ms']
+        if current['p50_ms'] > previous['p50_ms'] * (1 + threshold) and slower >= min_delta_ms:
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms")
+        if current['queries'] > previous['queries'] + 0.5:
+            regressions.append(f"{name}: queries {previous['queries']:g} -> {current['queries']:g}")
+    return regressions
+
+
+def load_json(path: Path, default=None):
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return default
+
+
+def save_json(path: Path, data) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + '\n')
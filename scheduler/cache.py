@@ -0,0 +1,133 @@
+"""
+Cache-aside helpers for the scheduler's read paths.
+
+Entries are keyed by the current version token of every scope they depend on
+(``meeting:<pk>``, ``user-meetings:<user id>``, ``google:<user id>``,
+``profile:<user id>``).
+Invalidating a scope swaps its token for a new random one, so every entry
+built from the old token is simply never read again: O(1), no key scans.
+
+Version tokens live in the shared ``default`` cache so all workers agree on
+them; the values are also kept in the per-process ``local`` cache, so a warm
+read costs one shared-cache lookup for the tokens and nothing else. Signal
+handlers in ``scheduler.signals`` invalidate the scopes when meetings, time
+options, Google credentials or user profiles change.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import GoogleOAuthCredential, MeetingRequest, UserProfile
+
+
+def _shared():
+    return caches['default']
+
+
+def _local():
+    return caches['local']
+
+
+def meeting_scope(meeting_id) -> str:
+    return f'meeting:{meeting_id}'
+
+
+def user_meetings_scope(user_id) -> str:
+    return f'user-meetings:{user_id}'
+
+
+def google_scope(user_id) -> str:
+    return f'google:{user_id}'
+
+
+def profile_scope(user_id) -> str:
+    return f'profile:{user_id}'
+
+
+def _version_key(scope: str) -> str:
+    return f'cache-version:{scope}'
+
+
+def _new_token() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _versions(scopes):
+    keys = [_version_key(scope) for scope in scopes]
+    tokens = _shared().get_many(keys)
+    missing = [key for key in keys if key not in tokens]
+    if missing:
+        for key in missing:
+            _shared().add(key, _new_token(), timeout=None)
+        # Re-read: another worker may have added its token first
+        tokens.update(_shared().get_many(missing))
+    return [tokens[key] for key in keys]
+
+
+def cache_aside(name: str, scopes, loader, timeout=None):
+    """
+    Return the cached result of `loader()`, loading and caching it on a miss.
+
+    Args:
+        name: Identifies the read (plus any parameters, e.g. a page cursor)
+        scopes: Scopes whose invalidation must drop this entry
+        loader: Builds the value (None is a valid, cacheable value)
+        timeout: Shared-cache lifetime in seconds (default settings.CACHE_TIMEOUT)
+    """
+    key = f'{name}:' + ':'.join(_versions(scopes))
+    entry = _local().get(key)
+    if entry is None:
+        entry = _shared().get(key)
+        if entry is None:
+            # Wrapped so that a cached None is distinguishable from a miss
+            entry = (loader(),)
+            _shared().set(key, entry, timeout if timeout is not None else getattr(settings, 'CACHE_TIMEOUT', 300))
+        _local().set(key, entry)
+    return entry[0]
+
+
+def _bump(scopes) -> None:
+    _shared().set_many({_version_key(scope): _new_token() for scope in scopes}, timeout=None)
+
+
+def invalidate(*scopes) -> None:
+    """
+    Drop every entry that depends on any of `scopes`.
+
+    Bumps now and again once the surrounding transaction commits, so a reader
+    that cached pre-commit data in between doesn't keep it.
+    """
+    _bump(scopes)
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def get_meeting(meeting_id):
+    """A meeting with its organizer, selected option and time options loaded, or None."""
+    return cache_aside(
+        f'meeting:{meeting_id}', [meeting_scope(meeting_id)],
+        lambda: (
+            MeetingRequest.objects
+            .select_related('organizer', 'selected_option')
+            .prefetch_related('time_options')
+            .filter(pk=meeting_id)
+            .first()
+        ),
+    )
+
+
+def google_connected(user) -> bool:
+    """Whether the user has connected Google Calendar."""
+    return cache_aside(
+        f'google-connected:{user.pk}', [google_scope(user.pk)],
+        lambda: GoogleOAuthCredential.objects.filter(user_id=user.pk).exists(),
+    )
+
+
+def user_timezone(user) -> str:
+    """The user's preferred timezone name, or '' if they haven't picked one."""
+    return cache_aside(
+        f'user-timezone:{user.pk}', [profile_scope(user.pk)],
+        lambda: UserProfile.objects.filter(user_id=user.pk).values_list('timezone', flat=True).first() or '',
+    )
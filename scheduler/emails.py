@@ -1,17 +1,94 @@
-from django.core.mail import send_mail
+"""
+Notification emails.
+
+The builders below only enqueue an OutboundEmail row, so requests never wait
+on SMTP. `manage.py send_queued_emails` delivers pending messages in batches
+over a single connection, retrying with backoff and parking messages that keep
+failing as dead letters.
+"""
+from django.core.mail import EmailMessage, get_connection
 from django.utils import timezone
 
+from ai_event_scheduler import metrics
+
+from .models import OutboundEmail
+from .outbox import backoff, claim_due
+
+MAX_ATTEMPTS = 5
+
+
 def _send(to_email: str, subject: str, message: str) -> None:
-    """Safe send wrapper that no-ops if email missing."""
+    """Queue an email for delivery; no-ops if the address is missing."""
     if not to_email:
         return
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=None,  # uses DEFAULT_FROM_EMAIL
-        recipient_list=[to_email],
-        fail_silently=True,  # avoid breaking user flow if email fails
-    )
+    OutboundEmail.objects.create(to_email=to_email, subject=subject[:255], body=message)
+
+
+def _record_failure(email, exc, now) -> None:
+    email.last_error = str(exc)[:2000]
+    if email.attempts >= MAX_ATTEMPTS:
+        email.status = OutboundEmail.STATUS_DEAD
+    else:
+        email.next_attempt_at = now + backoff(email.attempts)
+
+
+def deliver_queued_emails(batch_size: int = 100) -> dict:
+    """
+    Send one batch of due emails over a single connection.
+
+    If the mail server can't be reached, every message not yet sent counts
+    one failed attempt and is backed off; the function still returns normally.
+
+    Returns:
+        Count per resulting status ('sent', 'pending' for retries, 'dead')
+    """
+    batch = list(claim_due(OutboundEmail, batch_size))
+    if not batch:
+        return {}
+
+    counts = {}
+    now = timezone.now()
+    connection = get_connection(fail_silently=False)
+    unreachable = None
+    try:
+        try:
+            connection.open()
+        except Exception as exc:
+            unreachable = exc
+        for email in batch:
+            email.attempts += 1
+            if unreachable is not None:
+                _record_failure(email, unreachable, now)
+                counts[email.status] = counts.get(email.status, 0) + 1
+                continue
+            try:
+                # One message per call so a failure can't hide which messages went out
+                with metrics.timed_call('email_sends_total', 'email_send_duration_seconds'):
+                    connection.send_messages([EmailMessage(email.subject, email.body, to=[email.to_email],
+                                                           connection=connection)])
+            except Exception as exc:
+                _record_failure(email, exc, now)
+                # The connection may be broken; start a fresh one for the rest of the batch
+                try:
+                    connection.close()
+                    connection.open()
+                except Exception as reopen_exc:
+                    unreachable = reopen_exc
+            else:
+                email.status = OutboundEmail.STATUS_SENT
+                email.sent_at = timezone.now()
+                email.last_error = ''
+            counts[email.status] = counts.get(email.status, 0) + 1
+    finally:
+        OutboundEmail.objects.bulk_update(
+            batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'], batch_size=500,
+        )
+        try:
+            connection.close()
+        except Exception:
+            pass  # the outcome of the batch is already saved
+    return counts
+
 
 def send_meeting_created_email(meeting) -> None:
     """Notify organizer after meeting creation with proposed options."""
@@ -0,0 +1,105 @@
+"""
+Multi-user availability engine.
+
+Pure Python (no Django imports) so it can be tested and benchmarked on its own.
+Every participant's busy intervals and every candidate time option are turned
+into start/end events and resolved in a single sort-and-sweep pass, which costs
+O((n + m) log(n + m) + conflicts) for n busy intervals and m options (plus one
+step per busy-user/option conflict reported) instead of checking each option
+against each user one at a time.
+
+All intervals are half-open ``[start, end)``: a meeting that ends at 10:00 does
+not conflict with one that starts at 10:00.
+"""
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# At equal timestamps ends sort before starts, which gives half-open semantics.
+_END = 0
+_START = 1
+
+_BUSY = 0
+_OPTION = 1
+
+
+def merge_intervals(intervals: Iterable[Tuple]) -> List[Tuple]:
+    """
+    Sort ``(start, end)`` intervals and merge the ones that overlap.
+
+    Empty or inverted intervals (``end <= start``) are dropped. Intervals that
+    only touch (one ends exactly when the next starts) are kept separate.
+    """
+    merged: List[list] = []
+    for start, end in sorted(i for i in intervals if i[1] > i[0]):
+        if merged and start < merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def evaluate_options(busy_by_user: Mapping[Hashable, Iterable[Tuple]],
+                     options: Sequence[Tuple],
+                     quorum: Optional[int] = None) -> List[Dict]:
+    """
+    Resolve which users are busy during each candidate option.
+
+    Args:
+        busy_by_user: Mapping of user key -> iterable of ``(start, end)`` busy intervals
+        options: Sequence of ``(start, end)`` candidate time options
+        quorum: Minimum number of free users for an option to count as available
+            ("at least k of n"); defaults to every user
+
+    Returns:
+        One dict per option, in input order, with the busy and free users (in
+        ``busy_by_user`` order), the free count and whether the quorum is met.
+    """
+    users = list(busy_by_user)
+    total = len(users)
+    if quorum is None:
+        quorum = total
+
+    events = []
+    for user_idx, user in enumerate(users):
+        for start, end in merge_intervals(busy_by_user[user]):
+            events.append((start, _START, _BUSY, user_idx))
+            events.append((end, _END, _BUSY, user_idx))
+    for option_idx, (start, end) in enumerate(options):
+        if end > start:
+            events.append((start, _START, _OPTION, option_idx))
+            events.append((end, _END, _OPTION, option_idx))
+    events.sort()
+
+    # Busy intervals are merged per user, so a user is active at most once.
+    active_users = set()
+    active_options = set()
+    conflicts = [set() for _ in options]
+    for _, phase, kind, idx in events:
+        if kind == _BUSY:
+            if phase == _START:
+                active_users.add(idx)
+                for option_idx in active_options:
+                    conflicts[option_idx].add(idx)
+            else:
+                active_users.discard(idx)
+        else:
+            if phase == _START:
+                active_options.add(idx)
+                conflicts[idx].update(active_users)
+            else:
+                active_options.discard(idx)
+
+    results = []
+    for (start, end), busy in zip(options, conflicts):
+        free_count = total - len(busy)
+        results.append({
+            'start_time': start,
+            'end_time': end,
+            'busy_users': [users[i] for i in sorted(busy)],
+            'free_users': [user for i, user in enumerate(users) if i not in busy],
+            'free_count': free_count,
+            'total_users': total,
+            'availability_score': free_count / total if total else 1.0,
+            'available': free_count >= quorum,
+        })
+    return results
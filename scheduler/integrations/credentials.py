@@ -0,0 +1,247 @@
+"""
+Google OAuth credential loading, caching and refresh.
+
+Each worker keeps a bounded LRU of ready-to-use ``Credentials`` objects (and of
+"not connected" answers) so the Calendar helpers don't query
+``GoogleOAuthCredential`` and rebuild credentials on every call. Each entry
+records the user's credential version from the shared Django cache and is only
+served while that version is current. Connecting, disconnecting (see
+``scheduler.signals``) and every token refresh bump the version, so the other
+workers drop revoked or replaced tokens on their next read instead of when the
+entry expires. Entries still expire after ``settings.GOOGLE_CREDENTIAL_CACHE_TTL``
+seconds as a backstop.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone as dj_timezone
+
+from scheduler.models import GoogleOAuthCredential
+
+try:
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request
+    GOOGLE_AUTH_AVAILABLE = True
+except Exception:
+    GOOGLE_AUTH_AVAILABLE = False
+
+DEFAULT_TOKEN_URI = 'https://oauth2.googleapis.com/token'
+
+
+class CredentialCache:
+    """Thread-safe LRU of user_id -> Credentials (None = not connected) with a max age and a version."""
+
+    _MISS = object()
+
+    def __init__(self, max_size: int = 512, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version=None):
+        """Cached value stored under `version`, or CredentialCache._MISS."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return self._MISS
+            loaded_at, loaded_version, value = entry
+            if loaded_version != version or time.monotonic() - loaded_at > self.ttl:
+                del self._entries[user_id]
+                return self._MISS
+            self._entries.move_to_end(user_id)
+            return value
+
+    def set(self, user_id, value, version=None) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), version, value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+credential_cache = CredentialCache(
+    max_size=getattr(settings, 'GOOGLE_CREDENTIAL_CACHE_SIZE', 512),
+    ttl=getattr(settings, 'GOOGLE_CREDENTIAL_CACHE_TTL', 300),
+)
+
+
+def _version_key(user_id) -> str:
+    return f'credentials:version:{user_id}'
+
+
+def credential_version(user_id) -> int:
+    """Current shared version of a user's stored credentials."""
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        cache.add(_version_key(user_id), 1, timeout=None)
+        version = cache.get(_version_key(user_id), 1)
+    return version
+
+
+def _bump_version(user_id) -> int:
+    try:
+        return cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 2, timeout=None)
+        return 2
+
+
+def _to_utc_naive(value):
+    """google-auth compares expiry against naive UTC datetimes."""
+    if value is not None and dj_timezone.is_aware(value):
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def aware_expiry(value):
+    """Store expiries as aware UTC datetimes (USE_TZ=True)."""
+    if value is not None and dj_timezone.is_naive(value):
+        return dj_timezone.make_aware(value, timezone.utc)
+    return value
+
+
+def credentials_from_record(record):
+    """Build google.oauth2.credentials.Credentials from a stored DB record."""
+    scopes = record.scopes.split() if record.scopes else settings.GOOGLE_OAUTH_SCOPES
+    return Credentials(
+        token=record.token,
+        refresh_token=record.refresh_token,
+        token_uri=record.token_uri or DEFAULT_TOKEN_URI,
+        client_id=settings.GOOGLE_OAUTH_CLIENT_ID,
+        client_secret=settings.GOOGLE_OAUTH_CLIENT_SECRET,
+        scopes=scopes,
+        expiry=_to_utc_naive(record.expiry),
+    )
+
+
+def apply_refreshed(record, creds) -> None:
+    """Copy refreshed token data onto the record (does not save)."""
+    record.token = creds.token
+    # refresh_token might be None on refresh; keep existing if not returned
+    if getattr(creds, 'refresh_token', None):
+        record.refresh_token = creds.refresh_token
+    record.expiry = aware_expiry(getattr(creds, 'expiry', None))
+    record.scopes = ' '.join(creds.scopes or []) or record.scopes
+
+
+def _refresh_inline(user_id, creds) -> None:
+    """Refresh an expired token inside the request (fallback when the refresher is behind)."""
+    creds.refresh(Request())
+    fields = {'token': creds.token, 'expiry': aware_expiry(creds.expiry), 'updated_at': dj_timezone.now()}
+    if creds.refresh_token:
+        fields['refresh_token'] = creds.refresh_token
+    GoogleOAuthCredential.objects.filter(user_id=user_id).update(**fields)
+    # update() sends no signal: retire the old token in the other workers, keep the new one here
+    credential_cache.set(user_id, creds, _bump_version(user_id))
+
+
+def _cached_credentials(user_id):
+    # Read the version before the row, so a change in between leaves a stale version, not stale creds
+    version = credential_version(user_id)
+    creds = credential_cache.get(user_id, version)
+    if creds is CredentialCache._MISS:
+        record = GoogleOAuthCredential.objects.filter(user_id=user_id).first()
+        creds = credentials_from_record(record) if record else None
+        credential_cache.set(user_id, creds, version)
+    return creds
+
+
+def load_user_credentials(user):
+    """
+    Cached Credentials for a connected user, refreshed if expired; None if not connected.
+
+    Raises:
+        Exception: the expired token could not be refreshed
+    """
+    if not GOOGLE_AUTH_AVAILABLE:
+        return None
+    creds = _cached_credentials(user.pk)
+    if creds is None:
+        return None
+    if creds.expired and creds.refresh_token:
+        try:
+            _refresh_inline(user.pk, creds)
+        except Exception:
+            credential_cache.invalidate(user.pk)
+            raise
+    return creds
+
+
+def get_user_credentials(user):
+    """Cached Credentials for a connected user, refreshed if expired; else None."""
+    try:
+        return load_user_credentials(user)
+    except Exception:
+        return None
+
+
+def has_google_credentials(user) -> bool:
+    """Whether the user has connected Google Calendar (served from the cache when warm)."""
+    if not GOOGLE_AUTH_AVAILABLE:
+        return GoogleOAuthCredential.objects.filter(user_id=user.pk).exists()
+    return _cached_credentials(user.pk) is not None
+
+
+def invalidate_credentials(user_id) -> None:
+    """Forget the cached credentials for a user in every process (bumps the shared version)."""
+    _bump_version(user_id)
+    credential_cache.invalidate(user_id)
+
+
+def refresh_expiring_tokens(window_seconds: int, max_workers: int = 8):
+    """
+    Renew every stored access token that expires within `window_seconds`.
+
+    Token endpoint calls run in a small thread pool; the renewed rows are
+    written back with one bulk update.
+
+    Returns:
+        (refreshed, failed) counts
+    """
+    if not GOOGLE_AUTH_AVAILABLE:
+        return 0, 0
+    cutoff = dj_timezone.now() + timedelta(seconds=window_seconds)
+    records = list(
+        GoogleOAuthCredential.objects
+        .filter(expiry__lt=cutoff, refresh_token__isnull=False)
+        .exclude(refresh_token='')
+    )
+
+    def renew(record):
+        creds = credentials_from_record(record)
+        creds.refresh(Request())
+        return creds
+
+    refreshed, failed = [], 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(renew, record): record for record in records}
+        for future in as_completed(futures):
+            record = futures[future]
+            try:
+                apply_refreshed(record, future.result())
+            except Exception:
+                failed += 1
+                continue
+            record.updated_at = dj_timezone.now()
+            refreshed.append(record)
+
+    GoogleOAuthCredential.objects.bulk_update(
+        refreshed, ['token', 'refresh_token', 'expiry', 'scopes', 'updated_at'], batch_size=500,
+    )
+    for record in refreshed:
+        invalidate_credentials(record.user_id)
+    return len(refreshed), failed
@@ -0,0 +1,63 @@
+"""
+Process-wide Google Calendar discovery document registry.
+
+``googleapiclient.discovery.build`` reads and parses the Calendar discovery
+document (and on some versions fetches it over HTTP) on every call. We load the
+static copy that ships with google-api-python-client once per process, keep the
+parsed dict, and bind a lightweight service to each user's credentials with
+``build_from_document``.
+"""
+import json
+import threading
+
+try:
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+    from googleapiclient.http import build_http
+    import google_auth_httplib2
+    import httplib2
+    DISCOVERY_AVAILABLE = True
+except Exception:
+    DISCOVERY_AVAILABLE = False
+
+_document = None
+_lock = threading.Lock()
+
+
+def _warm_up(document: dict) -> None:
+    """
+    Touch every top-level resource once.
+
+    The client fixes up method descriptions in place the first time a resource
+    is created; doing it here, under the lock, means later requests only ever
+    read the shared document.
+    """
+    # An explicit (unauthenticated, never used) http avoids a default-credentials lookup
+    service = build_from_document(document, http=build_http())
+    for name in document.get('resources', {}):
+        getattr(service, name)()
+
+
+def calendar_discovery_document():
+    """Parsed Calendar v3 discovery document, or None if it is unavailable."""
+    global _document
+    if _document is None and DISCOVERY_AVAILABLE:
+        with _lock:
+            if _document is None:
+                content = get_static_doc('calendar', 'v3')
+                if content:
+                    document = json.loads(content)
+                    _warm_up(document)
+                    _document = document
+    return _document
+
+
+def build_calendar_service(credentials, timeout=None):
+    """Calendar API service bound to `credentials`, built from the shared document (`timeout` in seconds)."""
+    document = calendar_discovery_document()
+    if document is None:
+        return None
+    if timeout is None:
+        return build_from_document(document, credentials=credentials)
+    http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=timeout))
+    return build_from_document(document, http=http)
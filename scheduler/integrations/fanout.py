@@ -0,0 +1,111 @@
+"""
+Concurrent fan-out of independent calls, e.g. one free/busy lookup per attendee.
+
+Calls run on a bounded, process-wide thread pool, so a batch costs about as much
+as its slowest call instead of the sum of all of them. Each call gets `timeout`
+seconds from when it starts and the whole batch `deadline` seconds. Calls that
+raise, time out or miss the deadline are reported as unknown instead of failing
+the batch; whatever finished in time is returned.
+
+Threads can't be interrupted: a call that timed out keeps its worker until it
+returns, so the calls themselves need a transport timeout no longer than
+`timeout` (free/busy lookups cap their socket timeout at FREEBUSY_CALL_TIMEOUT),
+or a few stalled calls can occupy the whole pool. Calls run in a copy of the
+caller's context, so their outbound time is attributed to the active request
+profile.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+from django.conf import settings
+
+DEFAULT_MAX_WORKERS = 8
+# How often to look for calls that started while others were still queued
+POLL_INTERVAL = 0.05
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class FanOutResult:
+    """Return values by key, and why the other keys are unknown ('error', 'timeout' or 'deadline')."""
+    results: Dict[Hashable, Any] = field(default_factory=dict)
+    unknown: Dict[Hashable, str] = field(default_factory=dict)
+
+
+def _pool() -> Executor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'FANOUT_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+                    thread_name_prefix='fanout',
+                )
+    return _executor
+
+
+def fan_out(calls: Mapping[Hashable, Callable[[], Any]], timeout: float, deadline: float,
+            executor: Optional[Executor] = None) -> FanOutResult:
+    """
+    Run `calls` concurrently and collect what finishes in time.
+
+    Args:
+        calls: Mapping of key -> zero-argument callable
+        timeout: Seconds each call may run once it has started
+        deadline: Seconds the whole fan-out may take
+        executor: Pool to run on (default: the shared, bounded pool)
+
+    Returns:
+        FanOutResult; every key ends up in exactly one of results and unknown.
+    """
+    outcome = FanOutResult()
+    if not calls:
+        return outcome
+    executor = executor or _pool()
+    started_at = {}
+
+    def run(key, call):
+        started_at[key] = time.monotonic()
+        return call()
+
+    futures = {
+        executor.submit(contextvars.copy_context().run, run, key, call): key
+        for key, call in calls.items()
+    }
+    give_up = time.monotonic() + deadline
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        wake = give_up
+        for future in pending:
+            key = futures[future]
+            if key in started_at:
+                wake = min(wake, started_at[key] + timeout)
+            else:
+                wake = min(wake, now + POLL_INTERVAL)
+        done, pending = wait(pending, timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+        for future in done:
+            key = futures[future]
+            try:
+                outcome.results[key] = future.result()
+            except Exception:
+                outcome.unknown[key] = 'error'
+
+        now = time.monotonic()
+        for future in list(pending):
+            key = futures[future]
+            if now >= give_up:
+                future.cancel()  # only stops calls that haven't started
+                outcome.unknown[key] = 'deadline'
+            elif key in started_at and now - started_at[key] >= timeout:
+                outcome.unknown[key] = 'timeout'
+            else:
+                continue
+            pending.discard(future)
+    return outcome
@@ -0,0 +1,154 @@
+"""
+Free/busy cache.
+
+Busy intervals are cached per (user, calendar, time windows) in the Django
+cache for ``settings.FREEBUSY_CACHE_TTL`` seconds. Every key embeds a per-user
+version number, so invalidating a user (e.g. after we create an event on their
+calendar) is a single counter bump rather than a key scan.
+
+Concurrent misses for the same key inside one process are collapsed: the first
+caller fetches, the others wait for its result (single-flight). Async callers
+get the same guarantee per event loop from aget_cached_free_busy().
+"""
+import asyncio
+import hashlib
+import threading
+import weakref
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from scheduler.integrations.freebusy import to_rfc3339
+
+DEFAULT_TTL = 300
+# How long followers wait for the leader's fetch before giving up.
+SINGLE_FLIGHT_TIMEOUT = 30
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+
+_inflight: Dict[str, _Call] = {}
+_inflight_lock = threading.Lock()
+# Event loop -> {key: asyncio.Future}; a future can only be awaited on its own loop
+_ainflight = weakref.WeakKeyDictionary()
+
+
+def _version_key(user_id) -> str:
+    return f'freebusy:version:{user_id}'
+
+
+def free_busy_version(user_id) -> int:
+    """Current cache version for a user's free/busy data."""
+    cache.add(_version_key(user_id), 1, timeout=None)
+    return cache.get(_version_key(user_id), 1)
+
+
+def invalidate_free_busy(user_id) -> None:
+    """Drop every cached free/busy entry for a user (O(1): bumps the version)."""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 2, timeout=None)
+
+
+def _cache_key(user_id, windows: Sequence[Tuple], calendar_id: str) -> str:
+    spans = ','.join(f'{to_rfc3339(start)}/{to_rfc3339(end)}' for start, end in sorted(windows))
+    digest = hashlib.md5(spans.encode()).hexdigest()
+    return f'freebusy:{user_id}:{calendar_id}:{digest}:v{free_busy_version(user_id)}'
+
+
+def peek_free_busy(user_id, windows: Sequence[Tuple], calendar_id: str = 'primary') -> Optional[List[Dict]]:
+    """Cached busy slots, or None on a miss."""
+    return cache.get(_cache_key(user_id, windows, calendar_id))
+
+
+def store_free_busy(user_id, windows: Sequence[Tuple], busy: List[Dict], calendar_id: str = 'primary') -> None:
+    """Cache busy slots fetched elsewhere (e.g. by a batched query)."""
+    ttl = getattr(settings, 'FREEBUSY_CACHE_TTL', DEFAULT_TTL)
+    cache.set(_cache_key(user_id, windows, calendar_id), busy, ttl)
+
+
+def _single_flight(key: str, fetch: Callable[[], Optional[List[Dict]]]) -> Optional[List[Dict]]:
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+    if not leader:
+        call.event.wait(SINGLE_FLIGHT_TIMEOUT)
+        return call.result
+    try:
+        call.result = fetch()
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.event.set()
+    return call.result
+
+
+def get_cached_free_busy(user_id, windows: Sequence[Tuple], fetch: Callable[[], Optional[List[Dict]]],
+                         calendar_id: str = 'primary') -> Optional[List[Dict]]:
+    """
+    Cache-aside free/busy lookup.
+
+    Args:
+        user_id: Owner of the calendar
+        windows: (start, end) windows the busy slots cover
+        fetch: Loads busy slots on a miss; returns None if they are unavailable
+        calendar_id: Calendar the slots belong to
+
+    Returns:
+        Busy slots, or None if `fetch` could not load them (failures are not cached).
+    """
+    key = _cache_key(user_id, windows, calendar_id)
+    busy = cache.get(key)
+    if busy is not None:
+        return busy
+
+    def load():
+        result = fetch()
+        if result is not None:
+            store_free_busy(user_id, windows, result, calendar_id)
+        return result
+
+    return _single_flight(key, load)
+
+
+def _peek(user_id, windows: Sequence[Tuple], calendar_id: str) -> Tuple[str, Optional[List[Dict]]]:
+    key = _cache_key(user_id, windows, calendar_id)
+    return key, cache.get(key)
+
+
+async def aget_cached_free_busy(user_id, windows: Sequence[Tuple], fetch: Callable[[], Awaitable[Optional[List[Dict]]]],
+                                calendar_id: str = 'primary') -> Optional[List[Dict]]:
+    """
+    get_cached_free_busy() for async callers: `fetch` is a coroutine function.
+
+    Concurrent misses on the same event loop share one fetch.
+    """
+    key, busy = await sync_to_async(_peek)(user_id, windows, calendar_id)
+    if busy is not None:
+        return busy
+    loop = asyncio.get_running_loop()
+    inflight = _ainflight.setdefault(loop, {})
+    if key in inflight:
+        # shield: a follower that goes away mustn't cancel the leader's fetch
+        return await asyncio.shield(inflight[key])
+
+    future = inflight[key] = loop.create_future()
+    result = None
+    try:
+        result = await fetch()
+        if result is not None:
+            await sync_to_async(store_free_busy)(user_id, windows, result, calendar_id)
+        return result
+    finally:
+        del inflight[key]
+        # Followers of a failed or cancelled fetch see "unavailable", as the leader would have
+        future.set_result(result)
@@ -3,15 +3,80 @@ Google Calendar integration.
 
 Uses real Google Calendar API when a user has connected their Google account.
 Falls back to mock behavior if credentials are missing or any API error occurs.
+API calls and mock fallbacks are counted in ai_event_scheduler.metrics.
+
+The async helpers (``a``-prefixed, used by the async views) query free/busy with
+httpx, so an ASGI worker keeps serving other requests while Google answers.
+Without httpx they run the sync helpers in a worker thread instead.
 """
+from contextlib import contextmanager
+from functools import partial
 from datetime import datetime, timedelta
 import random
 from typing import List, Dict, Optional, Tuple
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.utils import timezone as dj_timezone
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.dateparse import parse_datetime
+
+from ai_event_scheduler import metrics, profiling
+from scheduler.integrations.availability import evaluate_options
+from scheduler.integrations.credentials import get_user_credentials, load_user_credentials
+from scheduler.integrations.discovery import build_calendar_service
+from scheduler.integrations.fanout import fan_out
+from scheduler.integrations.freebusy import aquery_free_busy, query_free_busy, to_rfc3339
+from scheduler.integrations.freebusy_cache import (
+    aget_cached_free_busy, free_busy_version, get_cached_free_busy, invalidate_free_busy, peek_free_busy,
+    store_free_busy,
+)
+
+
+def _busy_intervals(busy_slots: List[Dict]) -> List[Tuple[datetime, datetime]]:
+    """Normalize free/busy dicts (datetimes or RFC 3339 strings) to (start, end) tuples."""
+    intervals = []
+    for slot in busy_slots:
+        start, end = slot['start'], slot['end']
+        if isinstance(start, str):
+            start = parse_datetime(start)
+        if isinstance(end, str):
+            end = parse_datetime(end)
+        if start and end:
+            intervals.append((start, end))
+    return intervals
+
+
+def _username(user) -> str:
+    return getattr(user, 'username', str(user))
+
+
+def _common_free_slots(busy_by_user: Dict, time_options: List[Tuple[datetime, datetime]],
+                       quorum: Optional[int] = None, unknown: List = ()) -> List[Dict]:
+    """
+    Run the sweep engine and shape its output for templates and callers.
+
+    `busy_by_user` covers the users whose availability is known; `unknown` users
+    are listed on every slot and left out of the totals. The default quorum is
+    everyone, unknown users included, so a slot nobody could confirm is never
+    available.
+    """
+    if quorum is None:
+        quorum = len(busy_by_user) + len(unknown)
+    results = evaluate_options(busy_by_user, time_options, quorum=quorum)
+    unknown = [_username(user) for user in unknown]
+    for result in results:
+        result['conflicts'] = [_username(user) for user in result['busy_users']]
+        result['unknown'] = unknown
+        if not busy_by_user:
+            result['available'] = False
+    return results
+
+
+def _options_window(time_options: List[Tuple[datetime, datetime]]) -> Tuple[datetime, datetime]:
+    """Smallest window covering every time option, so each user is fetched once."""
+    return min(start for start, _ in time_options), max(end for _, end in time_options)
 
-from scheduler.models import GoogleOAuthCredential
 
 # Keep the existing mock for fallback
 class MockGoogleCalendar:
@@ -51,33 +116,27 @@ class MockGoogleCalendar:
         return busy_slots
     
     @staticmethod
-    def find_common_free_slots(users: List, time_options: List[Tuple[datetime, datetime]]) -> List[Dict]:
+    def find_common_free_slots(users: List, time_options: List[Tuple[datetime, datetime]],
+                               quorum: Optional[int] = None) -> List[Dict]:
         """
         Find common free time slots among multiple users.
         
         Args:
             users: List of Django User objects
             time_options: List of (start_time, end_time) tuples to check
+            quorum: Minimum number of free users for a slot to be available (default: all)
             
         Returns:
-            List of available time slots with availability info
+            List of time slots with per-slot conflicts and free counts
         """
-        results = []
-        
-        for start_time, end_time in time_options:
-            # For Sprint 3, randomly determine if slot is available
-            # In reality, this would check each user's calendar
-            availability_score = random.uniform(0.5, 1.0)  # 50-100% availability
-            
-            results.append({
-                'start_time': start_time,
-                'end_time': end_time,
-                'available': availability_score > 0.7,  # Consider >70% as available
-                'availability_score': availability_score,
-                'conflicts': [] if availability_score > 0.7 else ['Mock conflict with existing event']
-            })
-        
-        return results
+        if not time_options:
+            return []
+        window_start, window_end = _options_window(time_options)
+        busy_by_user = {
+            user: _busy_intervals(MockGoogleCalendar.get_free_busy_for_user(user, window_start, window_end))
+            for user in users
+        }
+        return _common_free_slots(busy_by_user, time_options, quorum)
     
     @staticmethod
     def create_calendar_event(user, title: str, start_time: datetime, end_time: datetime, 
@@ -134,142 +193,333 @@ class MockGoogleCalendar:
 # Try to import Google API libs (installed via requirements)
 try:
     from googleapiclient.discovery import build
-    from google.oauth2.credentials import Credentials
-    from google.auth.transport.requests import Request
     GOOGLE_LIBS_AVAILABLE = True
 except Exception:
     GOOGLE_LIBS_AVAILABLE = False
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except Exception:
+    HTTPX_AVAILABLE = False
+
+FREEBUSY_URL = 'https://www.googleapis.com/calendar/v3/freeBusy'
+
+
+def _get_user_credentials(user, strict: bool = False):
+    """
+    Credentials for a connected user from the per-worker cache (refreshed if expired).
 
-def _get_user_credentials(user):
-    """Build google.oauth2.credentials.Credentials from stored DB record."""
+    A failed refresh returns None, or raises if `strict`.
+    """
     if not GOOGLE_LIBS_AVAILABLE:
         return None
-    try:
-        cred = GoogleOAuthCredential.objects.get(user=user)
-    except GoogleOAuthCredential.DoesNotExist:
-        return None
+    return load_user_credentials(user) if strict else get_user_credentials(user)
+
+
+def _build_calendar_service(user, strict: bool = False, timeout: Optional[float] = None):
+    """
+    Create Calendar API service for a connected user (None if not connected).
 
-    scopes = (cred.scopes or '').split() if cred.scopes else settings.GOOGLE_OAUTH_SCOPES
-    creds = Credentials(
-        token=cred.token,
-        refresh_token=cred.refresh_token,
-        token_uri=cred.token_uri or 'https://oauth2.googleapis.com/token',
-        client_id=settings.GOOGLE_OAUTH_CLIENT_ID,
-        client_secret=settings.GOOGLE_OAUTH_CLIENT_SECRET,
-        scopes=scopes,
-    )
-    # Refresh if needed
+    Requests time out after `timeout` seconds (default GOOGLE_API_TIMEOUT).
+    Refresh and build failures also return None, unless `strict`: then they
+    raise CalendarUnavailable so callers can tell them apart from "not connected".
+    """
     try:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            # Persist updated tokens
-            cred.token = creds.token
-            # refresh_token might be None on refresh; keep existing if not returned
-            if getattr(creds, 'refresh_token', None):
-                cred.refresh_token = creds.refresh_token
-            cred.expiry = getattr(creds, 'expiry', None)
-            cred.scopes = ' '.join(scopes)
-            cred.save(update_fields=['token', 'refresh_token', 'expiry', 'scopes', 'updated_at'])
-    except Exception:
+        creds = _get_user_credentials(user, strict=strict)
+        if not creds:
+            return None
+        if timeout is None:
+            timeout = getattr(settings, 'GOOGLE_API_TIMEOUT', None)
+        service = build_calendar_service(creds, timeout=timeout)
+        if service is None:
+            # cache_discovery=False avoids write access in read-only environments
+            service = build('calendar', 'v3', credentials=creds, cache_discovery=False)
+        return service
+    except Exception as exc:
+        if strict:
+            raise CalendarUnavailable(f'Google credentials for user {user.pk} are unusable: {exc}') from exc
         return None
 
-    return creds
 
+@contextmanager
+def _api_call(operation: str):
+    """Time and count one Google Calendar API call (outcome=success/error)."""
+    with profiling.outbound(), metrics.timed_call('google_calendar_requests_total',
+                                                  'google_calendar_request_duration_seconds', operation=operation):
+        yield
 
-def _build_calendar_service(user):
-    """Create Calendar API service for a connected user."""
-    creds = _get_user_credentials(user)
-    if not creds:
-        return None
-    try:
-        # cache_discovery=False avoids write access in read-only environments
-        return build('calendar', 'v3', credentials=creds, cache_discovery=False)
-    except Exception:
-        return None
+
+def _mock_fallback(operation: str) -> None:
+    metrics.inc('google_calendar_mock_fallbacks_total', operation=operation)
+
+
+def _query_primary(service, start_time: datetime, end_time: datetime) -> Optional[List[Dict]]:
+    """Busy slots on the service owner's primary calendar; API errors propagate."""
+    with _api_call('freebusy'):
+        return query_free_busy(service, ['primary'], [(start_time, end_time)])['primary']
+
+
+def _primary_busy(user, start_time: datetime, end_time: datetime) -> Optional[List[Dict]]:
+    """Busy slots on the user's primary calendar (cached), or None if the API is unavailable."""
+    def fetch():
+        service = _build_calendar_service(user)
+        if not service:
+            return None
+        try:
+            return _query_primary(service, start_time, end_time)
+        except Exception:
+            return None
+
+    return get_cached_free_busy(user.pk, [(start_time, end_time)], fetch)
 
 
 def _real_get_free_busy_for_user(user, start_time: datetime, end_time: datetime) -> List[Dict]:
     """Real API: free/busy for the user's primary calendar."""
-    service = _build_calendar_service(user)
-    if not service:
+    busy = _primary_busy(user, start_time, end_time)
+    if busy is None:
+        _mock_fallback('freebusy')
         return MockGoogleCalendar.get_free_busy_for_user(user, start_time, end_time)
+    return busy
 
-    body = {
-        "timeMin": start_time.astimezone(dj_timezone.utc).isoformat().replace('+00:00', 'Z'),
-        "timeMax": end_time.astimezone(dj_timezone.utc).isoformat().replace('+00:00', 'Z'),
-        "items": [{"id": "primary"}],
-    }
-    try:
-        resp = service.freebusy().query(body=body).execute()
-        busy = resp.get('calendars', {}).get('primary', {}).get('busy', [])
-        # Normalize to our structure
-        return [{'start': b['start'], 'end': b['end'], 'status': 'busy'} for b in busy]
-    except Exception:
-        return MockGoogleCalendar.get_free_busy_for_user(user, start_time, end_time)
 
+def _real_get_free_busy_for_users(users, windows: List[Tuple[datetime, datetime]], requester=None) -> Dict:
+    """
+    Real API: free/busy for several users with as few round trips as possible.
 
-def _real_create_calendar_event(user, title: str, start_time: datetime, end_time: datetime,
-                                attendees: Optional[List] = None, description: str = "") -> Dict:
-    """Real API: create an event on the user's primary calendar."""
-    service = _build_calendar_service(user)
+    One batched query goes out with the requester's credentials ('primary' for
+    the requester, email calendar IDs for everyone else). Users whose calendars
+    the requester cannot see are fetched with their own credentials, all at
+    once (see _own_free_busy), or mocked if they haven't connected Google.
+    """
+    users = list(users)
+    if not users or not windows:
+        return {user: [] for user in users}
+    requester = requester or users[0]
+    results = {user: peek_free_busy(user.pk, windows) for user in users}
+    misses = [user for user in users if results[user] is None]
+    calendar_ids = {user: 'primary' if user.pk == requester.pk else user.email for user in misses}
+
+    batched = {}
+    service = _build_calendar_service(requester) if misses else None
+    if service:
+        try:
+            with _api_call('freebusy'):
+                batched = query_free_busy(service, [cal_id for cal_id in calendar_ids.values() if cal_id], windows)
+        except Exception:
+            batched = {}
+
+    hidden = []
+    for user in misses:
+        busy = batched.get(calendar_ids[user])
+        if busy is None:
+            hidden.append(user)
+        else:
+            store_free_busy(user.pk, windows, busy)
+            results[user] = busy
+    results.update(_own_free_busy(hidden, *_options_window(windows)))
+    return results
+
+
+def _own_free_busy(users, start_time: datetime, end_time: datetime) -> Dict:
+    """
+    Free/busy for each user with their own credentials, looked up concurrently.
+
+    Services are built here (credential lookups use the database); only the API
+    calls run on the fan-out pool, bounded by FREEBUSY_CALL_TIMEOUT each and
+    FREEBUSY_DEADLINE overall. A user whose lookup fails, is too slow or comes
+    back with an error for their calendar maps to None (unknown) rather than
+    failing everyone else's; only users without usable credentials get mock data.
+    """
+    windows = [(start_time, end_time)]
+    call_timeout = getattr(settings, 'FREEBUSY_CALL_TIMEOUT', 5)
+    # A call given up on keeps its pool thread until the socket times out: don't let that outlast the call
+    transport_timeout = min(call_timeout, getattr(settings, 'GOOGLE_API_TIMEOUT', None) or call_timeout)
+    results, calls, not_connected = {}, {}, set()
+    for user in users:
+        busy = peek_free_busy(user.pk, windows)
+        service = _build_calendar_service(user, timeout=transport_timeout) if busy is None else None
+        if busy is not None:
+            results[user] = busy
+        elif service:
+            calls[user] = partial(_query_primary, service, start_time, end_time)
+        else:
+            not_connected.add(user)
+
+    fanned = fan_out(calls, timeout=call_timeout, deadline=getattr(settings, 'FREEBUSY_DEADLINE', 8))
+    for user, busy in fanned.results.items():
+        if busy is None:
+            # Google reported an error for the calendar itself
+            fanned.unknown[user] = 'error'
+        else:
+            results[user] = busy
+            store_free_busy(user.pk, windows, busy)
+    for user in users:
+        if user in fanned.unknown:
+            metrics.inc('google_calendar_unknown_total', reason=fanned.unknown[user])
+            results[user] = None
+        elif user in not_connected:
+            _mock_fallback('freebusy')
+            results[user] = MockGoogleCalendar.get_free_busy_for_user(user, start_time, end_time)
+    return results
+
+
+def _invalidate_participants(user, attendees: Optional[List] = None) -> None:
+    """A new event changes everyone's free/busy: drop the cached copies."""
+    invalidate_free_busy(user.pk)
+    if attendees:
+        for user_id in User.objects.filter(email__in=attendees).values_list('pk', flat=True):
+            invalidate_free_busy(user_id)
+
+
+class CalendarNotConnected(Exception):
+    """The user has not connected Google Calendar."""
+
+
+class CalendarUnavailable(Exception):
+    """The user has connected Google Calendar, but their credentials can't be used right now (retryable)."""
+
+
+def insert_calendar_event(user, title: str, start_time: datetime, end_time: datetime,
+                          attendees: Optional[List] = None, description: str = "",
+                          event_id: Optional[str] = None) -> Dict:
+    """
+    Real API only: create an event on the user's primary calendar.
+
+    Unlike create_calendar_event this never falls back to the mock, so callers
+    such as the outbox worker can retry. Passing `event_id` (base32hex, e.g. a
+    hex digest) makes the insert idempotent: a repeat returns HTTP 409.
+
+    Raises:
+        CalendarNotConnected: the user has not connected Google Calendar
+        CalendarUnavailable: the stored token could not be refreshed or used
+        Exception: any API or transport error
+    """
+    service = _build_calendar_service(user, strict=True)
     if not service:
-        return MockGoogleCalendar.create_calendar_event(user, title, start_time, end_time, attendees, description)
+        raise CalendarNotConnected(user.pk)
 
     event = {
         'summary': title,
         'description': description,
         'start': {
-            'dateTime': start_time.astimezone(dj_timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'dateTime': to_rfc3339(start_time),
             'timeZone': 'UTC',
         },
         'end': {
-            'dateTime': end_time.astimezone(dj_timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'dateTime': to_rfc3339(end_time),
             'timeZone': 'UTC',
         },
         'attendees': [{'email': a} for a in (attendees or [])],
     }
-    try:
+    if event_id:
+        event['id'] = event_id
+    with _api_call('create_calendar_event'):
         created = service.events().insert(calendarId='primary', body=event, sendUpdates='all').execute()
-        return {
-            'status': 'success',
-            'event_id': created.get('id', f'google_event_{random.randint(1000, 9999)}'),
-            'message': 'Event created in Google Calendar',
-            'details': {
-                'title': title,
-                'start': event['start']['dateTime'],
-                'end': event['end']['dateTime'],
-                'organizer': user.email,
-                'attendees': attendees or [],
-                'description': description
-            }
+    _invalidate_participants(user, attendees)
+    return {
+        'status': 'success',
+        'event_id': created.get('id', event_id or f'google_event_{random.randint(1000, 9999)}'),
+        'message': 'Event created in Google Calendar',
+        'details': {
+            'title': title,
+            'start': event['start']['dateTime'],
+            'end': event['end']['dateTime'],
+            'organizer': user.email,
+            'attendees': attendees or [],
+            'description': description
         }
+    }
+
+
+def _real_create_calendar_event(user, title: str, start_time: datetime, end_time: datetime,
+                                attendees: Optional[List] = None, description: str = "") -> Dict:
+    """Real API: create an event on the user's primary calendar."""
+    try:
+        return insert_calendar_event(user, title, start_time, end_time, attendees, description)
     except Exception:
+        _mock_fallback('create_calendar_event')
         return MockGoogleCalendar.create_calendar_event(user, title, start_time, end_time, attendees, description)
 
 
+def _availability_message_key(meeting_request) -> str:
+    # The organizer's free/busy version changes whenever their cached busy data is dropped
+    version = free_busy_version(meeting_request.organizer_id)
+    return f'availability:{meeting_request.pk}:{meeting_request.selected_option_id}:v{version}'
+
+
+def _cached_availability_message(meeting_request) -> Tuple[str, Optional[str]]:
+    """The message's cache key and the cached message (None on a miss)."""
+    key = _availability_message_key(meeting_request)
+    return key, cache.get(key)
+
+
+def _availability_message(meeting_request, key: str, busy: Optional[List[Dict]]) -> str:
+    """Message for the selected time from the organizer's busy slots (None: API unavailable, mock answer)."""
+    if busy is None:
+        _mock_fallback('availability_message')
+        return MockGoogleCalendar.check_availability_message(meeting_request)
+    selected = meeting_request.selected_time
+    if not busy:
+        message = f"✅ Your primary calendar appears free from {selected.start_time.strftime('%H:%M')} to {selected.end_time.strftime('%H:%M')} on {selected.start_time.strftime('%Y-%m-%d')}"
+    else:
+        message = f"⚠️ You have conflicts during {selected.start_time.strftime('%H:%M')}–{selected.end_time.strftime('%H:%M')} on {selected.start_time.strftime('%Y-%m-%d')}"
+    cache.set(key, message, getattr(settings, 'FREEBUSY_CACHE_TTL', 300))
+    return message
+
+
 def _real_check_availability_message(meeting_request) -> str:
-    """Real API: human message based on free/busy for selected time, else fallback."""
+    """
+    Real API: human message based on free/busy for selected time, else fallback.
+
+    Messages built from real free/busy data are cached per (meeting, selected
+    option, organizer free/busy version), so repeat renders skip the lookup.
+    Mock answers are not cached.
+    """
     if not meeting_request.has_selected_time:
         return "No time selected yet"
+    key, message = _cached_availability_message(meeting_request)
+    if message is not None:
+        return message
     selected = meeting_request.selected_time
-    service = _build_calendar_service(meeting_request.organizer)
-    if not service:
-        return MockGoogleCalendar.check_availability_message(meeting_request)
+    busy = _primary_busy(meeting_request.organizer, selected.start_time, selected.end_time)
+    return _availability_message(meeting_request, key, busy)
 
-    body = {
-        "timeMin": selected.start_time.astimezone(dj_timezone.utc).isoformat().replace('+00:00', 'Z'),
-        "timeMax": selected.end_time.astimezone(dj_timezone.utc).isoformat().replace('+00:00', 'Z'),
-        "items": [{"id": "primary"}],
-    }
-    try:
-        resp = service.freebusy().query(body=body).execute()
-        busy = resp.get('calendars', {}).get('primary', {}).get('busy', [])
-        if not busy:
-            return f"✅ Your primary calendar appears free from {selected.start_time.strftime('%H:%M')} to {selected.end_time.strftime('%H:%M')} on {selected.start_time.strftime('%Y-%m-%d')}"
-        return f"⚠️ You have conflicts during {selected.start_time.strftime('%H:%M')}–{selected.end_time.strftime('%H:%M')} on {selected.start_time.strftime('%Y-%m-%d')}"
-    except Exception:
-        return MockGoogleCalendar.check_availability_message(meeting_request)
+
+def _http_client():
+    """A new client; use it with `async with` so its connections are closed when the lookup is done."""
+    return httpx.AsyncClient(timeout=getattr(settings, 'GOOGLE_API_TIMEOUT', 10))
+
+
+def _freebusy_poster(client, token: str):
+    """Coroutine function posting one freebusy request body through `client` with `token`."""
+    async def post(body: Dict) -> Dict:
+        response = await client.post(FREEBUSY_URL, json=body, headers={'Authorization': f'Bearer {token}'})
+        response.raise_for_status()
+        return response.json()
+    return post
+
+
+async def _aprimary_busy(user, start_time: datetime, end_time: datetime) -> Optional[List[Dict]]:
+    """Async _primary_busy: cached busy slots on the user's primary calendar, or None if the API is unavailable."""
+    if not HTTPX_AVAILABLE:
+        return await sync_to_async(_primary_busy)(user, start_time, end_time)
+    windows = [(start_time, end_time)]
+
+    async def fetch():
+        creds = await sync_to_async(_get_user_credentials)(user)
+        if not creds:
+            return None
+        try:
+            with _api_call('freebusy'):
+                # The requests of one lookup are gathered, so a client per lookup costs one connection setup
+                async with _http_client() as client:
+                    busy = await aquery_free_busy(_freebusy_poster(client, creds.token), ['primary'], windows)
+        except Exception:
+            return None
+        return busy['primary']
+
+    return await aget_cached_free_busy(user.pk, windows, fetch)
 
 
 # Public helpers (keep names so existing imports continue to work)
@@ -278,20 +528,25 @@ def get_free_busy_for_user(user, start_time, end_time):
     return _real_get_free_busy_for_user(user, start_time, end_time)
 
 
-def find_common_free_slots(users, time_options):
-    """Simple heuristic; real multi-user check is out of scope here."""
-    # Preserve existing mocked behavior for Sprint 3 scope
-    results = []
-    for start_time, end_time in time_options:
-        availability_score = random.uniform(0.5, 1.0)
-        results.append({
-            'start_time': start_time,
-            'end_time': end_time,
-            'available': availability_score > 0.7,
-            'availability_score': availability_score,
-            'conflicts': [] if availability_score > 0.7 else ['Mock conflict with existing event']
-        })
-    return results
+def get_free_busy_for_users(users, windows, requester=None):
+    """Batched free/busy for several users over several windows: {user: busy slots, or None if unknown}."""
+    return _real_get_free_busy_for_users(users, windows, requester)
+
+
+def find_common_free_slots(users, time_options, quorum=None, requester=None):
+    """
+    Check every user's free/busy against each time option (at least `quorum` free).
+
+    Users whose calendar couldn't be read in time are listed in each slot's
+    'unknown' and left out of the totals. `quorum` defaults to every user,
+    unknown ones included, so by default a slot with unknown users isn't available.
+    """
+    if not time_options:
+        return []
+    busy = get_free_busy_for_users(users, time_options, requester)
+    busy_by_user = {user: _busy_intervals(busy[user]) for user in users if busy[user] is not None}
+    unknown = [user for user in users if busy[user] is None]
+    return _common_free_slots(busy_by_user, time_options, quorum, unknown)
 
 
 def create_calendar_event(user, title, start_time, end_time, attendees=None, description=""):
@@ -299,6 +554,18 @@ def create_calendar_event(user, title, start_time, end_time, attendees=None, des
     return _real_create_calendar_event(user, title, start_time, end_time, attendees, description)
 
 
-# Convenience method used by MeetingDetailView
+# Convenience methods used by MeetingDetailView
 def check_availability_message(meeting_request) -> str:
     return _real_check_availability_message(meeting_request)
+
+
+async def acheck_availability_message(meeting_request) -> str:
+    """Async check_availability_message; the event loop is free while Google answers."""
+    if not meeting_request.has_selected_time:
+        return "No time selected yet"
+    key, message = await sync_to_async(_cached_availability_message)(meeting_request)
+    if message is not None:
+        return message
+    selected = meeting_request.selected_time
+    busy = await _aprimary_busy(meeting_request.organizer, selected.start_time, selected.end_time)
+    return await sync_to_async(_availability_message)(meeting_request, key, busy)
@@ -0,0 +1,60 @@
+"""
+Measure the cost of creating a Calendar API service object.
+
+Compares googleapiclient's ``build()`` (re-reads and re-parses the discovery
+document on every call) with the shared registry in
+``scheduler.integrations.discovery``. No network access is needed: both paths
+use the static discovery document and dummy credentials.
+
+Usage: python manage.py bench_calendar_service --iterations 200
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler.integrations import discovery
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Calendar API service construction: build() vs the shared discovery registry.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100, help='Services to build per strategy')
+
+    def handle(self, *args, **options):
+        if not discovery.DISCOVERY_AVAILABLE:
+            raise CommandError('google-api-python-client is not installed.')
+        from googleapiclient.discovery import build
+        from google.oauth2.credentials import Credentials
+
+        creds = Credentials(token='benchmark-token')
+        iterations = options['iterations']
+
+        def build_per_call():
+            service = build('calendar', 'v3', credentials=creds, cache_discovery=False)
+            service.freebusy()
+
+        def build_from_registry():
+            service = discovery.build_calendar_service(creds)
+            service.freebusy()
+
+        # Startup: the first registry call pays for loading the document once
+        discovery._document = None
+        start = time.perf_counter()
+        discovery.calendar_discovery_document()
+        startup_ms = (time.perf_counter() - start) * 1000
+        self.stdout.write(f'Registry startup (load + parse once): {startup_ms:.2f} ms')
+
+        for label, func in (('build() per call', build_per_call), ('shared registry', build_from_registry)):
+            timings = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f'{label:<18} mean {statistics.mean(timings):8.3f} ms   '
+                f'p50 {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms'
+            )
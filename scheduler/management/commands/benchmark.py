@@ -0,0 +1,125 @@
+"""
+Benchmark the scheduler's hot paths against a seeded dataset and compare the
+results with a stored baseline (see scheduler/benchmarks.py).
+
+Each run is appended to the history file. Nothing is left in the database:
+seeding and every benchmarked write are rolled back.
+
+Usage: python manage.py benchmark [--iterations 30] [--threshold 0.2] [--save-baseline] [--only dashboard]
+"""
+import subprocess
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from scheduler.benchmarks import (
+    FREEBUSY_USERS, build_cases, compare, load_json, measure, save_json, stubbed_environment,
+)
+from scheduler.models import MeetingRequest, TimeOption
+from scheduler.seed import seed
+
+BENCHMARK_DIR = settings.BASE_DIR / 'benchmarks'
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=settings.BASE_DIR, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+class Command(BaseCommand):
+    help = 'Benchmark views and helpers on a seeded dataset; record results and compare them with a baseline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30, help='Timed calls per case')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed calls per case first')
+        parser.add_argument('--users', type=int, default=200, help='Users to seed')
+        parser.add_argument('--meetings', type=int, default=5000, help='Meetings to seed')
+        parser.add_argument('--only', default='', help='Run only cases whose name contains this text')
+        parser.add_argument('--history', default=str(BENCHMARK_DIR / 'history.json'),
+                            help='JSON file runs are appended to')
+        parser.add_argument('--baseline', default=str(BENCHMARK_DIR / 'baseline.json'), help='Baseline JSON file')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed p50 slowdown, e.g. 0.2 for 20%%')
+        parser.add_argument('--min-delta', type=float, default=0.5, help='Ignore p50 slowdowns below this many ms')
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = seed(users=options['users'], meetings=options['meetings'], google_share=0, ab_views=0,
+                          prefix='benchmark')
+            # The busiest organizer and one of their meetings with several options
+            organizer = (
+                User.objects.filter(username__startswith='benchmark-')
+                .annotate(meeting_count=Count('organized_meetings')).order_by('-meeting_count').first()
+            )
+            meeting = (
+                MeetingRequest.objects.filter(organizer=organizer)
+                .annotate(option_count=Count('time_options')).filter(option_count__gte=2).order_by('-pk').first()
+            )
+            if meeting is None:
+                raise CommandError('The seeded dataset has no meeting with two time options; seed more meetings.')
+            attendees = list(User.objects.filter(username__startswith='benchmark-').order_by('pk')[:FREEBUSY_USERS])
+            first = TimeOption.objects.filter(meeting_request=meeting).order_by('start_time').first()
+
+            results = {}
+            with stubbed_environment(first.start_time, first.start_time + timedelta(minutes=30)):
+                for case in build_cases(organizer, meeting, attendees):
+                    if options['only'] and options['only'] not in case.name:
+                        continue
+                    results[case.name] = measure(case, options['iterations'], options['warmup'])
+                    self._print_result(case.name, results[case.name])
+            transaction.set_rollback(True)
+
+        run = {
+            'timestamp': timezone.now().isoformat(),
+            'commit': _git_commit(),
+            'database': connection.vendor,
+            'dataset': counts,
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        history = load_json(options['history'], default=[])
+        history.append(run)
+        save_json(options['history'], history)
+        self.stdout.write(f"Run appended to {options['history']}")
+
+        baseline = load_json(options['baseline'])
+        if options['save_baseline']:
+            save_json(options['baseline'], run)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+        elif baseline is None:
+            self.stdout.write(f"No baseline at {options['baseline']}; store one with --save-baseline.")
+        else:
+            self._print_comparison(results, baseline)
+            regressions = compare(results, baseline['results'], options['threshold'], options['min_delta'])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(f'  {line}'))
+                raise CommandError(f'{len(regressions)} regression(s) against the baseline '
+                                   f"from {baseline.get('commit') or baseline.get('timestamp')}")
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+
+    def _print_result(self, name, result):
+        self.stdout.write(
+            f"{name:<26} p50 {result['p50_ms']:9.2f} ms   p95 {result['p95_ms']:9.2f} ms   "
+            f"{result['ops_per_s']:8.1f} ops/s   {result['queries']:6.1f} queries"
+        )
+
+    def _print_comparison(self, results, baseline):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Against baseline {baseline.get('commit') or ''} ({baseline.get('timestamp', '')[:19]}), p50:"
+        ))
+        for name, result in results.items():
+            previous = baseline['results'].get(name)
+            if not previous:
+                self.stdout.write(f'{name:<26} (new)')
+                continue
+            change = (result['p50_ms'] / previous['p50_ms'] - 1) * 100 if previous['p50_ms'] else 0
+            self.stdout.write(f"{name:<26} {previous['p50_ms']:9.2f} -> {result['p50_ms']:9.2f} ms  {change:+6.1f}%")
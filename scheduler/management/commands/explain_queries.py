@@ -0,0 +1,109 @@
+"""
+Show query plans and timings for the scheduler's hot queries, with and without
+the composite/partial indexes.
+
+Seeds a large dataset (scheduler/seed.py) inside a transaction, prints ``EXPLAIN`` output and
+timings for the dashboard and meeting detail queries, drops the hot-path
+indexes and repeats, then rolls everything back (nothing is left behind).
+
+Usage: python manage.py explain_queries [--organizers 200 --meetings 50 --options 5 --repeat 20]
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+
+from scheduler.models import MeetingRequest, TimeOption
+from scheduler.seed import seed
+from scheduler.views import dashboard_meetings
+
+# (model, index or constraint name) pairs that back the hot queries
+HOT_PATH_INDEXES = [
+    (MeetingRequest, 'meeting_organizer_created_idx'),
+    (TimeOption, 'timeoption_meeting_start_idx'),
+    (TimeOption, 'unique_selected_time_option'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Print EXPLAIN plans and timings for the hot scheduler queries before and after the composite indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organizers', type=int, default=200, help='Organizers to seed')
+        parser.add_argument('--meetings', type=int, default=50, help='Meetings per organizer, on average')
+        parser.add_argument('--options', type=int, default=5, help='Time options per meeting, on average')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+
+    def handle(self, *args, **options):
+        # SQLite can only alter the schema inside a transaction with foreign key checks off;
+        # everything below is rolled back anyway
+        with connection.constraint_checks_disabled():
+            with transaction.atomic():
+                counts = seed(users=options['organizers'], meetings=options['organizers'] * options['meetings'],
+                              options=options['options'], google_share=0, ab_views=0, prefix='explain')
+                self.stdout.write(', '.join(f'{count} {label}' for label, count in counts.items()))
+                self._analyze()
+                # The busiest organizer (meetings are skewed across organizers)
+                organizer = (
+                    User.objects.filter(username__startswith='explain-')
+                    .annotate(meeting_count=Count('organized_meetings')).order_by('-meeting_count').first()
+                )
+                meeting = MeetingRequest.objects.filter(organizer=organizer).first()
+
+                self.stdout.write(self.style.MIGRATE_HEADING('With hot-path indexes'))
+                with_indexes = self._report(organizer, meeting, options['repeat'])
+
+                self._drop_indexes()
+                self._analyze()
+                self.stdout.write(self.style.MIGRATE_HEADING('Without hot-path indexes'))
+                without_indexes = self._report(organizer, meeting, options['repeat'])
+
+                self.stdout.write(self.style.MIGRATE_HEADING('Summary (median ms)'))
+                for label, ms in with_indexes.items():
+                    self.stdout.write(f'{label:<24} {without_indexes[label]:8.3f} -> {ms:8.3f}')
+                transaction.set_rollback(True)
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def _drop_indexes(self):
+        with connection.schema_editor() as editor:
+            for model, name in HOT_PATH_INDEXES:
+                for index in model._meta.indexes:
+                    if index.name == name:
+                        editor.remove_index(model, index)
+                for constraint in model._meta.constraints:
+                    if constraint.name == name:
+                        editor.remove_constraint(model, constraint)
+
+    def _hot_queries(self, organizer, meeting):
+        # Exactly what the dashboard view runs: a page (plus one row to detect the next) from the same queryset
+        page_size = getattr(settings, 'DASHBOARD_PAGE_SIZE', 25)
+        first_page = dashboard_meetings(organizer)[:page_size + 1]
+        last = list(first_page)[page_size - 1:page_size]
+        cursor = (last[0].created_at, last[0].pk) if last else None
+        return {
+            'dashboard page': first_page,
+            'dashboard next page': dashboard_meetings(organizer, cursor)[:page_size + 1],
+            'selected option': TimeOption.objects.filter(meeting_request=meeting, is_selected=True),
+            'options by start_time': TimeOption.objects.filter(meeting_request=meeting).order_by('start_time'),
+        }
+
+    def _report(self, organizer, meeting, repeat):
+        medians = {}
+        for label, queryset in self._hot_queries(organizer, meeting).items():
+            self.stdout.write(self.style.SQL_KEYWORD(label))
+            self.stdout.write(queryset.explain())
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            medians[label] = statistics.median(timings)
+            self.stdout.write(f'  median {medians[label]:.3f} ms over {repeat} runs\n')
+        return medians
@@ -0,0 +1,31 @@
+"""
+Create queued Google Calendar events (see scheduler/outbox.py).
+
+Usage: python manage.py process_calendar_outbox [--batch-size 50] [--loop --interval 5]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from scheduler.outbox import process_calendar_outbox
+
+
+class Command(BaseCommand):
+    help = 'Drain the calendar event outbox, retrying failed inserts with backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Jobs claimed per pass')
+        parser.add_argument('--loop', action='store_true', help='Keep running instead of exiting when idle')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep when idle with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            counts = process_calendar_outbox(options['batch_size'])
+            if counts:
+                self.stdout.write(', '.join(f'{status}: {count}' for status, count in sorted(counts.items())))
+            if not options['loop']:
+                if not counts:
+                    self.stdout.write('No calendar events due.')
+                break
+            if not counts:
+                time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+"""
+Proactively refresh Google OAuth access tokens that are about to expire.
+
+Run it from cron every few minutes, or as a worker with --loop, so users
+rarely pay for the token refresh round trip inside a request.
+
+Usage: python manage.py refresh_google_tokens [--window 900] [--loop --interval 300]
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from scheduler.integrations.credentials import refresh_expiring_tokens
+
+
+class Command(BaseCommand):
+    help = 'Refresh stored Google access tokens that expire within the refresh window.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=getattr(settings, 'GOOGLE_TOKEN_REFRESH_WINDOW', 900),
+                            help='Refresh tokens expiring within this many seconds')
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent token endpoint calls')
+        parser.add_argument('--loop', action='store_true', help='Keep running instead of exiting after one pass')
+        parser.add_argument('--interval', type=int, default=300, help='Seconds between passes with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            refreshed, failed = refresh_expiring_tokens(options['window'], options['workers'])
+            self.stdout.write(f'Refreshed {refreshed} token(s), {failed} failed.')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
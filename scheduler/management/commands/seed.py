@@ -0,0 +1,54 @@
+"""
+Load a deterministic synthetic dataset for capacity planning and performance
+tests (see scheduler/seed.py).
+
+Usage: python manage.py seed [--users 100000 --meetings 1000000 --options 5 --ab-views 2000000 --seed 0]
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scheduler.seed import CHUNK_SIZE, seed
+
+
+class Command(BaseCommand):
+    help = 'Generate users, meetings, time options, Google credentials and A/B events in bulk.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Users to create')
+        parser.add_argument('--meetings', type=int, default=5000, help='Meetings, skewed across organizers')
+        parser.add_argument('--options', type=int, default=5, help='Average time options per meeting')
+        parser.add_argument('--google-share', type=float, default=0.3, help='Fraction of users with Google credentials')
+        parser.add_argument('--ab-views', type=int, default=50000, help='A/B test view events (clicks follow)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; equal seeds give equal datasets')
+        parser.add_argument('--prefix', default='seed', help='Username prefix, must not be in use yet')
+        parser.add_argument('--password', default='seed-password', help='Password of every generated user')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows per bulk insert / transaction')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        last_report = {}
+
+        def progress(label, done, total):
+            # At most one line per label every few seconds, plus the last one
+            now = time.monotonic()
+            if done == total or now - last_report.get(label, 0) >= 5:
+                last_report[label] = now
+                self.stdout.write(f'  {label}: {done}/{total}')
+
+        try:
+            counts = seed(
+                users=options['users'], meetings=options['meetings'], options=options['options'],
+                google_share=options['google_share'], ab_views=options['ab_views'], seed=options['seed'],
+                prefix=options['prefix'], password=options['password'], chunk_size=options['chunk_size'],
+                progress=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded ' + ', '.join(f'{count} {label}' for label, count in counts.items()) + f' in {elapsed:.1f}s'
+        ))
+        if counts.get('A/B views'):
+            self.stdout.write('Run `python manage.py rollup_abtest` to fold the A/B events into the rollups.')
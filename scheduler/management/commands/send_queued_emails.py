@@ -0,0 +1,31 @@
+"""
+Deliver queued notification emails (see scheduler/emails.py).
+
+Usage: python manage.py send_queued_emails [--batch-size 100] [--loop --interval 5]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from scheduler.emails import deliver_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Send pending emails in batches over one SMTP connection, with retries and dead-lettering.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Emails sent per connection')
+        parser.add_argument('--loop', action='store_true', help='Keep running instead of exiting when idle')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep when idle with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            counts = deliver_queued_emails(options['batch_size'])
+            if counts:
+                self.stdout.write(', '.join(f'{status}: {count}' for status, count in sorted(counts.items())))
+            if not options['loop']:
+                if not counts:
+                    self.stdout.write('No emails due.')
+                break
+            if not counts:
+                time.sleep(options['interval'])
@@ -0,0 +1,41 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0002_google_oauth_credentials'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meetingrequest',
+            name='calendar_event_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.CreateModel(
+            name='CalendarEventJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=64, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('skipped', 'Skipped'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('event_id', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('meeting_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_jobs', to='scheduler.meetingrequest')),
+                ('time_option', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_jobs', to='scheduler.timeoption')),
+            ],
+            options={
+                'db_table': 'calendar_event_jobs',
+                'ordering': ['next_attempt_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='calendar_job_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_selected_option(apps, schema_editor):
+    """Point each meeting at its selected option, keeping only the newest if several are selected."""
+    TimeOption = apps.get_model('scheduler', 'TimeOption')
+    MeetingRequest = apps.get_model('scheduler', 'MeetingRequest')
+    selected = (
+        TimeOption.objects.filter(is_selected=True)
+        .order_by('meeting_request_id', '-pk')
+        .values_list('meeting_request_id', 'pk')
+    )
+    keep, extra = {}, []
+    for meeting_id, option_id in selected.iterator():
+        if meeting_id in keep:
+            extra.append(option_id)
+        else:
+            keep[meeting_id] = option_id
+    TimeOption.objects.filter(pk__in=extra).update(is_selected=False)
+    for meeting_id, option_id in keep.items():
+        MeetingRequest.objects.filter(pk=meeting_id).update(selected_option_id=option_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0004_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meetingrequest',
+            name='selected_option',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='scheduler.timeoption'),
+        ),
+        migrations.RunPython(backfill_selected_option, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='timeoption',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_selected', True)), fields=('meeting_request',), name='unique_selected_time_option'),
+        ),
+    ]
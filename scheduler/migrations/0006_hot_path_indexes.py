@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scheduler', '0005_selected_option'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meetingrequest',
+            index=models.Index(fields=['organizer', '-created_at', 'id'], name='meeting_organizer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeoption',
+            index=models.Index(fields=['meeting_request', 'start_time'], name='timeoption_meeting_start_idx'),
+        ),
+    ]
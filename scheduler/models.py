@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -10,24 +10,39 @@ class MeetingRequest(models.Model):
     organizer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='organized_meetings')
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
+    # Denormalized pointer to the option with is_selected=True, kept in sync by TimeOption.save
+    selected_option = models.ForeignKey('TimeOption', on_delete=models.SET_NULL, null=True, blank=True,
+                                        related_name='+')
+    # Google Calendar event created for the selected time (filled in by the outbox worker)
+    calendar_event_id = models.CharField(max_length=255, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Dashboard: an organizer's meetings, newest first, keyset-paginated on (created_at, id)
+            models.Index(fields=['organizer', '-created_at', 'id'], name='meeting_organizer_created_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title} - organized by {self.organizer.username}"
     
     @property
     def has_selected_time(self):
-        """Check if any time option has been selected."""
-        return self.time_options.filter(is_selected=True).exists()
+        """Check if any time option has been selected (no query)."""
+        return self.selected_option_id is not None
     
     @property
     def selected_time(self):
-        """Get the selected time option if any."""
-        return self.time_options.filter(is_selected=True).first()
+        """Get the selected time option if any (free with select_related('selected_option'))."""
+        return self.selected_option
+
+    def select_option(self, option):
+        """Make `option` the selected time for this meeting."""
+        option.is_selected = True
+        option.save(update_fields=['is_selected'])
+        self.selected_option = option
 
 
 class TimeOption(models.Model):
@@ -42,18 +57,52 @@ class TimeOption(models.Model):
     
     class Meta:
         ordering = ['start_time']
+        indexes = [
+            # Detail page / prefetch: a meeting's options in start_time order
+            models.Index(fields=['meeting_request', 'start_time'], name='timeoption_meeting_start_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['meeting_request'],
+                condition=models.Q(is_selected=True),
+                name='unique_selected_time_option',
+            ),
+        ]
         
     def __str__(self):
         return f"{self.meeting_request.title}: {self.start_time.strftime('%Y-%m-%d %H:%M')} - {self.end_time.strftime('%Y-%m-%d %H:%M')}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._selected_in_db = instance.is_selected
+        return instance
+
     def save(self, *args, **kwargs):
-        # Ensure only one time option can be selected per meeting
-        if self.is_selected:
-            TimeOption.objects.filter(
-                meeting_request=self.meeting_request,
-                is_selected=True
-            ).update(is_selected=False)
-        super().save(*args, **kwargs)
+        # Only one option per meeting may be selected (enforced by a partial unique index);
+        # the meeting's selected_option pointer follows whichever option holds the flag
+        was_selected = getattr(self, '_selected_in_db', False)
+        if not self.is_selected and not was_selected:
+            super().save(*args, **kwargs)
+            return
+        with transaction.atomic():
+            if self.is_selected:
+                # Clear the previous selection first so the unique index is never violated
+                TimeOption.objects.filter(
+                    meeting_request_id=self.meeting_request_id,
+                    is_selected=True
+                ).exclude(pk=self.pk).update(is_selected=False)
+            super().save(*args, **kwargs)
+            pointer = self if self.is_selected else None
+            meetings = MeetingRequest.objects.filter(pk=self.meeting_request_id)
+            if not self.is_selected:
+                meetings = meetings.filter(selected_option=self)
+            meetings.update(selected_option=pointer)
+        self._selected_in_db = self.is_selected
+        if self._meta.get_field('meeting_request').is_cached(self):
+            meeting = self.meeting_request
+            if self.is_selected or meeting.selected_option_id == self.pk:
+                meeting.selected_option = pointer
         
     @property
     def duration_minutes(self):
@@ -78,3 +127,94 @@ class GoogleOAuthCredential(models.Model):
 
     def __str__(self):
         return f"Google OAuth for {self.user.username}"
+
+
+class UserProfile(models.Model):
+    """Small per-user preferences row; read through scheduler.cache.user_timezone()."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
+    timezone = models.CharField(max_length=64, blank=True, default='')
+
+    class Meta:
+        db_table = 'user_profiles'
+
+    def __str__(self):
+        return f"Profile for {self.user.username}"
+
+
+class CalendarEventJob(models.Model):
+    """
+    Outbox entry for a Google Calendar event to create for a selected time.
+
+    Written by select_time and drained by `manage.py process_calendar_outbox`,
+    so the request never waits on Google.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_DONE = 'done'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_SKIPPED, 'Skipped'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    meeting_request = models.ForeignKey(MeetingRequest, on_delete=models.CASCADE, related_name='calendar_jobs')
+    time_option = models.ForeignKey(TimeOption, on_delete=models.CASCADE, related_name='calendar_jobs')
+    # Also used as the Google event ID, so a retried insert can never create a duplicate
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    event_id = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'calendar_event_jobs'
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='calendar_job_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"Calendar event for {self.meeting_request.title} ({self.status})"
+
+
+class OutboundEmail(models.Model):
+    """
+    Outbox entry for a notification email.
+
+    The email builders in scheduler/emails.py only enqueue; `manage.py
+    send_queued_emails` delivers pending messages in batches over one SMTP
+    connection. Messages that keep failing are parked as dead letters.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_DEAD, 'Dead letter'),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'outbound_emails'
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
@@ -0,0 +1,128 @@
+"""
+Calendar event outbox (and the claiming logic shared with the email outbox).
+
+select_time records a CalendarEventJob in the same transaction as the
+selection and returns immediately; `manage.py process_calendar_outbox` drains
+the jobs, creating the Google events with retries and exponential backoff.
+Each job's idempotency key doubles as the Google event ID, so a retry after a
+timeout can never create a duplicate event.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate, meeting_scope
+from .integrations.google_calendar import CalendarNotConnected, insert_calendar_event
+from .models import CalendarEventJob, MeetingRequest
+
+MAX_ATTEMPTS = 8
+BASE_BACKOFF = timedelta(seconds=30)
+MAX_BACKOFF = timedelta(hours=1)
+# Claimed jobs are hidden from other workers for this long
+LEASE = timedelta(minutes=5)
+
+
+def idempotency_key(meeting, time_option) -> str:
+    """Stable key for 'create the event for this option'; valid as a Google event ID (base32hex)."""
+    return hashlib.sha1(f'meeting:{meeting.pk}:option:{time_option.pk}'.encode()).hexdigest()
+
+
+def enqueue_calendar_event(meeting, time_option) -> CalendarEventJob:
+    """Queue creation of the calendar event for a selected time (no-op if already queued)."""
+    job, created = CalendarEventJob.objects.get_or_create(
+        idempotency_key=idempotency_key(meeting, time_option),
+        defaults={'meeting_request': meeting, 'time_option': time_option},
+    )
+    if not created and job.status in (CalendarEventJob.STATUS_FAILED, CalendarEventJob.STATUS_SKIPPED):
+        job.status = CalendarEventJob.STATUS_PENDING
+        job.attempts = 0
+        job.next_attempt_at = timezone.now()
+        job.save(update_fields=['status', 'attempts', 'next_attempt_at', 'updated_at'])
+    return job
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before the next try after `attempts` failures."""
+    return min(BASE_BACKOFF * 2 ** (attempts - 1), MAX_BACKOFF)
+
+
+def claim_due(model, batch_size: int, now=None):
+    """
+    Lease up to `batch_size` due pending rows of an outbox model.
+
+    Works for any model with `status` / `next_attempt_at` fields and a
+    STATUS_PENDING constant. Leased rows are pushed LEASE into the future so
+    concurrent workers skip them; the caller reschedules or finishes them.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        ids = list(
+            model.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=model.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        model.objects.filter(pk__in=ids).update(next_attempt_at=now + LEASE)
+    return model.objects.filter(pk__in=ids)
+
+
+def claim_due_jobs(batch_size: int, now=None):
+    """Lease due calendar jobs so concurrent workers don't pick the same ones."""
+    return list(claim_due(CalendarEventJob, batch_size, now).select_related('meeting_request__organizer', 'time_option'))
+
+
+def _finish(job, status: str, event_id: str = '', error: str = '') -> None:
+    job.status = status
+    job.event_id = event_id
+    job.last_error = error
+    job.save(update_fields=['status', 'event_id', 'last_error', 'attempts', 'updated_at'])
+
+
+def process_job(job, now=None) -> str:
+    """Try to create one job's event; returns the job's resulting status."""
+    now = now or timezone.now()
+    meeting, option = job.meeting_request, job.time_option
+    if meeting.selected_option_id != option.pk:
+        _finish(job, CalendarEventJob.STATUS_SKIPPED, error='Selection changed before the event was created')
+        return job.status
+
+    job.attempts += 1
+    try:
+        result = insert_calendar_event(
+            meeting.organizer, meeting.title, option.start_time, option.end_time,
+            description=meeting.description or '', event_id=job.idempotency_key,
+        )
+        event_id = result['event_id']
+    except CalendarNotConnected:
+        # Only a missing credential row is final; a failed token refresh (CalendarUnavailable) is retried below
+        _finish(job, CalendarEventJob.STATUS_SKIPPED, error='Google Calendar is not connected')
+        return job.status
+    except Exception as exc:
+        if getattr(getattr(exc, 'resp', None), 'status', None) == 409:
+            # An earlier attempt already created the event
+            event_id = job.idempotency_key
+        else:
+            job.last_error = str(exc)[:2000]
+            if job.attempts >= MAX_ATTEMPTS:
+                job.status = CalendarEventJob.STATUS_FAILED
+            else:
+                job.next_attempt_at = now + backoff(job.attempts)
+            job.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at', 'updated_at'])
+            return job.status
+
+    _finish(job, CalendarEventJob.STATUS_DONE, event_id=event_id)
+    MeetingRequest.objects.filter(pk=meeting.pk).update(calendar_event_id=event_id)
+    invalidate(meeting_scope(meeting.pk))
+    return job.status
+
+
+def process_calendar_outbox(batch_size: int = 50) -> dict:
+    """Drain one batch of due jobs; returns a count per resulting status."""
+    counts = {}
+    for job in claim_due_jobs(batch_size):
+        status = process_job(job)
+        counts[status] = counts.get(status, 0) + 1
+    return counts
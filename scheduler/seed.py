@@ -0,0 +1,242 @@
+"""
+Deterministic synthetic data for capacity planning and performance tests.
+
+``seed()`` generates users (with their homepage UserDetails rows), Google
+credentials for a share of them, meetings with time options and A/B test view
+and click events. The same arguments and seed always produce the same dataset
+(relative to the day it runs). Distributions are skewed the way real traffic
+is: a few organizers own most meetings, recent days are busier than old ones.
+
+Rows are generated lazily and written with ``bulk_create`` one chunk per
+transaction, so memory use doesn't grow with the volume. Primary keys are
+assigned up front, which lets a meeting point at its selected option before the
+option row exists (the foreign keys are deferred) and avoids reading ids back
+on SQLite.
+"""
+import ipaddress
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from homepage.assignment import assign_variant
+from homepage.models import AbTestClickEvent, AbTestEvent, UserAgent, UserDetails
+
+from .models import GoogleOAuthCredential, MeetingRequest, TimeOption
+
+CHUNK_SIZE = 5000
+# Meetings per organizer follow a Zipf-like law with this exponent
+ORGANIZER_SKEW = 1.1
+# Share of meetings with a selected time
+SELECTED_SHARE = 0.4
+# Chance that a view of each variant is followed by a click
+CLICK_RATES = {'kudos': 0.12, 'thanks': 0.09}
+# Views per distinct A/B visitor, on average
+VIEWS_PER_VISITOR = 3
+
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Lee', 'Patel', 'Garcia', 'Kim', 'Nguyen', 'Smith', 'Müller', 'Rossi', 'Cohen', 'Okafor']
+MEETING_TITLES = ['Weekly sync', 'Planning', '1:1', 'Retro', 'Design review', 'Coffee chat', 'Interview',
+                  'Project kickoff', 'Office hours', 'Demo']
+DURATIONS = [30, 30, 45, 60, 60, 90]
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0',
+    'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Mobile Safari/537.36',
+]
+
+
+def _next_pk(model) -> int:
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def _chunks(total: int, size: int):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+@contextmanager
+def _keep_timestamps(*model_classes):
+    """Let bulk_create write the given created_at/updated_at values instead of now()."""
+    fields = [
+        field for model in model_classes for field in model._meta.concrete_fields
+        if isinstance(field, models.DateTimeField) and (field.auto_now or field.auto_now_add)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _reset_sequences(*model_classes) -> None:
+    # Explicit primary keys don't advance Postgres sequences (no-op on SQLite)
+    statements = connection.ops.sequence_reset_sql(no_style(), list(model_classes))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def _recent(rng: random.Random, anchor, days: int):
+    """A moment in the `days` before `anchor`, more likely recent than old."""
+    return anchor - timedelta(seconds=rng.triangular(0, days * 86400, 0))
+
+
+def _seed_users(rng, count, prefix, password, chunk_size, anchor, progress) -> List[int]:
+    if User.objects.filter(username__startswith=f'{prefix}-').exists():
+        raise ValueError(f'Users named {prefix}-* already exist; pick another prefix')
+    hashed = make_password(password)  # one hash for everyone: hashing is deliberately slow
+    first_pk = _next_pk(User)
+    for start, size in _chunks(count, chunk_size):
+        users, details = [], []
+        for i in range(start, start + size):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f'{prefix}-{i}@example.com'
+            joined = _recent(rng, anchor, 730)
+            users.append(User(pk=first_pk + i, username=f'{prefix}-{i}', email=email, password=hashed,
+                              first_name=first, last_name=last, date_joined=joined, last_login=joined))
+            details.append(UserDetails(firstname=first, lastname=last, google_account=email,
+                                       first_auth_ts=joined, last_auth_ts=joined))
+        with transaction.atomic(), _keep_timestamps(UserDetails):
+            User.objects.bulk_create(users, batch_size=chunk_size)
+            UserDetails.objects.bulk_create(details, batch_size=chunk_size)
+        progress('users', start + size, count)
+    _reset_sequences(User)
+    return list(range(first_pk, first_pk + count))
+
+
+def _seed_credentials(rng, user_ids, share, chunk_size, anchor, progress) -> int:
+    connected = [user_id for user_id in user_ids if rng.random() < share]
+    for start, size in _chunks(len(connected), chunk_size):
+        GoogleOAuthCredential.objects.bulk_create([
+            GoogleOAuthCredential(user_id=user_id, token=f'seed-token-{user_id}',
+                                  refresh_token=f'seed-refresh-{user_id}',
+                                  scopes='https://www.googleapis.com/auth/calendar',
+                                  expiry=anchor + timedelta(minutes=rng.randint(-30, 60)))
+            for user_id in connected[start:start + size]
+        ], batch_size=chunk_size)
+        progress('google credentials', start + size, len(connected))
+    return len(connected)
+
+
+def _seed_meetings(rng, user_ids, count, options_per_meeting, chunk_size, anchor, progress):
+    # Zipf-like weights over a shuffled copy, so the busiest organizers aren't just the first ids
+    organizers = list(user_ids)
+    rng.shuffle(organizers)
+    cum_weights = list(accumulate(1 / (rank + 1) ** ORGANIZER_SKEW for rank in range(len(organizers))))
+    next_meeting, next_option = _next_pk(MeetingRequest), _next_pk(TimeOption)
+    max_options = max(1, 2 * options_per_meeting - 1)
+    option_total = 0
+    with _keep_timestamps(MeetingRequest, TimeOption):
+        for start, size in _chunks(count, chunk_size):
+            meetings, options = [], []
+            for organizer_id in rng.choices(organizers, cum_weights=cum_weights, k=size):
+                created = _recent(rng, anchor, 365)
+                option_count = rng.randint(1, max_options)
+                selected = rng.randrange(option_count) if rng.random() < SELECTED_SHARE else None
+                slot = (created + timedelta(days=rng.randint(1, 21))).replace(
+                    hour=rng.randint(9, 16), minute=rng.choice([0, 30]), second=0, microsecond=0)
+                for k in range(option_count):
+                    duration = timedelta(minutes=rng.choice(DURATIONS))
+                    options.append(TimeOption(pk=next_option + k, meeting_request_id=next_meeting,
+                                              start_time=slot, end_time=slot + duration,
+                                              is_selected=(k == selected), created_at=created))
+                    slot += duration + timedelta(hours=rng.choice([1, 2, 24]))
+                meetings.append(MeetingRequest(
+                    pk=next_meeting, organizer_id=organizer_id,
+                    title=f'{rng.choice(MEETING_TITLES)} #{next_meeting}', description='',
+                    selected_option_id=next_option + selected if selected is not None else None,
+                    created_at=created, updated_at=created,
+                ))
+                next_meeting += 1
+                next_option += option_count
+            # One transaction per chunk: the meetings' selected_option references are checked at commit
+            with transaction.atomic():
+                MeetingRequest.objects.bulk_create(meetings, batch_size=chunk_size)
+                TimeOption.objects.bulk_create(options, batch_size=chunk_size)
+            option_total += len(options)
+            progress('meetings', start + size, count)
+    _reset_sequences(MeetingRequest, TimeOption)
+    return option_total
+
+
+def _seed_ab_events(rng, views, chunk_size, anchor, progress):
+    agent_ids = sorted(UserAgent.ids_for(USER_AGENTS).values())
+    visitors = [f'{rng.getrandbits(128):032x}' for _ in range(max(1, views // VIEWS_PER_VISITOR))]
+    variants = {}
+    clicks_total = 0
+    for start, size in _chunks(views, chunk_size):
+        view_rows, click_rows = [], []
+        for _ in range(size):
+            visitor = rng.choice(visitors)
+            variant = variants.get(visitor)
+            if variant is None:
+                variant = variants[visitor] = assign_variant(visitor)
+            fields = {
+                'session_key': visitor,
+                'variant': variant,
+                'agent_id': rng.choice(agent_ids),
+                'ip': str(ipaddress.IPv4Address(rng.getrandbits(32))),
+                'created_at': _recent(rng, anchor, 90),
+            }
+            view_rows.append(AbTestEvent(**fields))
+            if rng.random() < CLICK_RATES.get(variant, 0.1):
+                fields['created_at'] += timedelta(seconds=rng.randint(2, 120))
+                click_rows.append(AbTestClickEvent(**fields))
+        with transaction.atomic():
+            AbTestEvent.objects.bulk_create(view_rows, batch_size=chunk_size)
+            AbTestClickEvent.objects.bulk_create(click_rows, batch_size=chunk_size)
+        clicks_total += len(click_rows)
+        progress('A/B views', start + size, views)
+    return clicks_total
+
+
+def seed(users: int = 1000, meetings: int = 5000, options: int = 5, google_share: float = 0.3,
+         ab_views: int = 50000, seed: int = 0, prefix: str = 'seed', password: str = 'seed-password',
+         chunk_size: int = CHUNK_SIZE, progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, int]:
+    """
+    Generate a synthetic dataset.
+
+    Args:
+        users: Users to create, named <prefix>-0 ... <prefix>-<users - 1>
+        meetings: Meetings to spread over those users as organizers (skewed)
+        options: Average time options per meeting (1 to 2 * options - 1)
+        google_share: Fraction of users with a (fake) GoogleOAuthCredential
+        ab_views: A/B test view events; clicks follow from CLICK_RATES
+        seed: Random seed; the same seed gives the same dataset
+        prefix: Username prefix (must not be in use yet)
+        password: Password of every generated user
+        chunk_size: Rows per bulk_create / transaction
+        progress: Called as progress(label, done, total) after each chunk
+
+    Returns:
+        Rows created per kind
+    """
+    rng = random.Random(seed)
+    progress = progress or (lambda label, done, total: None)
+    anchor = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    user_ids = _seed_users(rng, users, prefix, password, chunk_size, anchor, progress)
+    counts = {'users': len(user_ids)}
+    counts['google credentials'] = _seed_credentials(rng, user_ids, google_share, chunk_size, anchor, progress)
+    if user_ids and meetings:
+        counts['time options'] = _seed_meetings(rng, user_ids, meetings, options, chunk_size, anchor, progress)
+        counts['meetings'] = meetings
+    if ab_views:
+        counts['A/B clicks'] = _seed_ab_events(rng, ab_views, chunk_size, anchor, progress)
+        counts['A/B views'] = ab_views
+    return counts
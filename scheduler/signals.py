@@ -0,0 +1,48 @@
+"""
+Signal handlers for the scheduler app.
+
+Connected in SchedulerConfig.ready().
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import google_scope, invalidate, meeting_scope, profile_scope, user_meetings_scope
+from .integrations.credentials import invalidate_credentials
+from .integrations.freebusy_cache import invalidate_free_busy
+from .models import GoogleOAuthCredential, MeetingRequest, TimeOption, UserProfile
+
+
+@receiver([post_save, post_delete], sender=GoogleOAuthCredential)
+def google_credential_changed(sender, instance, **kwargs):
+    """Connecting or disconnecting Google (OAuth callback, disconnect, admin) drops cached state."""
+    invalidate_credentials(instance.user_id)
+    invalidate_free_busy(instance.user_id)
+    invalidate(google_scope(instance.user_id))
+
+
+@receiver([post_save, post_delete], sender=MeetingRequest)
+def meeting_changed(sender, instance, **kwargs):
+    """Drop the cached meeting and its organizer's meeting list."""
+    invalidate(meeting_scope(instance.pk), user_meetings_scope(instance.organizer_id))
+
+
+@receiver([post_save, post_delete], sender=TimeOption)
+def time_option_changed(sender, instance, **kwargs):
+    """Options are cached as part of their meeting (and counted on the dashboard)."""
+    if instance._meta.get_field('meeting_request').is_cached(instance):
+        organizer_id = instance.meeting_request.organizer_id
+    else:
+        organizer_id = (
+            MeetingRequest.objects.filter(pk=instance.meeting_request_id)
+            .values_list('organizer_id', flat=True).first()
+        )
+    scopes = [meeting_scope(instance.meeting_request_id)]
+    if organizer_id is not None:
+        scopes.append(user_meetings_scope(organizer_id))
+    invalidate(*scopes)
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    """Drop the cached timezone preference."""
+    invalidate(profile_scope(instance.user_id))
@@ -0,0 +1,145 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ai_event_scheduler.profiling import profile
+from .integrations.freebusy import aquery_free_busy, query_free_busy, to_rfc3339
+from .models import MeetingRequest, TimeOption
+from .test_integration import FakeFreeBusyService
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class SlowGoogle:
+    """httpx.AsyncClient stand-in whose freebusy answer waits until released."""
+
+    def __init__(self):
+        self.waiting = asyncio.Event()
+        self.release = asyncio.Event()
+        self.posts = 0
+        self.open_clients = 0
+
+    async def __aenter__(self):
+        self.open_clients += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.open_clients -= 1
+
+    async def post(self, url, json, headers):
+        self.posts += 1
+        self.waiting.set()
+        await self.release.wait()
+        return FakeResponse({'calendars': {'primary': {'busy': []}}})
+
+
+class AsyncViewsTest(TestCase):
+    """The scheduler views run natively under ASGI."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', password='testpass123')
+        start = timezone.now() + timedelta(days=1)
+        self.meeting = MeetingRequest.objects.create(organizer=self.user, title='Sync')
+        TimeOption.objects.bulk_create([
+            TimeOption(meeting_request=self.meeting, start_time=start + timedelta(hours=i),
+                       end_time=start + timedelta(hours=i, minutes=30))
+            for i in range(2)
+        ])
+        self.meeting.select_option(self.meeting.time_options.first())
+
+    async def test_views_require_login(self):
+        response = await self.async_client.get(reverse('meeting_detail', kwargs={'pk': self.meeting.pk}))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+    async def test_select_time(self):
+        await self.async_client.aforce_login(self.user)
+        option = await self.meeting.time_options.alast()
+        response = await self.async_client.post(reverse('select_time', kwargs={'pk': self.meeting.pk}),
+                                                {'time_option_id': option.pk})
+        self.assertRedirects(response, reverse('meeting_detail', kwargs={'pk': self.meeting.pk}),
+                             fetch_redirect_response=False)
+        meeting = await MeetingRequest.objects.aget(pk=self.meeting.pk)
+        self.assertEqual(meeting.selected_option_id, option.pk)
+
+    async def test_other_requests_are_served_while_google_is_waited_on(self):
+        await self.async_client.aforce_login(self.user)
+        google = SlowGoogle()
+        with mock.patch('scheduler.integrations.google_calendar.HTTPX_AVAILABLE', True), \
+                mock.patch('scheduler.integrations.google_calendar._http_client', return_value=google), \
+                mock.patch('scheduler.integrations.google_calendar._get_user_credentials',
+                           return_value=SimpleNamespace(token='token')):
+            detail = asyncio.ensure_future(
+                self.async_client.get(reverse('meeting_detail', kwargs={'pk': self.meeting.pk}))
+            )
+            await asyncio.wait_for(google.waiting.wait(), 5)
+
+            response = await self.async_client.get(reverse('dashboard'))
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(detail.done())
+
+            google.release.set()
+            response = await asyncio.wait_for(detail, 5)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Your primary calendar appears free')
+        self.assertEqual(google.open_clients, 0)
+
+    async def test_concurrent_reloads_share_one_lookup(self):
+        await self.async_client.aforce_login(self.user)
+        google = SlowGoogle()
+        url = reverse('meeting_detail', kwargs={'pk': self.meeting.pk})
+        with mock.patch('scheduler.integrations.google_calendar.HTTPX_AVAILABLE', True), \
+                mock.patch('scheduler.integrations.google_calendar._http_client', return_value=google), \
+                mock.patch('scheduler.integrations.google_calendar._get_user_credentials',
+                           return_value=SimpleNamespace(token='token')):
+            reloads = [asyncio.ensure_future(self.async_client.get(url)) for _ in range(2)]
+            await asyncio.wait_for(google.waiting.wait(), 5)
+            # Let the second reload get as far as the lookup before Google answers
+            await asyncio.sleep(0.2)
+            google.release.set()
+            responses = await asyncio.wait_for(asyncio.gather(*reloads), 5)
+        for response in responses:
+            self.assertContains(response, 'Your primary calendar appears free')
+        self.assertEqual(google.posts, 1)
+        self.assertEqual(google.open_clients, 0)
+
+    async def test_queries_in_worker_threads_are_profiled(self):
+        with profile() as prof:
+            await User.objects.acount()
+        self.assertEqual(prof.queries, 1)
+
+
+class AsyncFreeBusyTest(TestCase):
+    """aquery_free_busy matches query_free_busy."""
+
+    def test_same_results_as_sync(self):
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        far = start + timedelta(days=60)
+        windows = [(start, start + timedelta(hours=1)), (far, far + timedelta(hours=1))]
+        busy = {'start': to_rfc3339(start), 'end': to_rfc3339(start + timedelta(minutes=30))}
+        calendars = ['primary', 'a@example.com', 'b@example.com']
+        service = FakeFreeBusyService({'primary': [busy]}, hidden=['b@example.com'])
+
+        async def post(body):
+            return service.freebusy().query(body=body).execute()
+
+        results = asyncio.run(aquery_free_busy(post, calendars, windows, max_calendars=2))
+        self.assertEqual(len(service.bodies), 4)
+        self.assertEqual(results, query_free_busy(service, calendars, windows, max_calendars=2))
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from .integrations.availability import evaluate_options, merge_intervals
+from .integrations.google_calendar import MockGoogleCalendar, find_common_free_slots
+
+
+def at(hour, minute=0):
+    return datetime(2025, 1, 6, hour, minute, tzinfo=timezone.utc)
+
+
+class MergeIntervalsTest(SimpleTestCase):
+    """Test interval normalization."""
+
+    def test_overlapping_and_duplicate_intervals_are_merged(self):
+        merged = merge_intervals([(at(11), at(12)), (at(9), at(10)), (at(9, 30), at(10, 30)), (at(9), at(10))])
+        self.assertEqual(merged, [(at(9), at(10, 30)), (at(11), at(12))])
+
+    def test_touching_intervals_stay_separate(self):
+        merged = merge_intervals([(at(9), at(10)), (at(10), at(11))])
+        self.assertEqual(merged, [(at(9), at(10)), (at(10), at(11))])
+
+    def test_empty_intervals_are_dropped(self):
+        self.assertEqual(merge_intervals([(at(9), at(9)), (at(10), at(9))]), [])
+
+
+class EvaluateOptionsTest(SimpleTestCase):
+    """Test the sweep-line availability engine."""
+
+    def setUp(self):
+        self.busy = {
+            'alice': [(at(9), at(10))],
+            'bob': [(at(9, 30), at(11)), (at(13), at(14))],
+            'carol': [],
+        }
+
+    def test_per_option_conflicts(self):
+        results = evaluate_options(self.busy, [(at(9), at(10)), (at(10), at(11)), (at(11), at(12))])
+        self.assertEqual(results[0]['busy_users'], ['alice', 'bob'])
+        self.assertEqual(results[1]['busy_users'], ['bob'])
+        self.assertEqual(results[2]['busy_users'], [])
+        self.assertEqual([r['free_count'] for r in results], [1, 2, 3])
+        self.assertEqual([r['available'] for r in results], [False, False, True])
+
+    def test_busy_interval_starting_inside_option(self):
+        results = evaluate_options(self.busy, [(at(12), at(13, 30))])
+        self.assertEqual(results[0]['busy_users'], ['bob'])
+        self.assertEqual(results[0]['free_users'], ['alice', 'carol'])
+
+    def test_half_open_boundaries(self):
+        results = evaluate_options({'alice': [(at(9), at(10))]}, [(at(8), at(9)), (at(10), at(11))])
+        self.assertEqual([r['busy_users'] for r in results], [[], []])
+
+    def test_quorum(self):
+        results = evaluate_options(self.busy, [(at(9), at(10)), (at(10), at(11))], quorum=2)
+        self.assertEqual([r['available'] for r in results], [False, True])
+        self.assertAlmostEqual(results[1]['availability_score'], 2 / 3)
+
+    def test_results_follow_input_order(self):
+        options = [(at(13), at(14)), (at(8), at(9))]
+        results = evaluate_options(self.busy, options)
+        self.assertEqual([(r['start_time'], r['end_time']) for r in results], options)
+
+    def test_no_users(self):
+        results = evaluate_options({}, [(at(9), at(10))])
+        self.assertEqual(results[0]['total_users'], 0)
+        self.assertTrue(results[0]['available'])
+
+
+class FindCommonFreeSlotsTest(TestCase):
+    """Test the integration wrappers around the engine."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username='alice', email='alice@example.com'),
+            User.objects.create_user(username='bob', email='bob@example.com'),
+        ]
+        start = datetime.now(timezone.utc) + timedelta(days=1)
+        self.options = [(start, start + timedelta(hours=1)), (start + timedelta(hours=3), start + timedelta(hours=4))]
+
+    def test_result_structure(self):
+        for finder in (find_common_free_slots, MockGoogleCalendar.find_common_free_slots):
+            results = finder(self.users, self.options)
+            self.assertEqual(len(results), 2)
+            for result in results:
+                self.assertEqual(result['total_users'], 2)
+                self.assertEqual(result['free_count'] + len(result['conflicts']), 2)
+                self.assertTrue(set(result['conflicts']) <= {'alice', 'bob'})
+                self.assertEqual(result['available'], not result['conflicts'])
+
+    def test_no_options(self):
+        self.assertEqual(find_common_free_slots(self.users, []), [])
@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from .benchmarks import compare
+from .models import MeetingRequest
+
+
+class CompareTest(SimpleTestCase):
+    """Regression detection against a stored baseline."""
+
+    baseline = {'dashboard': {'p50_ms': 10.0, 'queries': 2}, 'coffee_abtest': {'p50_ms': 0.2, 'queries': 0}}
+
+    def test_slower_than_threshold(self):
+        results = {'dashboard': {'p50_ms': 12.5, 'queries': 2}}
+        self.assertEqual(compare(results, self.baseline, 0.2), ['dashboard: p50 10.00 -> 12.50 ms'])
+        self.assertEqual(compare(results, self.baseline, 0.3), [])
+
+    def test_small_absolute_changes_are_noise(self):
+        results = {'coffee_abtest': {'p50_ms': 0.4, 'queries': 0}}
+        self.assertEqual(compare(results, self.baseline, 0.2), [])
+
+    def test_more_queries(self):
+        results = {'dashboard': {'p50_ms': 9.0, 'queries': 3}}
+        self.assertEqual(compare(results, self.baseline, 0.2), ['dashboard: queries 2 -> 3'])
+
+    def test_new_cases_are_skipped(self):
+        self.assertEqual(compare({'new': {'p50_ms': 1, 'queries': 1}}, self.baseline, 0.2), [])
+
+
+class BenchmarkCommandTest(TestCase):
+    """The benchmark command on a tiny dataset."""
+
+    def test_run_history_and_baseline(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        directory = tmp.name
+        paths = {
+            'history': os.path.join(directory, 'history.json'),
+            'baseline': os.path.join(directory, 'baseline.json'),
+        }
+        options = dict(users=5, meetings=40, iterations=2, warmup=0, stdout=StringIO(), **paths)
+        call_command('benchmark', save_baseline=True, **options)
+
+        with open(paths['baseline']) as fh:
+            baseline = json.load(fh)
+        self.assertIn('create_meeting[100]', baseline['results'])
+        self.assertEqual(set(baseline['results']['dashboard']), {'p50_ms', 'p95_ms', 'mean_ms', 'ops_per_s', 'queries'})
+        self.assertFalse(MeetingRequest.objects.exists())  # everything was rolled back
+
+        # A baseline that took no time at all makes every case a regression
+        for result in baseline['results'].values():
+            result['p50_ms'] = 0
+        with open(paths['baseline'], 'w') as fh:
+            json.dump(baseline, fh)
+        with self.assertRaises(CommandError):
+            call_command('benchmark', only='dashboard', **options)
+        with open(paths['history']) as fh:
+            self.assertEqual(len(json.load(fh)), 2)
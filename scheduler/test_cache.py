@@ -0,0 +1,86 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from .cache import cache_aside, get_meeting, google_connected, invalidate, meeting_scope
+from .models import GoogleOAuthCredential, MeetingRequest, TimeOption
+
+
+class CacheAsideTest(TestCase):
+    """Test version-keyed cache-aside reads."""
+
+    def test_loads_once_until_invalidated(self):
+        loader = mock.Mock(return_value=42)
+        self.assertEqual(cache_aside('answer', ['scope:1'], loader), 42)
+        self.assertEqual(cache_aside('answer', ['scope:1'], loader), 42)
+        self.assertEqual(loader.call_count, 1)
+
+        invalidate('scope:1')
+        cache_aside('answer', ['scope:1'], loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_invalidating_another_scope_keeps_the_entry(self):
+        loader = mock.Mock(return_value='x')
+        cache_aside('entry', ['scope:a'], loader)
+        invalidate('scope:b')
+        cache_aside('entry', ['scope:a'], loader)
+        self.assertEqual(loader.call_count, 1)
+
+    def test_none_is_cached(self):
+        loader = mock.Mock(return_value=None)
+        self.assertIsNone(cache_aside('missing', ['scope:1'], loader))
+        self.assertIsNone(cache_aside('missing', ['scope:1'], loader))
+        self.assertEqual(loader.call_count, 1)
+
+
+class SignalInvalidationTest(TestCase):
+    """Model changes drop the cached reads that depend on them."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='organizer')
+        self.meeting = MeetingRequest.objects.create(organizer=self.user, title='Planning')
+        self.start = timezone.now() + timedelta(days=1)
+
+    def add_option(self, hours=0):
+        return TimeOption.objects.create(meeting_request=self.meeting, start_time=self.start + timedelta(hours=hours),
+                                         end_time=self.start + timedelta(hours=hours + 1))
+
+    def test_meeting_is_served_from_cache(self):
+        self.add_option()
+        get_meeting(self.meeting.pk)
+        with self.assertNumQueries(0):
+            meeting = get_meeting(self.meeting.pk)
+        self.assertEqual(len(meeting.time_options.all()), 1)
+
+    def test_option_changes_invalidate_the_meeting(self):
+        option = self.add_option()
+        self.assertEqual(len(get_meeting(self.meeting.pk).time_options.all()), 1)
+        self.add_option(hours=2)
+        self.assertEqual(len(get_meeting(self.meeting.pk).time_options.all()), 2)
+
+        self.meeting.select_option(option)
+        self.assertEqual(get_meeting(self.meeting.pk).selected_option, option)
+
+    def test_meeting_update_and_delete(self):
+        get_meeting(self.meeting.pk)
+        self.meeting.title = 'Renamed'
+        self.meeting.save()
+        self.assertEqual(get_meeting(self.meeting.pk).title, 'Renamed')
+
+        pk = self.meeting.pk
+        self.meeting.delete()
+        self.assertIsNone(get_meeting(pk))
+
+    def test_explicit_invalidation(self):
+        get_meeting(self.meeting.pk)
+        MeetingRequest.objects.filter(pk=self.meeting.pk).update(calendar_event_id='evt')
+        invalidate(meeting_scope(self.meeting.pk))
+        self.assertEqual(get_meeting(self.meeting.pk).calendar_event_id, 'evt')
+
+    def test_google_connection_status(self):
+        self.assertFalse(google_connected(self.user))
+        GoogleOAuthCredential.objects.create(user=self.user, token='t')
+        self.assertTrue(google_connected(self.user))
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .emails import MAX_ATTEMPTS, deliver_queued_emails, send_meeting_created_email
+from .models import MeetingRequest, OutboundEmail
+
+
+class FlakyBackend(EmailBackend):
+    """Locmem backend that rejects one address and counts connections."""
+    opened = 0
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        if any('bounce@example.com' in m.to for m in messages):
+            raise OSError('SMTP 550 mailbox unavailable')
+        return super().send_messages(messages)
+
+
+class UnreachableBackend(EmailBackend):
+    """Locmem backend whose server goes away after `opens` connections."""
+    opens = 0
+
+    def open(self):
+        if UnreachableBackend.opens <= 0:
+            raise ConnectionRefusedError('SMTP server unreachable')
+        UnreachableBackend.opens -= 1
+        return super().open()
+
+    def send_messages(self, messages):
+        raise OSError('SMTP 421 service not available')
+
+
+class EmailOutboxTest(TestCase):
+    """Test queued email delivery."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='organizer', password='testpass123', email='o@example.com')
+        self.meeting = MeetingRequest.objects.create(organizer=self.user, title='Planning')
+
+    def test_builders_only_enqueue(self):
+        send_meeting_created_email(self.meeting)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to_email, 'o@example.com')
+        self.assertIn('Planning', email.subject)
+
+    def test_create_meeting_does_not_send_inline(self):
+        self.client.login(username='organizer', password='testpass123')
+        self.client.post(reverse('create_meeting'), {'title': 'Queued', 'time_slot_count': '0'})
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING).count(), 1)
+
+    def test_batch_is_sent_over_one_connection(self):
+        for i in range(3):
+            OutboundEmail.objects.create(to_email=f'user{i}@example.com', subject='Hi', body='Body')
+        FlakyBackend.opened = 0
+        with patch('scheduler.emails.get_connection', side_effect=lambda **kw: FlakyBackend(**kw)):
+            self.assertEqual(deliver_queued_emails(), {'sent': 3})
+        self.assertEqual(FlakyBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.STATUS_SENT).exists())
+
+    def test_failures_are_retried_then_dead_lettered(self):
+        OutboundEmail.objects.create(to_email='bounce@example.com', subject='Hi', body='Body')
+        OutboundEmail.objects.create(to_email='ok@example.com', subject='Hi', body='Body')
+        with patch('scheduler.emails.get_connection', side_effect=lambda **kw: FlakyBackend(**kw)):
+            self.assertEqual(deliver_queued_emails(), {'pending': 1, 'sent': 1})
+            bounced = OutboundEmail.objects.get(to_email='bounce@example.com')
+            self.assertEqual(bounced.attempts, 1)
+            self.assertIn('550', bounced.last_error)
+            self.assertGreater(bounced.next_attempt_at, timezone.now())
+
+            OutboundEmail.objects.filter(pk=bounced.pk).update(
+                attempts=MAX_ATTEMPTS - 1, next_attempt_at=timezone.now() - timedelta(seconds=1),
+            )
+            self.assertEqual(deliver_queued_emails(), {'dead': 1})
+        self.assertEqual(len(mail.outbox), 1)
+
+    def _unreachable(self, opens):
+        UnreachableBackend.opens = opens
+        return patch('scheduler.emails.get_connection', side_effect=lambda **kw: UnreachableBackend(**kw))
+
+    def test_unreachable_server_backs_off_the_batch(self):
+        for i in range(2):
+            OutboundEmail.objects.create(to_email=f'user{i}@example.com', subject='Hi', body='Body')
+        with self._unreachable(opens=0):
+            self.assertEqual(deliver_queued_emails(), {'pending': 2})
+        for email in OutboundEmail.objects.all():
+            self.assertEqual(email.attempts, 1)
+            self.assertIn('unreachable', email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+
+    def test_failed_reconnect_backs_off_the_rest(self):
+        for i in range(3):
+            OutboundEmail.objects.create(to_email=f'user{i}@example.com', subject='Hi', body='Body')
+        OutboundEmail.objects.update(attempts=MAX_ATTEMPTS - 1)
+        with self._unreachable(opens=1):
+            self.assertEqual(deliver_queued_emails(), {'dead': 3})
+        errors = sorted(OutboundEmail.objects.values_list('last_error', flat=True))
+        self.assertIn('421', errors[0])
+        self.assertEqual(errors[1:], ['SMTP server unreachable'] * 2)
@@ -0,0 +1,180 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from ai_event_scheduler import metrics
+from .integrations import fanout
+from .integrations.fanout import fan_out
+from .integrations.freebusy import to_rfc3339
+from .integrations.google_calendar import _common_free_slots, find_common_free_slots, get_free_busy_for_users
+from .test_integration import FakeFreeBusyService
+
+
+def sleeper(seconds, value=None):
+    def call():
+        time.sleep(seconds)
+        return value
+    return call
+
+
+def failing():
+    raise ConnectionError('unreachable')
+
+
+class FanOutTest(SimpleTestCase):
+    """Concurrent calls with per-call timeouts, an overall deadline and partial results."""
+
+    def test_calls_run_concurrently(self):
+        started = time.monotonic()
+        outcome = fan_out({i: sleeper(0.2, i) for i in range(5)}, timeout=1, deadline=2)
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(outcome.results, {i: i for i in range(5)})
+        self.assertEqual(outcome.unknown, {})
+
+    def test_failures_and_slow_calls_are_unknown(self):
+        started = time.monotonic()
+        outcome = fan_out({'ok': sleeper(0, 'busy'), 'error': failing, 'slow': sleeper(1)},
+                          timeout=0.1, deadline=2)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(outcome.results, {'ok': 'busy'})
+        self.assertEqual(outcome.unknown, {'error': 'error', 'slow': 'timeout'})
+
+    def test_deadline_covers_queued_calls(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            started = time.monotonic()
+            outcome = fan_out({'first': sleeper(0.1, 1), 'second': sleeper(0.1, 2), 'third': sleeper(0.1, 3)},
+                              timeout=1, deadline=0.15, executor=executor)
+            self.assertLess(time.monotonic() - started, 0.3)
+        self.assertEqual(outcome.results, {'first': 1})
+        self.assertEqual(outcome.unknown, {'second': 'deadline', 'third': 'deadline'})
+
+    def test_no_calls(self):
+        outcome = fan_out({}, timeout=1, deadline=1)
+        self.assertEqual((outcome.results, outcome.unknown), ({}, {}))
+
+
+class SlowFreeBusyService(FakeFreeBusyService):
+    def __init__(self, busy_by_calendar, delay):
+        super().__init__(busy_by_calendar)
+        self.delay = delay
+
+    def execute(self):
+        time.sleep(self.delay)
+        return super().execute()
+
+
+class BrokenFreeBusyService(FakeFreeBusyService):
+    def execute(self):
+        raise ConnectionError('unreachable')
+
+
+class StalledFreeBusyService(FakeFreeBusyService):
+    """Google never answers: the call ends when the socket timeout it was built with runs out."""
+
+    def __init__(self, timeout):
+        super().__init__({})
+        self.timeout = timeout
+
+    def execute(self):
+        time.sleep(self.timeout)
+        raise TimeoutError('timed out')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                           'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+                   FREEBUSY_CALL_TIMEOUT=0.3, FREEBUSY_DEADLINE=1)
+class AttendeeFanOutTest(TestCase):
+    """Attendees the organizer can't see are looked up concurrently; unreachable ones are unknown."""
+
+    def setUp(self):
+        cache.clear()
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.options = [(self.start, self.start + timedelta(hours=1))]
+        self.organizer = User.objects.create_user(username='organizer', email='organizer@example.com')
+        self.attendees = [
+            User.objects.create_user(username=f'attendee{i}', email=f'attendee{i}@example.com') for i in range(4)
+        ]
+        busy = {'start': to_rfc3339(self.start), 'end': to_rfc3339(self.start + timedelta(minutes=30))}
+        hidden = [user.email for user in self.attendees]
+        self.services = {
+            self.organizer: FakeFreeBusyService({}, hidden=hidden),
+            self.attendees[0]: SlowFreeBusyService({'primary': [busy]}, delay=0.2),
+            self.attendees[1]: SlowFreeBusyService({}, delay=0.2),
+            self.attendees[2]: BrokenFreeBusyService({}),
+            self.attendees[3]: SlowFreeBusyService({}, delay=2),
+        }
+
+    def _find(self):
+        with patch('scheduler.integrations.google_calendar._build_calendar_service',
+                   side_effect=lambda user, **kwargs: self.services.get(user)):
+            return find_common_free_slots([self.organizer] + self.attendees, self.options, requester=self.organizer)
+
+    def test_unreachable_attendees_are_unknown(self):
+        started = time.monotonic()
+        [slot] = self._find()
+        # The two 0.2 s lookups overlap; the 2 s one is given up on after the call timeout
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(slot['unknown'], ['attendee2', 'attendee3'])
+        self.assertEqual(slot['total_users'], 3)
+        self.assertEqual(slot['conflicts'], ['attendee0'])
+        self.assertFalse(slot['available'])
+
+    def test_answers_are_cached_and_unknowns_are_not(self):
+        self._find()
+        with patch('scheduler.integrations.google_calendar._build_calendar_service', return_value=None):
+            busy = get_free_busy_for_users([self.organizer] + self.attendees[:2], self.options,
+                                           requester=self.organizer)
+        self.assertEqual(len(busy[self.attendees[0]]), 1)
+        self.assertEqual(busy[self.attendees[1]], [])
+        self.assertEqual(self._find()[0]['unknown'], ['attendee2', 'attendee3'])
+
+    def test_calendar_errors_are_unknown_not_mocked(self):
+        self.services[self.attendees[1]] = FakeFreeBusyService({}, hidden=['primary'])
+        with patch.object(metrics, 'registry', metrics.Registry()):
+            [slot] = self._find()
+            counters, _ = metrics.registry.collect()
+        self.assertEqual(slot['unknown'], ['attendee1', 'attendee2', 'attendee3'])
+        self.assertEqual(slot['total_users'], 2)
+        self.assertEqual(counters[('google_calendar_unknown_total', (('reason', 'error'),))], 2)
+        self.assertNotIn(('google_calendar_mock_fallbacks_total', (('operation', 'freebusy'),)), counters)
+
+    def test_unknown_users_count_against_the_quorum(self):
+        [slot] = _common_free_slots({self.organizer: []}, self.options, unknown=self.attendees[:1])
+        self.assertEqual(slot['free_count'], 1)
+        self.assertFalse(slot['available'])
+        [slot] = _common_free_slots({self.organizer: []}, self.options, quorum=1, unknown=self.attendees[:1])
+        self.assertTrue(slot['available'])
+
+    def test_nobody_known_is_never_available(self):
+        for quorum in (None, 0):
+            [slot] = _common_free_slots({}, self.options, quorum, unknown=self.attendees[:2])
+            self.assertEqual(slot['total_users'], 0)
+            self.assertFalse(slot['available'])
+
+    @override_settings(GOOGLE_API_TIMEOUT=5)
+    def test_stalled_lookups_free_the_pool(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown, wait=False)
+        stalled = [User.objects.create_user(username=f'stalled{i}', email=f's{i}@example.com') for i in range(2)]
+        self.services[self.organizer].hidden.update(user.email for user in stalled)
+
+        def build(user, timeout=None, **kwargs):
+            if user in stalled:
+                return StalledFreeBusyService(timeout or 5)
+            return self.services.get(user)
+
+        with patch('scheduler.integrations.google_calendar._build_calendar_service', side_effect=build), \
+                patch.object(fanout, '_executor', executor):
+            [slot] = find_common_free_slots([self.organizer] + stalled, self.options, requester=self.organizer)
+            self.assertEqual(slot['unknown'], ['stalled0', 'stalled1'])
+            # Both pool threads were given up on, but they come free at the call timeout, not after 5 s
+            [slot] = find_common_free_slots([self.organizer] + self.attendees[:2], self.options,
+                                            requester=self.organizer)
+        self.assertEqual(slot['unknown'], [])
+        self.assertEqual(slot['conflicts'], ['attendee0'])
@@ -1,9 +1,22 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
-from .models import MeetingRequest, TimeOption
-from .integrations.google_calendar import MockGoogleCalendar, get_free_busy_for_user, create_calendar_event
+import threading
+import time
+from unittest.mock import patch
+from django.core.cache import cache
+from .models import GoogleOAuthCredential, MeetingRequest, TimeOption
+from .integrations import discovery
+from .integrations.credentials import (
+    GOOGLE_AUTH_AVAILABLE, credential_cache, credential_version, get_user_credentials, has_google_credentials,
+    refresh_expiring_tokens,
+)
+from .integrations.freebusy import query_free_busy, to_rfc3339
+from .integrations.freebusy_cache import get_cached_free_busy, free_busy_version, invalidate_free_busy
+from .integrations.google_calendar import (
+    MockGoogleCalendar, get_free_busy_for_user, get_free_busy_for_users, create_calendar_event,
+)
 
 
 class GoogleCalendarIntegrationTest(TestCase):
@@ -73,3 +86,263 @@ class GoogleCalendarIntegrationTest(TestCase):
         message = MockGoogleCalendar.check_availability_message(self.meeting)
         self.assertIn('participants', message)
         self.assertTrue(message.startswith('✅') or message.startswith('⚠️'))
+
+
+class FakeFreeBusyService:
+    """Local stand-in for the Calendar API freebusy surface."""
+
+    def __init__(self, busy_by_calendar, hidden=()):
+        self.busy_by_calendar = busy_by_calendar
+        self.hidden = set(hidden)
+        self.bodies = []
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        self.bodies.append(body)
+        self._body = body
+        return self
+
+    def execute(self):
+        calendars = {}
+        for item in self._body['items']:
+            cal_id = item['id']
+            if cal_id in self.hidden:
+                calendars[cal_id] = {'busy': [], 'errors': [{'domain': 'global', 'reason': 'notFound'}]}
+            else:
+                calendars[cal_id] = {'busy': self.busy_by_calendar.get(cal_id, [])}
+        return {'calendars': calendars}
+
+
+class BatchedFreeBusyTest(TestCase):
+    """Test batched free/busy queries against a local API stand-in."""
+
+    def setUp(self):
+        cache.clear()
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.windows = [(self.start, self.start + timedelta(hours=1)),
+                        (self.start + timedelta(hours=2), self.start + timedelta(hours=3))]
+        self.organizer = User.objects.create_user(username='organizer', email='organizer@example.com')
+        self.attendees = [
+            User.objects.create_user(username=f'attendee{i}', email=f'attendee{i}@example.com')
+            for i in range(3)
+        ]
+
+    def _busy(self, offset_hours):
+        start = self.start + timedelta(hours=offset_hours)
+        return {'start': to_rfc3339(start), 'end': to_rfc3339(start + timedelta(minutes=30))}
+
+    def test_single_request_for_all_calendars_and_windows(self):
+        service = FakeFreeBusyService({
+            'primary': [self._busy(0)],
+            'attendee0@example.com': [self._busy(2), self._busy(10)],
+        })
+        results = query_free_busy(service, ['primary', 'attendee0@example.com', 'attendee1@example.com'], self.windows)
+
+        self.assertEqual(len(service.bodies), 1)
+        self.assertEqual(len(service.bodies[0]['items']), 3)
+        self.assertEqual(len(results['primary']), 1)
+        # The 10h busy block is outside every requested window
+        self.assertEqual(len(results['attendee0@example.com']), 1)
+        self.assertEqual(results['attendee1@example.com'], [])
+
+    def test_calendars_are_chunked(self):
+        service = FakeFreeBusyService({})
+        query_free_busy(service, [f'user{i}@example.com' for i in range(5)], self.windows, max_calendars=2)
+        self.assertEqual([len(body['items']) for body in service.bodies], [2, 2, 1])
+
+    def test_distant_windows_are_queried_separately(self):
+        service = FakeFreeBusyService({})
+        far = self.start + timedelta(days=90)
+        query_free_busy(service, ['primary'], self.windows + [(far, far + timedelta(hours=1))])
+        self.assertEqual(len(service.bodies), 2)
+
+    def test_results_are_split_per_user(self):
+        service = FakeFreeBusyService({'attendee1@example.com': [self._busy(0)]}, hidden={'attendee2@example.com'})
+        users = [self.organizer] + self.attendees
+        with patch('scheduler.integrations.google_calendar._build_calendar_service',
+                   side_effect=lambda user, **kwargs: service if user == self.organizer else None):
+            results = get_free_busy_for_users(users, self.windows, requester=self.organizer)
+
+        self.assertEqual(len(service.bodies), 1)
+        self.assertEqual(results[self.organizer], [])
+        self.assertEqual(results[self.attendees[0]], [])
+        self.assertEqual(len(results[self.attendees[1]]), 1)
+        # Hidden calendar falls back to a per-user lookup (mocked: no credentials)
+        self.assertIsInstance(results[self.attendees[2]], list)
+
+
+class FakeEventsService(FakeFreeBusyService):
+    """Stand-in that also accepts event inserts."""
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body, sendUpdates):
+        self._body = None
+        return self
+
+    def execute(self):
+        if self._body is None:
+            return {'id': 'google_event_1'}
+        return super().execute()
+
+
+# The single-flight test reads the cache from several threads, which the
+# database cache can't do against the in-memory test database
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                           'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class FreeBusyCacheTest(TestCase):
+    """Test the free/busy cache in front of the Calendar API."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', email='organizer@example.com')
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.end = self.start + timedelta(hours=1)
+        self.service = FakeEventsService({'primary': [{'start': to_rfc3339(self.start), 'end': to_rfc3339(self.end)}]})
+        patcher = patch('scheduler.integrations.google_calendar._build_calendar_service', return_value=self.service)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeat_lookups_are_served_from_cache(self):
+        first = get_free_busy_for_user(self.user, self.start, self.end)
+        second = get_free_busy_for_user(self.user, self.start, self.end)
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.service.bodies), 1)
+
+    def test_creating_an_event_invalidates_the_cache(self):
+        get_free_busy_for_user(self.user, self.start, self.end)
+        version = free_busy_version(self.user.pk)
+        response = create_calendar_event(self.user, 'Sync', self.start, self.end)
+        self.assertEqual(response['event_id'], 'google_event_1')
+        self.assertEqual(free_busy_version(self.user.pk), version + 1)
+        get_free_busy_for_user(self.user, self.start, self.end)
+        self.assertEqual(len(self.service.bodies), 2)
+
+    def test_failures_are_not_cached(self):
+        windows = [(self.start, self.end)]
+        self.assertIsNone(get_cached_free_busy(self.user.pk, windows, lambda: None))
+        self.assertEqual(get_cached_free_busy(self.user.pk, windows, lambda: []), [])
+
+    def test_concurrent_misses_share_one_fetch(self):
+        windows = [(self.start, self.end)]
+        invalidate_free_busy(self.user.pk)
+        release = threading.Event()
+        calls = []
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(5)
+            return []
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_cached_free_busy(self.user.pk, windows, slow_fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        # Give every thread time to miss the cache and queue up behind the leader
+        time.sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [[]] * 5)
+        self.assertEqual(len(calls), 1)
+
+
+class DiscoveryRegistryTest(TestCase):
+    """Test the process-wide Calendar discovery document registry."""
+
+    def setUp(self):
+        if not discovery.DISCOVERY_AVAILABLE:
+            self.skipTest('google-api-python-client is not installed')
+
+    def test_document_is_loaded_once(self):
+        self.assertIs(discovery.calendar_discovery_document(), discovery.calendar_discovery_document())
+
+    def test_services_are_bound_to_their_credentials(self):
+        from google.oauth2.credentials import Credentials
+        first = discovery.build_calendar_service(Credentials(token='first'))
+        second = discovery.build_calendar_service(Credentials(token='second'))
+        self.assertEqual(first._http.credentials.token, 'first')
+        self.assertEqual(second._http.credentials.token, 'second')
+        self.assertTrue(hasattr(first.freebusy(), 'query'))
+
+
+class CredentialCacheTest(TestCase):
+    """Test the per-worker credential cache and the proactive refresher."""
+
+    def setUp(self):
+        if not GOOGLE_AUTH_AVAILABLE:
+            self.skipTest('google-auth is not installed')
+        credential_cache.clear()
+        # Rolled-back rows don't send the delete signal: don't leak credentials to later tests
+        self.addCleanup(credential_cache.clear)
+        self.user = User.objects.create_user(username='organizer', email='organizer@example.com')
+
+    def _connect(self, expires_in):
+        return GoogleOAuthCredential.objects.create(
+            user=self.user, token='old-token', refresh_token='refresh',
+            expiry=timezone.now() + timedelta(seconds=expires_in),
+        )
+
+    def test_credentials_are_cached(self):
+        self._connect(expires_in=3600)
+        first = get_user_credentials(self.user)
+        with self.assertNumQueries(0):
+            second = get_user_credentials(self.user)
+            self.assertTrue(has_google_credentials(self.user))
+        self.assertIs(first, second)
+
+    def test_disconnect_invalidates_cache(self):
+        record = self._connect(expires_in=3600)
+        self.assertTrue(has_google_credentials(self.user))
+        record.delete()
+        self.assertFalse(has_google_credentials(self.user))
+        self.assertIsNone(get_user_credentials(self.user))
+
+    def test_changes_in_other_workers_retire_the_entry(self):
+        self._connect(expires_in=3600)
+        self.assertEqual(get_user_credentials(self.user).token, 'old-token')
+        # Another worker replaced the token: this process only sees the shared version move
+        GoogleOAuthCredential.objects.filter(user=self.user).update(token='new-token')
+        cache.incr(f'credentials:version:{self.user.pk}')
+        self.assertEqual(get_user_credentials(self.user).token, 'new-token')
+
+    def test_inline_refresh_bumps_the_version(self):
+        self._connect(expires_in=-60)
+        version = credential_version(self.user.pk)
+
+        def fake_refresh(creds, request):
+            creds.token = 'new-token'
+            creds.expiry = (timezone.now() + timedelta(hours=1)).replace(tzinfo=None)
+
+        with patch('google.oauth2.credentials.Credentials.refresh', autospec=True, side_effect=fake_refresh):
+            self.assertEqual(get_user_credentials(self.user).token, 'new-token')
+        self.assertGreater(credential_version(self.user.pk), version)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_credentials(self.user).token, 'new-token')
+
+    def test_connect_invalidates_negative_entry(self):
+        self.assertFalse(has_google_credentials(self.user))
+        self._connect(expires_in=3600)
+        self.assertTrue(has_google_credentials(self.user))
+
+    def test_refresher_renews_expiring_tokens(self):
+        self._connect(expires_in=60)
+
+        def fake_refresh(creds, request):
+            creds.token = 'new-token'
+            creds.expiry = (timezone.now() + timedelta(hours=1)).replace(tzinfo=None)
+
+        with patch('google.oauth2.credentials.Credentials.refresh', autospec=True, side_effect=fake_refresh):
+            self.assertEqual(refresh_expiring_tokens(window_seconds=900), (1, 0))
+            # Tokens outside the window are left alone
+            self.assertEqual(refresh_expiring_tokens(window_seconds=900), (0, 0))
+
+        record = GoogleOAuthCredential.objects.get(user=self.user)
+        self.assertEqual(record.token, 'new-token')
+        self.assertEqual(get_user_credentials(self.user).token, 'new-token')
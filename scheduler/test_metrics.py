@@ -0,0 +1,100 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ai_event_scheduler import metrics
+from .emails import deliver_queued_emails
+from .integrations.google_calendar import create_calendar_event
+from .models import OutboundEmail
+
+
+class RegistryTest(TestCase):
+    """File-backed metrics summed across worker processes."""
+
+    def test_snapshots_of_other_workers_are_summed(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        directory = tmp.name
+        with mock.patch('ai_event_scheduler.metrics.os.getpid', return_value=1001):
+            other = metrics.Registry(directory)
+            other.inc('http_requests_total', view='dashboard', method='GET', status=200)
+            other.observe('http_request_duration_seconds', 0.2, view='dashboard')
+            other.flush()
+
+        local = metrics.Registry(directory)
+        local.inc('http_requests_total', amount=2, view='dashboard', method='GET', status=200)
+        local.observe('http_request_duration_seconds', 30, view='dashboard')
+        counters, histograms = local.collect()
+
+        labels = (('method', 'GET'), ('status', '200'), ('view', 'dashboard'))
+        self.assertEqual(counters[('http_requests_total', labels)], 3)
+        counts = histograms[('http_request_duration_seconds', (('view', 'dashboard'),))]
+        self.assertEqual(sum(counts[:-1]), 2)
+        self.assertEqual(counts[-2], 1)  # +Inf
+        self.assertAlmostEqual(counts[-1], 30.2)
+
+    def test_render_exposition_format(self):
+        registry = metrics.Registry()
+        registry.observe('http_request_db_queries', 3, view='meeting_detail')
+        text = registry.render()
+        self.assertIn('# TYPE http_request_db_queries histogram', text)
+        self.assertIn('http_request_db_queries_bucket{view="meeting_detail",le="2"} 0', text)
+        self.assertIn('http_request_db_queries_bucket{view="meeting_detail",le="5"} 1', text)
+        self.assertIn('http_request_db_queries_bucket{view="meeting_detail",le="+Inf"} 1', text)
+        self.assertIn('http_request_db_queries_count{view="meeting_detail"} 1', text)
+
+
+@override_settings(METRICS_TOKEN='scrape-me')
+class MetricsEndpointTest(TestCase):
+    """Request metrics middleware and the protected /metrics endpoint."""
+
+    def setUp(self):
+        patcher = mock.patch.object(metrics, 'registry', metrics.Registry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(username='organizer', password='testpass123')
+
+    def test_requires_token_or_staff(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-me')
+        self.assertEqual(response.status_code, 200)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.login(username='organizer', password='testpass123')
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+    def test_requests_are_recorded_per_url_name(self):
+        self.client.login(username='organizer', password='testpass123')
+        self.client.get(reverse('dashboard'))
+        self.client.get('/no-such-page/')
+        text = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-me').content.decode()
+        self.assertIn('http_requests_total{method="GET",status="200",view="dashboard"} 1', text)
+        self.assertIn('http_requests_total{method="GET",status="404",view="<unresolved>"} 1', text)
+        self.assertIn('http_request_duration_seconds_count{view="dashboard"} 1', text)
+        self.assertIn('http_request_db_queries_count{view="dashboard"} 1', text)
+
+    def test_mock_fallback_is_counted(self):
+        start = timezone.now()
+        result = create_calendar_event(self.user, 'Sync', start, start + timedelta(hours=1))
+        self.assertEqual(result['status'], 'success')
+        counters, _ = metrics.registry.collect()
+        self.assertEqual(
+            counters[('google_calendar_mock_fallbacks_total', (('operation', 'create_calendar_event'),))], 1,
+        )
+
+    def test_email_sends_are_counted(self):
+        OutboundEmail.objects.create(to_email='a@example.com', subject='Hi', body='Hello')
+        deliver_queued_emails()
+        self.assertEqual(len(mail.outbox), 1)
+        counters, histograms = metrics.registry.collect()
+        self.assertEqual(counters[('email_sends_total', (('outcome', 'success'),))], 1)
+        self.assertIn(('email_send_duration_seconds', ()), histograms)
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .integrations.credentials import GOOGLE_AUTH_AVAILABLE, credential_cache
+from .integrations.google_calendar import CalendarNotConnected
+from .models import CalendarEventJob, GoogleOAuthCredential, MeetingRequest, TimeOption
+from .outbox import MAX_ATTEMPTS, backoff, process_calendar_outbox
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f'HTTP {status}')
+        self.resp = type('Resp', (), {'status': status})()
+
+
+class CalendarOutboxTest(TestCase):
+    """Test the calendar event outbox and its worker."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='organizer', password='testpass123', email='o@example.com')
+        self.client.login(username='organizer', password='testpass123')
+        self.meeting = MeetingRequest.objects.create(organizer=self.user, title='Planning')
+        start = timezone.now() + timedelta(days=1)
+        self.option = TimeOption.objects.create(meeting_request=self.meeting, start_time=start,
+                                                end_time=start + timedelta(hours=1))
+
+    def _select(self, option=None):
+        return self.client.post(reverse('select_time', kwargs={'pk': self.meeting.pk}),
+                                {'time_option_id': (option or self.option).pk})
+
+    def _insert(self, **kwargs):
+        return patch('scheduler.outbox.insert_calendar_event', **kwargs)
+
+    def test_select_time_only_enqueues(self):
+        with self._insert() as insert:
+            response = self._select()
+        self.assertEqual(response.status_code, 302)
+        insert.assert_not_called()
+        job = CalendarEventJob.objects.get()
+        self.assertEqual(job.status, CalendarEventJob.STATUS_PENDING)
+        self.assertEqual(job.time_option, self.option)
+
+    def test_reselecting_does_not_duplicate_jobs(self):
+        self._select()
+        self._select()
+        self.assertEqual(CalendarEventJob.objects.count(), 1)
+
+    def test_worker_records_event_id(self):
+        self._select()
+        with self._insert(return_value={'status': 'success', 'event_id': 'evt123'}) as insert:
+            self.assertEqual(process_calendar_outbox(), {'done': 1})
+        job = CalendarEventJob.objects.get()
+        self.assertEqual(insert.call_args.kwargs['event_id'], job.idempotency_key)
+        self.assertEqual(job.event_id, 'evt123')
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.calendar_event_id, 'evt123')
+        # Nothing left to do
+        self.assertEqual(process_calendar_outbox(), {})
+
+    def test_transient_failure_is_retried_with_backoff(self):
+        self._select()
+        with self._insert(side_effect=FakeHttpError(503)):
+            self.assertEqual(process_calendar_outbox(), {'pending': 1})
+        job = CalendarEventJob.objects.get()
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('503', job.last_error)
+        self.assertGreater(job.next_attempt_at, timezone.now() + backoff(1) - timedelta(seconds=5))
+        # Not due yet
+        self.assertEqual(process_calendar_outbox(), {})
+
+    def test_duplicate_insert_counts_as_success(self):
+        self._select()
+        with self._insert(side_effect=FakeHttpError(409)):
+            self.assertEqual(process_calendar_outbox(), {'done': 1})
+        job = CalendarEventJob.objects.get()
+        self.assertEqual(job.event_id, job.idempotency_key)
+
+    def test_gives_up_after_max_attempts(self):
+        self._select()
+        CalendarEventJob.objects.update(attempts=MAX_ATTEMPTS - 1)
+        with self._insert(side_effect=FakeHttpError(500)):
+            self.assertEqual(process_calendar_outbox(), {'failed': 1})
+
+    def test_not_connected_is_skipped(self):
+        self._select()
+        with self._insert(side_effect=CalendarNotConnected(self.user.pk)):
+            self.assertEqual(process_calendar_outbox(), {'skipped': 1})
+
+    def test_missing_credentials_are_skipped(self):
+        self._select()
+        self.assertEqual(process_calendar_outbox(), {'skipped': 1})
+        self.assertEqual(CalendarEventJob.objects.get().last_error, 'Google Calendar is not connected')
+
+    def test_failed_token_refresh_is_retried(self):
+        if not GOOGLE_AUTH_AVAILABLE:
+            self.skipTest('google-auth is not installed')
+        self.addCleanup(credential_cache.clear)
+        GoogleOAuthCredential.objects.create(user=self.user, token='expired', refresh_token='refresh',
+                                             expiry=timezone.now() - timedelta(minutes=5))
+        self._select()
+        with patch('google.oauth2.credentials.Credentials.refresh', side_effect=ConnectionError('token endpoint')):
+            self.assertEqual(process_calendar_outbox(), {'pending': 1})
+        job = CalendarEventJob.objects.get()
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('token endpoint', job.last_error)
+
+    def test_superseded_selection_is_skipped(self):
+        other = TimeOption.objects.create(meeting_request=self.meeting, start_time=self.option.end_time,
+                                          end_time=self.option.end_time + timedelta(hours=1))
+        self._select()
+        self._select(other)
+        with self._insert(return_value={'status': 'success', 'event_id': 'evt456'}) as insert:
+            self.assertEqual(process_calendar_outbox(), {'done': 1, 'skipped': 1})
+        self.assertEqual(insert.call_count, 1)
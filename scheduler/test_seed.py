@@ -0,0 +1,70 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+from django.test import TestCase
+
+from homepage.models import AbTestClickEvent, AbTestEvent, UserDetails
+from .models import GoogleOAuthCredential, MeetingRequest, TimeOption
+from .seed import seed
+
+
+class SeedTest(TestCase):
+    """Synthetic dataset generation."""
+
+    def _meetings_per_organizer(self, prefix):
+        return list(
+            MeetingRequest.objects.filter(organizer__username__startswith=f'{prefix}-')
+            .values('organizer__username').annotate(n=Count('id')).order_by('organizer__username')
+            .values_list('organizer__username', 'n')
+        )
+
+    def test_counts_and_consistency(self):
+        counts = seed(users=40, meetings=300, options=3, google_share=0.5, ab_views=500, chunk_size=64)
+        self.assertEqual(User.objects.count(), 40)
+        self.assertEqual(UserDetails.objects.count(), 40)
+        self.assertEqual(MeetingRequest.objects.count(), 300)
+        self.assertEqual(TimeOption.objects.count(), counts['time options'])
+        self.assertEqual(GoogleOAuthCredential.objects.count(), counts['google credentials'])
+        self.assertEqual(AbTestEvent.objects.count(), 500)
+        self.assertEqual(AbTestClickEvent.objects.count(), counts['A/B clicks'])
+
+        # Selected options belong to their meeting and are the only selected one
+        selected = MeetingRequest.objects.exclude(selected_option=None)
+        self.assertTrue(selected.exists())
+        self.assertFalse(selected.exclude(selected_option__meeting_request=F('pk')).exists())
+        self.assertFalse(selected.exclude(selected_option__is_selected=True).exists())
+        self.assertEqual(TimeOption.objects.filter(is_selected=True).count(), selected.count())
+
+        # Historical timestamps survive bulk_create, and auto_now is restored afterwards
+        self.assertGreater(MeetingRequest.objects.values('created_at').distinct().count(), 250)
+        self.assertTrue(MeetingRequest._meta.get_field('created_at').auto_now_add)
+
+        # New rows after seeding get fresh primary keys
+        last_pk = MeetingRequest.objects.order_by('-pk').values_list('pk', flat=True).first()
+        meeting = MeetingRequest.objects.create(organizer=User.objects.first(), title='After')
+        self.assertEqual(meeting.pk, last_pk + 1)
+
+    def test_meetings_are_skewed_across_organizers(self):
+        seed(users=50, meetings=1000, ab_views=0)
+        counts = sorted((n for _, n in self._meetings_per_organizer('seed')), reverse=True)
+        self.assertGreater(counts[0], 5 * 1000 / 50)
+
+    def test_same_seed_same_dataset(self):
+        seed(users=20, meetings=100, ab_views=0, seed=7, prefix='a')
+        seed(users=20, meetings=100, ab_views=0, seed=7, prefix='b')
+        seed(users=20, meetings=100, ab_views=0, seed=8, prefix='c')
+
+        def shape(prefix):
+            return [n for _, n in self._meetings_per_organizer(prefix)]
+        self.assertEqual(shape('a'), shape('b'))
+        self.assertNotEqual(shape('a'), shape('c'))
+
+    def test_command(self):
+        out = StringIO()
+        call_command('seed', users=5, meetings=10, ab_views=0, stdout=out)
+        self.assertIn('Seeded 5 users', out.getvalue())
+        self.assertTrue(User.objects.get(username='seed-0').check_password('seed-password'))
+        with self.assertRaises(CommandError):
+            call_command('seed', users=5, meetings=10, ab_views=0, stdout=out)
@@ -0,0 +1,64 @@
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from ai_event_scheduler.middleware import get_zone
+from .models import MeetingRequest, UserProfile
+
+
+class TimezoneMiddlewareTest(TestCase):
+    """Per-request timezone resolution."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='organizer', password='testpass123')
+
+    def test_zones_are_memoized(self):
+        self.assertIs(get_zone('Europe/Paris'), get_zone('Europe/Paris'))
+        self.assertIsNone(get_zone('Not/AZone'))
+
+    def test_health_check_never_touches_the_session(self):
+        self.client.login(username='organizer', password='testpass123')
+        with mock.patch('django.contrib.sessions.backends.db.SessionStore.load') as load:
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse('health_check'))
+        self.assertEqual(response.status_code, 200)
+        load.assert_not_called()
+
+    def test_anonymous_request_without_session_cookie_uses_default(self):
+        response = self.client.get(reverse('login'))
+        self.assertEqual(response.wsgi_request.timezone, ZoneInfo(settings.TIME_ZONE))
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_profile_timezone_is_used_and_remembered_in_session(self):
+        UserProfile.objects.create(user=self.user, timezone='Asia/Tokyo')
+        self.client.login(username='organizer', password='testpass123')
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.wsgi_request.timezone, ZoneInfo('Asia/Tokyo'))
+        self.assertEqual(self.client.session['django_timezone'], 'Asia/Tokyo')
+
+    def test_set_timezone_saves_profile(self):
+        self.client.login(username='organizer', password='testpass123')
+        self.client.post(reverse('set_timezone'), {'timezone': 'Europe/Paris', 'next': '/'})
+        self.assertEqual(UserProfile.objects.get(user=self.user).timezone, 'Europe/Paris')
+
+        self.client.post(reverse('set_timezone'), {'timezone': 'Not/AZone', 'next': '/'})
+        self.assertEqual(UserProfile.objects.get(user=self.user).timezone, 'Europe/Paris')
+        self.assertEqual(self.client.session['django_timezone'], 'Europe/Paris')
+
+    def test_create_meeting_uses_request_timezone(self):
+        self.client.login(username='organizer', password='testpass123')
+        self.client.post(reverse('set_timezone'), {'timezone': 'Asia/Tokyo', 'next': '/'})
+        self.client.post(reverse('create_meeting'), {
+            'title': 'Sync',
+            'time_slot_count': '1',
+            'start_time_0': '2030-01-01T09:00',
+            'end_time_0': '2030-01-01T10:00',
+        })
+        option = MeetingRequest.objects.get(title='Sync').time_options.get()
+        self.assertEqual(option.start_time, datetime(2030, 1, 1, 9, tzinfo=ZoneInfo('Asia/Tokyo')))
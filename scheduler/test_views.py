@@ -1,8 +1,17 @@
-from django.test import TestCase, Client
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
+from ai_event_scheduler.profiling import outbound, profile
+from ai_event_scheduler.testing import BudgetTestMixin
+from .integrations.freebusy_cache import invalidate_free_busy
 from .models import MeetingRequest, TimeOption
 
 
@@ -102,6 +111,37 @@ class SchedulerViewsIntegrationTest(TestCase):
         # Meeting should be created but without time options
         meeting = MeetingRequest.objects.get(title='Invalid Meeting')
         self.assertEqual(meeting.time_options.count(), 0)
+
+    def test_create_meeting_merges_overlapping_slots(self):
+        """Test that duplicate and overlapping slots become one option."""
+        day = timezone.now() + timedelta(days=1)
+        fmt = '%Y-%m-%dT%H:%M'
+        slots = [(0, 1), (0, 1), (0.5, 2), (3, 4)]
+        data = {'title': 'Merged Meeting', 'time_slot_count': str(len(slots))}
+        for i, (start, end) in enumerate(slots):
+            data[f'start_time_{i}'] = (day + timedelta(hours=start)).strftime(fmt)
+            data[f'end_time_{i}'] = (day + timedelta(hours=end)).strftime(fmt)
+        self.client.post(reverse('create_meeting'), data)
+
+        options = list(MeetingRequest.objects.get(title='Merged Meeting').time_options.all())
+        self.assertEqual([o.duration_minutes for o in options], [120, 60])
+
+    def test_create_meeting_query_count_is_independent_of_slot_count(self):
+        """Test that all time options are written in one statement."""
+        day = timezone.now() + timedelta(days=1)
+
+        def post(count):
+            data = {'title': f'{count} slots', 'time_slot_count': str(count)}
+            for i in range(count):
+                data[f'start_time_{i}'] = (day + timedelta(hours=2 * i)).strftime('%Y-%m-%dT%H:%M')
+                data[f'end_time_{i}'] = (day + timedelta(hours=2 * i + 1)).strftime('%Y-%m-%dT%H:%M')
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(reverse('create_meeting'), data)
+            return len(ctx.captured_queries)
+
+        post(1)  # the session's first request also resolves its timezone from the profile
+        self.assertEqual(post(2), post(50))
+        self.assertEqual(MeetingRequest.objects.get(title='50 slots').time_options.count(), 50)
     
     def test_unauthorized_access_to_other_user_meeting(self):
         """Test that users cannot access meetings they didn't organize."""
@@ -115,3 +155,207 @@ class SchedulerViewsIntegrationTest(TestCase):
             reverse('meeting_detail', kwargs={'pk': other_meeting.pk})
         )
         self.assertEqual(response.status_code, 404)
+
+
+class DashboardQueryTest(TestCase):
+    """The dashboard must cost a fixed number of queries and paginate by keyset."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='organizer', password='testpass123')
+        self.client.login(username='organizer', password='testpass123')
+
+    def _create_meetings(self, count):
+        start = timezone.now() + timedelta(days=1)
+        for i in range(count):
+            meeting = MeetingRequest.objects.create(organizer=self.user, title=f'Meeting {i}')
+            for j in range(2):
+                TimeOption.objects.create(
+                    meeting_request=meeting,
+                    start_time=start + timedelta(hours=j),
+                    end_time=start + timedelta(hours=j, minutes=30),
+                    is_selected=(j == 1 and i % 2 == 0),
+                )
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_independent_of_meeting_count(self):
+        self._count_queries()  # the session's first request also resolves its timezone from the profile
+        self._create_meetings(2)
+        few = self._count_queries()
+        self._create_meetings(40)
+        self.assertEqual(self._count_queries(), few)
+
+    @override_settings(DASHBOARD_PAGE_SIZE=5)
+    def test_keyset_pagination_walks_every_meeting_once(self):
+        self._create_meetings(12)
+        seen, url = [], reverse('dashboard')
+        while url:
+            response = self.client.get(url)
+            seen.extend(m.pk for m in response.context['meetings'])
+            cursor = response.context['next_cursor']
+            url = f"{reverse('dashboard')}?after={cursor}" if cursor else None
+        expected = list(MeetingRequest.objects.order_by('-created_at', 'id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_annotations(self):
+        self._create_meetings(2)
+        response = self.client.get(reverse('dashboard'))
+        meetings = {m.title: m for m in response.context['meetings']}
+        self.assertEqual(meetings['Meeting 0'].option_count, 2)
+        self.assertTrue(meetings['Meeting 0'].has_selected_time)
+        self.assertIsNotNone(meetings['Meeting 0'].selected_time.start_time)
+        self.assertFalse(meetings['Meeting 1'].has_selected_time)
+
+    def test_invalid_cursor_shows_first_page(self):
+        self._create_meetings(1)
+        response = self.client.get(reverse('dashboard'), {'after': 'not-a-cursor'})
+        self.assertEqual(len(response.context['meetings']), 1)
+
+
+class MeetingDetailQueryTest(TestCase):
+    """The detail page loads the meeting once and caches the availability check."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='organizer', password='testpass123')
+        self.client.login(username='organizer', password='testpass123')
+
+    def _create_meeting(self, option_count):
+        start = timezone.now() + timedelta(days=1)
+        meeting = MeetingRequest.objects.create(organizer=self.user, title=f'{option_count} options')
+        TimeOption.objects.bulk_create([
+            TimeOption(meeting_request=meeting, start_time=start + timedelta(hours=i),
+                       end_time=start + timedelta(hours=i, minutes=30))
+            for i in range(option_count)
+        ])
+        meeting.select_option(meeting.time_options.first())
+        return meeting
+
+    def _render(self, meeting):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('meeting_detail', kwargs={'pk': meeting.pk}))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    @mock.patch('scheduler.integrations.google_calendar._aprimary_busy', return_value=[])
+    def test_availability_is_cached_per_selection(self, primary_busy):
+        meeting = self._create_meeting(2)
+        self._render(meeting)
+        self._render(meeting)
+        self.assertEqual(primary_busy.call_count, 1)
+
+        meeting.select_option(meeting.time_options.last())
+        self._render(meeting)
+        self.assertEqual(primary_busy.call_count, 2)
+
+        invalidate_free_busy(self.user.pk)
+        self._render(meeting)
+        self.assertEqual(primary_busy.call_count, 3)
+
+    @mock.patch('scheduler.integrations.google_calendar._aprimary_busy', return_value=[])
+    def test_query_count_is_independent_of_option_count(self, primary_busy):
+        few, many = self._create_meeting(2), self._create_meeting(30)
+        self._render(few)
+        self._render(many)
+        self.assertEqual(self._render(few), self._render(many))
+
+    @mock.patch('scheduler.integrations.google_calendar._aprimary_busy', return_value=None)
+    def test_mock_answers_are_not_cached(self, primary_busy):
+        meeting = self._create_meeting(1)
+        self._render(meeting)
+        self._render(meeting)
+        self.assertEqual(primary_busy.call_count, 2)
+
+
+class ViewBudgetTest(BudgetTestMixin, TestCase):
+    """The hot views stay within their PERF_BUDGETS, caches cold, with plenty of data."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='organizer', password='testpass123')
+        self.client.login(username='organizer', password='testpass123')
+        start = timezone.now() + timedelta(days=1)
+        for i in range(30):
+            meeting = MeetingRequest.objects.create(organizer=self.user, title=f'Meeting {i}')
+            TimeOption.objects.bulk_create([
+                TimeOption(meeting_request=meeting, start_time=start + timedelta(hours=j),
+                           end_time=start + timedelta(hours=j, minutes=30))
+                for j in range(5)
+            ])
+        self.meeting = meeting
+        cache.clear()
+
+    def test_dashboard(self):
+        with self.assertWithinBudget('dashboard'):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+    @mock.patch('scheduler.integrations.google_calendar._aprimary_busy', return_value=[])
+    def test_meeting_detail(self, primary_busy):
+        self.meeting.select_option(self.meeting.time_options.first())
+        with self.assertWithinBudget('meeting_detail'):
+            response = self.client.get(reverse('meeting_detail', kwargs={'pk': self.meeting.pk}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_create_meeting(self):
+        day = timezone.now() + timedelta(days=1)
+        data = {'title': 'Budgeted', 'time_slot_count': '20'}
+        for i in range(20):
+            data[f'start_time_{i}'] = (day + timedelta(hours=2 * i)).strftime('%Y-%m-%dT%H:%M')
+            data[f'end_time_{i}'] = (day + timedelta(hours=2 * i + 1)).strftime('%Y-%m-%dT%H:%M')
+        with self.assertWithinBudget('create_meeting'):
+            response = self.client.post(reverse('create_meeting'), data)
+        self.assertEqual(response.status_code, 302)
+
+    def test_select_time(self):
+        option = self.meeting.time_options.last()
+        with self.assertWithinBudget('select_time'):
+            response = self.client.post(reverse('select_time', kwargs={'pk': self.meeting.pk}),
+                                        {'time_option_id': option.pk})
+        self.assertEqual(response.status_code, 302)
+
+    def test_over_budget_fails(self):
+        with self.assertRaises(AssertionError):
+            with self.assertWithinBudget('dashboard', queries=0):
+                self.client.get(reverse('dashboard'))
+
+    @override_settings(PERF_BUDGETS={'dashboard': {'queries': 50, 'ms': 0}})
+    def test_time_budget_is_opt_in(self):
+        with self.assertWithinBudget('dashboard'):
+            self.client.get(reverse('dashboard'))
+        with override_settings(PERF_BUDGET_ENFORCE_MS=True), self.assertRaises(AssertionError):
+            with self.assertWithinBudget('dashboard'):
+                self.client.get(reverse('dashboard'))
+
+
+@override_settings(PERF_PROFILING=True)
+class PerformanceBudgetMiddlewareTest(TestCase):
+    """Requests over budget are logged when profiling is enabled."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='organizer', password='testpass123')
+        self.client.login(username='organizer', password='testpass123')
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+, http;dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_over_budget_request_is_logged(self):
+        with override_settings(PERF_BUDGETS={'dashboard': {'queries': 1}}):
+            with self.assertLogs('ai_event_scheduler.middleware', 'WARNING') as logs:
+                self.client.get(reverse('dashboard'))
+        self.assertIn('Over budget: GET /dashboard/ (dashboard)', logs.output[0])
+
+    def test_outbound_time_is_attributed(self):
+        with profile() as request_profile:
+            with profile() as call_profile, outbound():
+                time.sleep(0.02)
+            with profile() as later_profile:
+                pass
+        # Every profile active around the call gets its time; one that wasn't gets none
+        self.assertGreaterEqual(call_profile.outbound_ms, 20)
+        self.assertGreaterEqual(request_profile.outbound_ms, 20)
+        self.assertEqual(later_profile.outbound_ms, 0)
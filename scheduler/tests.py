@@ -1,3 +1,4 @@
+from django.db import IntegrityError, transaction
 from django.test import TestCase, Client
 from django.contrib.auth.models import User
 from django.urls import reverse
@@ -87,6 +88,47 @@ class TimeOptionModelTest(TestCase):
         option1.refresh_from_db()
         self.assertFalse(option1.is_selected)
         self.assertTrue(option2.is_selected)
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.selected_option, option2)
+
+    def test_select_option_moves_pointer(self):
+        """Test that select_option switches the selection and the meeting's pointer."""
+        start = timezone.now() + timedelta(days=1)
+        option1, option2 = [
+            TimeOption.objects.create(meeting_request=self.meeting, start_time=start + timedelta(hours=h),
+                                      end_time=start + timedelta(hours=h + 1))
+            for h in (0, 2)
+        ]
+        meeting = MeetingRequest.objects.get(pk=self.meeting.pk)
+        meeting.select_option(option1)
+        meeting.select_option(option2)
+        self.assertEqual(meeting.selected_time, option2)
+        self.assertEqual(MeetingRequest.objects.get(pk=meeting.pk).selected_option_id, option2.pk)
+        self.assertEqual(list(meeting.time_options.filter(is_selected=True)), [option2])
+
+    def test_unselecting_clears_pointer(self):
+        """Test that clearing the flag on the selected option clears the pointer."""
+        option = TimeOption.objects.create(
+            meeting_request=self.meeting,
+            start_time=timezone.now() + timedelta(days=1),
+            end_time=timezone.now() + timedelta(days=1, hours=1),
+            is_selected=True
+        )
+        option = TimeOption.objects.get(pk=option.pk)
+        option.is_selected = False
+        option.save()
+        self.meeting.refresh_from_db()
+        self.assertFalse(self.meeting.has_selected_time)
+
+    def test_database_rejects_second_selection(self):
+        """Test that the partial unique index holds even when save() is bypassed."""
+        start = timezone.now() + timedelta(days=1)
+        TimeOption.objects.create(meeting_request=self.meeting, start_time=start,
+                                  end_time=start + timedelta(hours=1), is_selected=True)
+        other = TimeOption.objects.create(meeting_request=self.meeting, start_time=start + timedelta(hours=2),
+                                          end_time=start + timedelta(hours=3))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TimeOption.objects.filter(pk=other.pk).update(is_selected=True)
 
 
 class SchedulerViewsTest(TestCase):
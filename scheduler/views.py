@@ -1,17 +1,25 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.views.generic import ListView, DetailView
+from django.views.generic import ListView, View
 from django.contrib import messages
+from django.db import transaction
 from django.utils.dateparse import parse_datetime
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from .models import MeetingRequest, TimeOption
-from .integrations.google_calendar import MockGoogleCalendar, create_calendar_event
+from .integrations.google_calendar import MockGoogleCalendar, acheck_availability_message
+from .integrations.availability import merge_intervals
+from .outbox import enqueue_calendar_event
 from django.conf import settings
 from django.utils import timezone as dj_timezone
-from zoneinfo import ZoneInfo
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from .emails import send_meeting_created_email, send_time_selected_email
 from django.urls import reverse
+from django.http import Http404
 from .models import GoogleOAuthCredential
+from .integrations.credentials import aware_expiry
+from .cache import cache_aside, get_meeting, google_connected, user_meetings_scope
 
 try:
     from google_auth_oauthlib.flow import Flow
@@ -19,15 +27,119 @@ try:
 except Exception:
     GOOGLE_OAUTH_AVAILABLE = False
 
+async def _arender(request, template_name, context):
+    """render() for async views: context processors and templates may touch the session or database."""
+    # auser() and request.user cache separately: hand the templates the user auser() already loaded
+    context.setdefault('user', await request.auser())
+    return await sync_to_async(render)(request, template_name, context)
+
+
+def _encode_cursor(meeting) -> str:
+    """Opaque keyset cursor for the dashboard: position after `meeting` in (-created_at, id) order."""
+    raw = f'{meeting.created_at.isoformat()}|{meeting.pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(value):
+    """Inverse of _encode_cursor; None for a missing or malformed cursor."""
+    if not value:
+        return None
+    try:
+        created_at, pk = urlsafe_b64decode(value.encode()).decode().split('|')
+        created_at = parse_datetime(created_at)
+        return (created_at, int(pk)) if created_at else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def dashboard_meetings(organizer, cursor=None):
+    """
+    The dashboard's queryset: an organizer's meetings, newest first, after `cursor`.
+
+    Args:
+        organizer: User whose meetings to list
+        cursor: (created_at, pk) of the last meeting on the previous page, or None
+
+    Returns:
+        Unsliced QuerySet with `option_count` annotated and `selected_option` joined
+    """
+    option_count = (
+        TimeOption.objects.filter(meeting_request=OuterRef('pk'))
+        .order_by().values('meeting_request').annotate(n=Count('pk')).values('n')
+    )
+    meetings = (
+        MeetingRequest.objects
+        .filter(organizer=organizer)
+        .select_related('selected_option')
+        .annotate(option_count=Coalesce(Subquery(option_count), 0))
+        .order_by('-created_at', 'id')
+    )
+    if cursor:
+        created_at, pk = cursor
+        meetings = meetings.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__gt=pk))
+    return meetings
+
+
 @login_required
-def dashboard(request):
-    """Display user's dashboard with their meeting requests."""
-    meetings = MeetingRequest.objects.filter(organizer=request.user)
-    return render(request, 'scheduler/dashboard.html', {
-        'meetings': meetings
+async def dashboard(request):
+    """
+    Display user's dashboard with their meeting requests.
+
+    The option count is annotated and the selected slot joined in through the
+    meeting's selected_option pointer, so a page is a single query; pages are
+    keyset-paginated on (-created_at, id) so the cost of a page doesn't depend
+    on how many meetings the organizer has. Pages are cached until one of the
+    organizer's meetings or options changes.
+    """
+    user = await request.auser()
+    page_size = getattr(settings, 'DASHBOARD_PAGE_SIZE', 25)
+    cursor = _decode_cursor(request.GET.get('after'))
+    meetings = dashboard_meetings(user, cursor)
+
+    # The cache lookup and, on a miss, the query run in one trip off the event loop
+    page = await sync_to_async(cache_aside)(
+        f'dashboard:{user.pk}:{page_size}:{request.GET.get("after", "") if cursor else ""}',
+        [user_meetings_scope(user.pk)],
+        lambda: list(meetings[:page_size + 1]),
+    )
+    next_cursor = _encode_cursor(page[page_size - 1]) if len(page) > page_size else None
+    return await _arender(request, 'scheduler/dashboard.html', {
+        'meetings': page[:page_size],
+        'next_cursor': next_cursor,
+        'is_first_page': cursor is None,
     })
 
 
+def _parse_time_slots(data, tz):
+    """
+    Parse the submitted time slots in one pass.
+
+    Args:
+        data: POST data with time_slot_count and start_time_N / end_time_N fields
+        tz: Timezone the naive form values are in
+
+    Returns:
+        Sorted (start, end) pairs with invalid slots dropped and overlapping or
+        duplicate slots merged
+    """
+    try:
+        count = int(data.get('time_slot_count', 0))
+    except (TypeError, ValueError):
+        count = 0
+    slots = []
+    for i in range(count):
+        start_time_str = data.get(f'start_time_{i}')
+        end_time_str = data.get(f'end_time_{i}')
+        if not (start_time_str and end_time_str):
+            continue
+        start_time = parse_datetime(start_time_str.replace('T', ' '))
+        end_time = parse_datetime(end_time_str.replace('T', ' '))
+        if start_time and end_time:
+            # Make times aware in user's timezone (then Django will store as UTC)
+            slots.append((dj_timezone.make_aware(start_time, tz), dj_timezone.make_aware(end_time, tz)))
+    return merge_intervals(slots)
+
+
 @login_required
 def create_meeting(request):
     """Create a new meeting request with time options."""
@@ -35,40 +147,21 @@ def create_meeting(request):
         # Get form data
         title = request.POST.get('title')
         description = request.POST.get('description', '')
-        
-        # Create meeting request
-        meeting = MeetingRequest.objects.create(
-            organizer=request.user,
-            title=title,
-            description=description
-        )
-        
-        # Process time slots
-        time_slot_count = int(request.POST.get('time_slot_count', 0))
-        for i in range(time_slot_count):
-            start_time_str = request.POST.get(f'start_time_{i}')
-            end_time_str = request.POST.get(f'end_time_{i}')
-            
-            if start_time_str and end_time_str:
-                start_time = parse_datetime(start_time_str.replace('T', ' '))
-                end_time = parse_datetime(end_time_str.replace('T', ' '))
-
-                # Make times aware in user's timezone (then Django will store as UTC)
-                if start_time and end_time:
-                    tzname = request.session.get('django_timezone', settings.TIME_ZONE)
-                    try:
-                        tz = ZoneInfo(tzname)
-                    except Exception:
-                        tz = dj_timezone.utc
-                    start_time = dj_timezone.make_aware(start_time, tz)
-                    end_time = dj_timezone.make_aware(end_time, tz)
-                
-                if start_time and end_time and end_time > start_time:
-                    TimeOption.objects.create(
-                        meeting_request=meeting,
-                        start_time=start_time,
-                        end_time=end_time
-                    )
+        # Resolved once per request by TimezoneMiddleware
+        tz = getattr(request, 'timezone', None) or dj_timezone.get_current_timezone()
+        slots = _parse_time_slots(request.POST, tz)
+
+        # Create the meeting and all of its time options together
+        with transaction.atomic():
+            meeting = MeetingRequest.objects.create(
+                organizer=request.user,
+                title=title,
+                description=description
+            )
+            TimeOption.objects.bulk_create([
+                TimeOption(meeting_request=meeting, start_time=start_time, end_time=end_time)
+                for start_time, end_time in slots
+            ])
         
         messages.success(request, 'Meeting request created successfully!')
         # Send organizer notification (best-effort, non-blocking)
@@ -81,71 +174,70 @@ def create_meeting(request):
     return render(request, 'scheduler/create_meeting.html')
 
 
-class MeetingDetailView(LoginRequiredMixin, DetailView):
+class MeetingDetailView(View):
     """Display meeting details."""
-    model = MeetingRequest
     template_name = 'scheduler/meeting_detail.html'
-    context_object_name = 'meeting'
-    
-    def get_queryset(self):
-        """Ensure users can only see meetings they organized."""
-        return MeetingRequest.objects.filter(organizer=self.request.user)
-    
-    def get_context_data(self, **kwargs):
-        """Add Google Calendar availability info to context."""
-        context = super().get_context_data(**kwargs)
-        meeting = self.get_object()
-        
-        # Replace mock with dynamic check via integration wrapper
-        from .integrations.google_calendar import check_availability_message
-        context['availability_status'] = check_availability_message(meeting)
-        context['google_connected'] = GoogleOAuthCredential.objects.filter(user=self.request.user).exists()
-        
-        return context
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return login_required(super().as_view(**initkwargs))
+
+    async def get(self, request, pk):
+        """The meeting and Google Calendar availability; the availability check doesn't block the worker."""
+        user = await request.auser()
+        meeting, connected = await sync_to_async(self._load)(user, pk)
+        return await _arender(request, self.template_name, {
+            'meeting': meeting,
+            # Replace mock with dynamic check via integration wrapper (cached per selection)
+            'availability_status': await acheck_availability_message(meeting),
+            'google_connected': connected,
+        })
+
+    @staticmethod
+    def _load(user, pk):
+        """The meeting from the cache (organizer, options and selection loaded), if the user organized it."""
+        meeting = get_meeting(pk)
+        if meeting is None or meeting.organizer_id != user.pk:
+            raise Http404('No meeting found matching the query')
+        return meeting, google_connected(user)
 
 
 @login_required
-def select_time(request, pk):
+async def select_time(request, pk):
     """Select a time option for a meeting."""
-    meeting = get_object_or_404(MeetingRequest, pk=pk, organizer=request.user)
-    
+    user = await request.auser()
+    meeting = await aget_object_or_404(MeetingRequest.objects.select_related('organizer'), pk=pk, organizer=user)
+
     if request.method == 'POST':
         time_option_id = request.POST.get('time_option_id')
-        time_option = get_object_or_404(TimeOption, pk=time_option_id, meeting_request=meeting)
-        
-        # Mark this option as selected (the model will handle unsetting others)
-        time_option.is_selected = True
-        time_option.save()
-        
-        # Simulate creating a calendar event (Sprint 3 - mocked)
-        calendar_response = create_calendar_event(
-            user=request.user,
-            title=meeting.title,
-            start_time=time_option.start_time,
-            end_time=time_option.end_time,
-            description=meeting.description or ""
-        )
-        
-        if calendar_response['status'] == 'success':
-            messages.success(
-                request, 
-                f'Time selected: {time_option.start_time.strftime("%Y-%m-%d %H:%M")}. '
-                f'(Calendar event would be created - Event ID: {calendar_response["event_id"]})'
-            )
-        else:
-            messages.success(request, f'Time selected: {time_option.start_time.strftime("%Y-%m-%d %H:%M")}')
-        
-        # Send organizer notification (best-effort, non-blocking)
-        try:
-            send_time_selected_email(meeting, time_option)
-        except Exception:
-            pass
+        # Through the related manager, so the option's meeting_request is `meeting` (no re-fetch in signals)
+        time_option = await aget_object_or_404(meeting.time_options, pk=time_option_id)
+        await sync_to_async(_apply_selection)(meeting, time_option)
 
+        messages.success(
+            request,
+            f'Time selected: {time_option.start_time.strftime("%Y-%m-%d %H:%M")}. '
+            f'A calendar event will be created shortly.'
+        )
         return redirect('meeting_detail', pk=meeting.pk)
-    
+
     return redirect('meeting_detail', pk=meeting.pk)
 
 
+def _apply_selection(meeting, time_option):
+    """Select the option (unsetting any other), queue its calendar event and notify the organizer."""
+    # The outbox worker creates the Google Calendar event outside the request
+    with transaction.atomic():
+        meeting.select_option(time_option)
+        enqueue_calendar_event(meeting, time_option)
+
+    # Send organizer notification (best-effort, non-blocking)
+    try:
+        send_time_selected_email(meeting, time_option)
+    except Exception:
+        pass
+
+
 @login_required
 def delete_meeting(request, pk):
     """Delete a meeting request (organizer only)."""
@@ -227,7 +319,7 @@ def google_oauth_callback(request):
         if getattr(creds, 'refresh_token', None):
             record.refresh_token = creds.refresh_token
         record.token_uri = getattr(creds, 'token_uri', 'https://oauth2.googleapis.com/token')
-        record.expiry = getattr(creds, 'expiry', None)
+        record.expiry = aware_expiry(getattr(creds, 'expiry', None))
         record.scopes = ' '.join(scopes)
         record.save()
         messages.success(request, 'Google Calendar connected successfully.')